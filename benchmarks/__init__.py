@@ -0,0 +1,7 @@
+"""
+Benchmarks of the strategies in user_data/strategies.
+
+Run from the repository root, e.g. ``python -m benchmarks.startup``, or all of them with
+``python -m benchmarks.run``. The results are written as JSON, and compared to a baseline
+file with ``--baseline``: CI reports ``python -m benchmarks.run`` against baseline.json.
+"""
@@ -0,0 +1,114 @@
+"""
+Timing, JSON results and baseline comparison shared by the benchmarks.
+
+A results file maps each benchmark name to its median duration in seconds (null when it
+could not run, e.g. without freqtrade installed), and "calibration" to the duration of a
+fixed NumPy/Python workload on the same machine. The baseline durations are scaled by
+the calibration ratio before the comparison, so a baseline made on another machine (a
+CI runner) still flags the regressions, not the machine difference.
+"""
+
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+STRATEGIES_DIR = ROOT_DIR / "user_data" / "strategies"
+
+CALIBRATION = "calibration"
+
+# Slower than the baseline by more than this ratio is a regression
+DEFAULT_TOLERANCE = 0.10
+
+# And by more than this many seconds, below it is timer noise
+MIN_DIFFERENCE = 0.001
+
+
+def median_seconds(func, repeat=5):
+    """Returns the median duration of func() over repeat calls, in seconds."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def _calibration_workload():
+    values = np.random.default_rng(0).random(1_000_000)
+    np.sort(values)
+    sum(range(1_000_000))
+
+
+def calibration_seconds(repeat=5):
+    """Returns the median duration of the calibration workload, in seconds."""
+    return median_seconds(_calibration_workload, repeat)
+
+
+def regressions(
+    results, baseline, tolerance=DEFAULT_TOLERANCE, min_difference=MIN_DIFFERENCE
+):
+    """
+    Returns the benchmarks slower than their (calibrated) baseline by more than tolerance.
+
+    The benchmarks missing on either side (or null) are not compared.
+
+    :return dict: Name -> baseline (scaled to this machine) and seconds.
+    """
+    speed = 1.0
+    if results.get(CALIBRATION) and baseline.get(CALIBRATION):
+        speed = results[CALIBRATION] / baseline[CALIBRATION]
+    slower = {}
+    for name, seconds in results.items():
+        reference = baseline.get(name)
+        if name == CALIBRATION or seconds is None or not reference:
+            continue
+        expected = reference * speed
+        if (
+            seconds > expected * (1.0 + tolerance)
+            and seconds - expected > min_difference
+        ):
+            slower[name] = {"baseline": expected, "seconds": seconds}
+    return slower
+
+
+def add_arguments(parser, repeat):
+    """Adds the common arguments of the benchmarks to the argparse parser."""
+    parser.add_argument("--repeat", type=int, default=repeat)
+    parser.add_argument("--output", help="JSON results file (default: stdout)")
+    parser.add_argument("--baseline", help="JSON baseline to compare to")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument(
+        "--report-only",
+        action="store_true",
+        help="Print the regressions without failing (exit status 0)",
+    )
+
+
+def report(results, args):
+    """
+    Writes the results (with the calibration) and compares them to the baseline.
+
+    :return int: The exit status, 1 with regressions (unless --report-only).
+    """
+    results = {**results, CALIBRATION: calibration_seconds()}
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.output is None:
+        print(text)
+    else:
+        Path(args.output).write_text(text + "\n")
+    if not args.baseline:
+        return 0
+    baseline = json.loads(Path(args.baseline).read_text())
+    slower = regressions(results, baseline, args.tolerance)
+    for name, values in sorted(slower.items()):
+        print(
+            f"{name}: {values['seconds']:.4f}s, baseline {values['baseline']:.4f}s "
+            f"(+{values['seconds'] / values['baseline'] - 1.0:.0%})",
+            file=sys.stderr,
+        )
+    return 1 if slower and not args.report_only else 0
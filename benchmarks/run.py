@@ -0,0 +1,40 @@
+"""
+All the benchmarks: startup, candle window helpers and strategy hot paths.
+
+Usage: python -m benchmarks.run [--pairs N] [--repeat N] [--output FILE]
+                                [--baseline FILE] [--tolerance RATIO] [--report-only]
+
+With --baseline, it fails (exit status 1) on a benchmark slower than its baseline by
+more than the tolerance (10%). The shared CI runners are too noisy to gate on wall-clock
+times, so CI runs it with --report-only: the regressions are printed and the results
+uploaded. After an expected change, the baseline is written again with
+--output benchmarks/baseline.json.
+"""
+
+import argparse
+import sys
+
+from benchmarks import startup, strategies, windows
+from benchmarks.baseline import add_arguments, report
+
+
+def run(repeat=3, pair_count=strategies.DEFAULT_PAIRS):
+    """Returns all the benchmarks, name -> median seconds."""
+    results = {}
+    results.update(startup.run(repeat))
+    results.update(windows.run(repeat))
+    results.update(strategies.run(repeat, pair_count))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pairs", type=int, default=strategies.DEFAULT_PAIRS)
+    add_arguments(parser, repeat=3)
+    args = parser.parse_args(argv)
+
+    return report(run(args.repeat, args.pairs), args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""
+Startup time of NostalgiaForInfinityX5: cold import and instantiation.
+
+Each repeat runs in a new interpreter, with a separate bytecode cache
+(PYTHONPYCACHEPREFIX) where the strategy module is removed, so it is compiled again as
+on the first start after an update. The dependencies (freqtrade, pandas_ta, talib) are
+imported before the timing starts. The short side functions (nfi_lib.short_mode) are
+loaded on first use, their load is measured on its own.
+
+The compile benchmarks only need the sources, they also run without freqtrade.
+
+Usage: python -m benchmarks.startup [--repeat N] [--output FILE] [--baseline FILE]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.baseline import (
+    STRATEGIES_DIR,
+    add_arguments,
+    median_seconds,
+    report,
+)
+
+STRATEGY = "NostalgiaForInfinityX5"
+
+COMPILED_FILES = {
+    STRATEGY: STRATEGIES_DIR / f"{STRATEGY}.py",
+    "short_mode": STRATEGIES_DIR / "nfi_lib" / "short_mode.py",
+}
+
+# Run in a new interpreter: argv[1] the strategies directory, argv[2] the user data dir
+STARTUP_CODE = """
+import importlib
+import importlib.util
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+strategies_dir, user_data_dir = sys.argv[1:3]
+sys.path.insert(0, strategies_dir)
+for name in ("NostalgiaForInfinityX5.py", os.path.join("nfi_lib", "short_mode.py")):
+    cached = importlib.util.cache_from_source(os.path.join(strategies_dir, name))
+    if os.path.exists(cached):
+        os.remove(cached)
+
+import freqtrade.strategy
+import nfi_lib
+import pandas_ta
+import talib.abstract
+from freqtrade.enums import CandleType, RunMode
+
+start = time.perf_counter()
+module = importlib.import_module("NostalgiaForInfinityX5")
+imported = time.perf_counter()
+module.NostalgiaForInfinityX5(
+    {
+        "exchange": {"name": "binance"},
+        "stake_currency": "USDT",
+        "max_open_trades": 6,
+        "runmode": RunMode.BACKTEST,
+        "candle_type_def": CandleType.SPOT,
+        "user_data_dir": Path(user_data_dir),
+    }
+)
+instantiated = time.perf_counter()
+module.NostalgiaForInfinityX5.load_short_mode()
+loaded = time.perf_counter()
+print(
+    json.dumps(
+        {
+            "import": imported - start,
+            "instantiate": instantiated - imported,
+            "short_mode_load": loaded - instantiated,
+        }
+    )
+)
+"""
+
+
+def compile_seconds(path, repeat):
+    """Median time to compile the source file to bytecode."""
+    source = Path(path).read_text()
+    return median_seconds(lambda: compile(source, str(path), "exec"), repeat)
+
+
+def startup_seconds(repeat):
+    """
+    Median cold import, instantiation and short mode load times of the strategy.
+
+    :return dict: Benchmark name -> seconds, None if the strategy could not be loaded.
+    """
+    runs = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        environment = {"PYTHONPYCACHEPREFIX": str(Path(temp_dir) / "pycache")}
+        for _ in range(repeat):
+            process = subprocess.run(
+                [sys.executable, "-c", STARTUP_CODE, str(STRATEGIES_DIR), temp_dir],
+                capture_output=True,
+                text=True,
+                env={**os.environ, **environment},
+            )
+            if process.returncode != 0:
+                print(process.stderr.strip().splitlines()[-1], file=sys.stderr)
+                break
+            runs.append(json.loads(process.stdout.strip().splitlines()[-1]))
+    results = {}
+    for name in ("import", "instantiate", "short_mode_load"):
+        results[f"startup.{name}.{STRATEGY}"] = (
+            statistics.median(run[name] for run in runs) if runs else None
+        )
+    return results
+
+
+def run(repeat=3):
+    """Returns the startup benchmarks, name -> median seconds."""
+    results = {
+        f"startup.compile.{name}": compile_seconds(path, repeat)
+        for name, path in COMPILED_FILES.items()
+    }
+    results.update(startup_seconds(repeat))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    add_arguments(parser, repeat=3)
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat)
+    return report(results, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,338 @@
+"""
+Hot path benchmarks of the strategies in user_data/strategies, on the bundled candles.
+
+The bundled BTC/USDT 5m and 15m candles are loaded, and N pairs synthesized from them:
+BTC/USDT, and pairs with their own price path (the BTC/USDT candles times a random walk).
+The other timeframes are resampled from the 5m candles (the 1m strategies get the 5m
+candles, only the timing matters here). Each strategy is instantiated in backtest mode
+with a stub DataProvider serving these candles, and each stage is timed over all the
+pairs, the way freqtrade calls them (advise_indicators() ...):
+
+  strategies.<module>.populate_indicators
+  strategies.<module>.populate_entry_trend
+  strategies.<module>.populate_exit_trend
+  strategies.NostalgiaForInfinityX5.custom_exit    an open trade per pair and entry mode
+
+Each repeat runs in a new interpreter, so the class level caches of the strategies start
+empty. Needs freqtrade (and pandas_ta for NostalgiaForInfinityX5): a strategy (or stage)
+that cannot run is null.
+
+Usage: python -m benchmarks.strategies [--pairs N] [--repeat N] [--output FILE]
+                                       [--baseline FILE] [--strategy MODULE ...]
+"""
+
+import argparse
+import importlib
+import inspect
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from datetime import timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.baseline import (
+    ROOT_DIR,
+    STRATEGIES_DIR,
+    add_arguments,
+    report,
+)
+
+DATA_DIR = ROOT_DIR / "user_data" / "data" / "binance"
+
+STAGES = ("populate_indicators", "populate_entry_trend", "populate_exit_trend")
+
+RESAMPLED_TIMEFRAMES = {
+    "30m": "30min",
+    "1h": "1h",
+    "4h": "4h",
+    "1d": "1D",
+}
+
+# One trade per pair for each of these NostalgiaForInfinityX5 entry modes
+NFI_ENTRY_TAGS = ("1", "21", "41", "61", "101", "120", "141")
+
+DEFAULT_PAIRS = 4
+
+
+def synthesized_pairs(count, seed=0):
+    """
+    Returns the candles of count pairs: pair -> timeframe -> DataFrame.
+
+    The first pair is BTC/USDT, the others its candles times their own random walk (the
+    same at the same date in all the timeframes).
+    """
+    bundled = {
+        timeframe: pd.read_feather(DATA_DIR / f"BTC_USDT-{timeframe}.feather")
+        for timeframe in ("5m", "15m")
+    }
+    dates = bundled["5m"]["date"]
+    rng = np.random.default_rng(seed)
+    pairs = {}
+    for index in range(count):
+        if index == 0:
+            pair, factors = "BTC/USDT", pd.Series(1.0, index=dates)
+        else:
+            pair = f"PAIR{index}/USDT"
+            walk = np.cumsum(rng.normal(0.0, 0.002, len(dates)))
+            factors = pd.Series(rng.uniform(0.001, 10.0) * np.exp(walk), index=dates)
+        frames = {}
+        for timeframe, df in bundled.items():
+            df = df.copy()
+            scale = factors.reindex(df["date"]).ffill().bfill().to_numpy()
+            for column in ("open", "high", "low", "close"):
+                df[column] *= scale
+            df["volume"] /= scale
+            frames[timeframe] = df
+        candles = frames["5m"].set_index("date")
+        for timeframe, rule in RESAMPLED_TIMEFRAMES.items():
+            frames[timeframe] = (
+                candles.resample(rule, label="left", closed="left")
+                .agg(
+                    {
+                        "open": "first",
+                        "high": "max",
+                        "low": "min",
+                        "close": "last",
+                        "volume": "sum",
+                    }
+                )
+                .dropna()
+                .reset_index()
+            )
+        frames["1m"] = frames["5m"]
+        pairs[pair] = frames
+    return pairs
+
+
+class DataProvider:
+    """The parts of freqtrade's DataProvider the strategies use, in backtest mode."""
+
+    def __init__(self, pairs, runmode):
+        self.pairs = pairs
+        self.runmode = runmode
+        self.analyzed = {}
+
+    def current_whitelist(self):
+        return list(self.pairs)
+
+    def get_pair_dataframe(self, pair, timeframe=None, candle_type=""):
+        frames = self.pairs.get(pair.split(":")[0], self.pairs["BTC/USDT"])
+        return frames[timeframe].copy()
+
+    def get_analyzed_dataframe(self, pair, timeframe):
+        df = self.analyzed[pair]
+        return df, df["date"].iloc[-1]
+
+    def send_msg(self, message, *, always_send=False):
+        pass
+
+
+def strategy_class(module_name):
+    """Returns the IStrategy subclass defined in the strategy module, None if there is none."""
+    from freqtrade.strategy import IStrategy
+
+    module = importlib.import_module(module_name)
+    for _, value in inspect.getmembers(module, inspect.isclass):
+        if (
+            issubclass(value, IStrategy)
+            and value is not IStrategy
+            and value.__module__ == module.__name__
+        ):
+            return value
+    return None
+
+
+def strategy_modules():
+    """Returns the strategy modules of user_data/strategies (the non-empty .py files)."""
+    return sorted(
+        path.stem
+        for path in STRATEGIES_DIR.glob("*.py")
+        if path.stat().st_size > 0 and not path.name.startswith("_")
+    )
+
+
+def open_trades(pairs, dp, entry_tags):
+    """Returns an open long trade per pair and entry tag, entered 24 candles ago."""
+    from freqtrade.persistence import LocalTrade, Order
+
+    trades = []
+    for pair in pairs:
+        df = dp.analyzed[pair]
+        open_date = df["date"].iloc[-24].to_pydatetime()
+        open_rate = float(df["close"].iloc[-24])
+        for entry_tag in entry_tags:
+            trade = LocalTrade(
+                id=len(trades) + 1,
+                pair=pair,
+                base_currency=pair.split("/")[0],
+                stake_currency="USDT",
+                open_rate=open_rate,
+                amount=100.0 / open_rate,
+                stake_amount=100.0,
+                fee_open=0.001,
+                fee_close=0.001,
+                open_date=open_date,
+                is_open=True,
+                exchange="binance",
+                enter_tag=f"{entry_tag} ",
+                leverage=1.0,
+                max_rate=float(df["high"].iloc[-24:].max()),
+                min_rate=float(df["low"].iloc[-24:].min()),
+            )
+            trade.orders.append(
+                Order(
+                    ft_order_side="buy",
+                    ft_pair=pair,
+                    ft_is_open=False,
+                    ft_amount=trade.amount,
+                    ft_price=open_rate,
+                    order_id=f"{pair}-{entry_tag}",
+                    status="closed",
+                    symbol=pair,
+                    order_type="limit",
+                    side="buy",
+                    price=open_rate,
+                    average=open_rate,
+                    amount=trade.amount,
+                    filled=trade.amount,
+                    remaining=0.0,
+                    cost=100.0,
+                    order_date=open_date,
+                    order_filled_date=open_date,
+                )
+            )
+            trades.append(trade)
+    return trades
+
+
+def time_stages(module_name, pair_count):
+    """
+    Times the stages of the strategy over all the pairs, in this interpreter.
+
+    :return dict: Stage -> seconds, None for a stage that failed (or after it).
+    """
+    from freqtrade.enums import CandleType, RunMode
+
+    results = dict.fromkeys(STAGES)
+    cls = strategy_class(module_name)
+    if cls is None:
+        return {}
+    pairs = synthesized_pairs(pair_count)
+    dp = DataProvider(pairs, RunMode.BACKTEST)
+    with tempfile.TemporaryDirectory() as user_data_dir:
+        strategy = cls(
+            {
+                "exchange": {"name": "binance"},
+                "stake_currency": "USDT",
+                "stake_amount": "unlimited",
+                "max_open_trades": 6,
+                "timeframe": cls.timeframe,
+                "runmode": RunMode.BACKTEST,
+                "candle_type_def": CandleType.SPOT,
+                "user_data_dir": Path(user_data_dir),
+            }
+        )
+        strategy.dp = dp
+        frames = {pair: dp.get_pair_dataframe(pair, cls.timeframe) for pair in pairs}
+        advise = {
+            "populate_indicators": strategy.advise_indicators,
+            "populate_entry_trend": strategy.advise_entry,
+            "populate_exit_trend": strategy.advise_exit,
+        }
+        try:
+            for stage in STAGES:
+                start = time.perf_counter()
+                for pair, df in frames.items():
+                    frames[pair] = advise[stage](df, {"pair": pair})
+                results[stage] = time.perf_counter() - start
+            if hasattr(cls, "custom_exit") and module_name == "NostalgiaForInfinityX5":
+                dp.analyzed = frames
+                trades = open_trades(pairs, dp, NFI_ENTRY_TAGS)
+                start = time.perf_counter()
+                for trade in trades:
+                    df = frames[trade.pair]
+                    current_rate = float(df["close"].iloc[-1])
+                    strategy.custom_exit(
+                        trade.pair,
+                        trade,
+                        df["date"].iloc[-1].to_pydatetime() + timedelta(minutes=5),
+                        current_rate,
+                        trade.calc_profit_ratio(current_rate),
+                    )
+                results["custom_exit"] = time.perf_counter() - start
+        except Exception:
+            traceback.print_exc()
+    return results
+
+
+def strategy_seconds(module_name, pair_count, repeat):
+    """Median stage times of the strategy, each repeat in a new interpreter."""
+    runs = []
+    for _ in range(repeat):
+        process = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.strategies",
+                "--worker",
+                module_name,
+                "--pairs",
+                str(pair_count),
+            ],
+            cwd=ROOT_DIR,
+            capture_output=True,
+            text=True,
+        )
+        run = (
+            json.loads(process.stdout.splitlines()[-1])
+            if process.returncode == 0
+            else {}
+        )
+        if not run or None in run.values():
+            lines = process.stderr.strip().splitlines()
+            print(f"{module_name}: {lines[-1] if lines else 'failed'}", file=sys.stderr)
+        if not run:
+            break
+        runs.append(run)
+    results = {}
+    for stage in sorted({stage for run in runs for stage in run} or STAGES):
+        durations = [run.get(stage) for run in runs]
+        results[f"strategies.{module_name}.{stage}"] = (
+            statistics.median(durations) if runs and None not in durations else None
+        )
+    return results
+
+
+def run(repeat=3, pair_count=DEFAULT_PAIRS, modules=None):
+    """Returns the strategy benchmarks, name -> median seconds."""
+    results = {}
+    for module_name in modules or strategy_modules():
+        results.update(strategy_seconds(module_name, pair_count, repeat))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pairs", type=int, default=DEFAULT_PAIRS)
+    add_arguments(parser, repeat=3)
+    parser.add_argument("--strategy", nargs="*", help="Strategy modules (default: all)")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        sys.path.insert(0, str(STRATEGIES_DIR))
+        print(json.dumps(time_stages(args.worker, args.pairs)))
+        return 0
+    results = run(args.repeat, args.pairs, args.strategy)
+    return report(results, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
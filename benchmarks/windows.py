@@ -0,0 +1,124 @@
+"""
+The candle window helpers of nfi_lib.windows against the functions they replace.
+
+The current functions are the module level helpers of NostalgiaForInfinityX5, compiled
+from the strategy source (so freqtrade is not needed), and qtpylib.heikinashi() (used by
+Strategy001) when freqtrade is installed. Each benchmark runs on the bundled 5m candles.
+
+Usage: python -m benchmarks.windows [--repeat N] [--output FILE] [--baseline FILE]
+"""
+
+import argparse
+import ast
+import sys
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+import talib.abstract as ta
+
+from benchmarks.baseline import (
+    ROOT_DIR,
+    STRATEGIES_DIR,
+    add_arguments,
+    median_seconds,
+    report,
+)
+
+DATA_FILE = ROOT_DIR / "user_data" / "data" / "binance" / "BTC_USDT-5m.feather"
+
+STRATEGY_FUNCTIONS = ("is_support", "is_resistance", "heikin_ashi", "pivot_points")
+
+# Candles of the support/resistance windows
+WINDOW = 5
+
+
+def strategy_functions(names=STRATEGY_FUNCTIONS):
+    """Returns the module level functions of NostalgiaForInfinityX5, by name."""
+    path = STRATEGIES_DIR / "NostalgiaForInfinityX5.py"
+    tree = ast.parse(path.read_text())
+    module = ast.Module(
+        body=[
+            node
+            for node in tree.body
+            if isinstance(node, ast.FunctionDef) and node.name in names
+        ],
+        type_ignores=[],
+    )
+    namespace = {
+        "DataFrame": pd.DataFrame,
+        "Series": pd.Series,
+        "np": np,
+        "reduce": reduce,
+        "ta": ta,
+    }
+    exec(compile(module, str(path), "exec"), namespace)
+    return {name: namespace[name] for name in names}
+
+
+def qtpylib_heikinashi():
+    """Returns qtpylib.heikinashi(), None without freqtrade."""
+    try:
+        import freqtrade.vendor.qtpylib.indicators as qtpylib
+    except ImportError:
+        return None
+    return qtpylib.heikinashi
+
+
+def benchmarks():
+    """Returns the benchmarks, name -> function."""
+    if str(STRATEGIES_DIR) not in sys.path:
+        sys.path.insert(0, str(STRATEGIES_DIR))
+    from nfi_lib import windows
+
+    df = pd.read_feather(DATA_FILE)
+    low, high = df["low"], df["high"]
+    current = strategy_functions()
+    is_support, is_resistance = current["is_support"], current["is_resistance"]
+    heikin_ashi, pivot_points = current["heikin_ashi"], current["pivot_points"]
+    heikinashi = qtpylib_heikinashi()
+
+    functions = {
+        "windows.is_support.current": (
+            lambda: low.rolling(WINDOW).apply(is_support, raw=True)
+        ),
+        "windows.is_support.vectorized": lambda: windows.rolling_support(low, WINDOW),
+        "windows.is_resistance.current": (
+            lambda: high.rolling(WINDOW).apply(is_resistance, raw=True)
+        ),
+        "windows.is_resistance.vectorized": (
+            lambda: windows.rolling_resistance(high, WINDOW)
+        ),
+        "windows.heikin_ashi.current": lambda: heikin_ashi(df),
+        "windows.heikin_ashi.vectorized": lambda: windows.heikin_ashi(df),
+        "windows.heikinashi.current": heikinashi and (lambda: heikinashi(df)),
+        "windows.heikinashi.vectorized": lambda: windows.heikinashi(df),
+    }
+    for mode in ("simple", "fibonacci", "DeMark"):
+        name = f"windows.pivot_points_{mode}"
+        functions[f"{name}.current"] = lambda mode=mode: pivot_points(df, mode)
+        functions[f"{name}.vectorized"] = lambda mode=mode: windows.pivot_points(
+            df, mode
+        )
+    return functions
+
+
+def run(repeat=5):
+    """Returns the window benchmarks, name -> median seconds."""
+    return {
+        name: None if func is None else median_seconds(func, repeat)
+        for name, func in benchmarks().items()
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    add_arguments(parser, repeat=5)
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat)
+    return report(results, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,13 @@
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+# Strategies (and their helper modules) are loaded by freqtrade from user_data/strategies
+STRATEGIES_DIR = ROOT_DIR / "user_data" / "strategies"
+if str(STRATEGIES_DIR) not in sys.path:
+    sys.path.insert(0, str(STRATEGIES_DIR))
+
+# The benchmarks package, when pytest is not run from the repository root
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
@@ -0,0 +1,208 @@
+"""
+Reference indicators for the NostalgiaForInfinityX5 helper tests.
+
+Computed with TA-Lib and pandas the same way pandas_ta does when TA-Lib is installed, so the tests
+don't need pandas_ta itself.
+"""
+
+import sys
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+import talib
+import talib.abstract as ta
+
+
+def _non_zero_range(high, low):
+    # pandas_ta non_zero_range()
+    diff = high - low
+    if diff.eq(0).any():
+        diff += sys.float_info.epsilon
+    return diff
+
+
+def full_indicators(df):
+    """Same columns as base_tf_5m_indicators(), computed with TA-Lib like pandas_ta does."""
+    df = df.copy()
+    close, high, low, volume = df["close"], df["high"], df["low"], df["volume"]
+    for length in (3, 4, 14, 20):
+        df[f"RSI_{length}"] = talib.RSI(close, length)
+    for length in (3, 14):
+        rsi = df[f"RSI_{length}"]
+        df[f"RSI_{length}_change_pct"] = ((rsi - rsi.shift(1)) / (rsi.shift(1))) * 100.0
+    for length in (3, 9, 12, 16, 20, 26, 50, 200):
+        df[f"EMA_{length}"] = talib.EMA(close, length)
+    df["EMA_200"] = df["EMA_200"].fillna(0.0)
+    for length in (16, 30):
+        df[f"SMA_{length}"] = talib.SMA(close, length)
+    upper, middle, lower = talib.BBANDS(close, 20, 2.0, 2.0, 0)
+    df["BBL_20_2.0"], df["BBM_20_2.0"], df["BBU_20_2.0"] = lower, middle, upper
+    df["BBB_20_2.0"] = 100 * (upper - lower) / middle
+    df["BBP_20_2.0"] = _non_zero_range(close, lower) / _non_zero_range(upper, lower)
+    df["MFI_14"] = talib.MFI(high, low, close, volume, 14)
+    ad = 2 * close - (high + low)
+    ad *= volume / _non_zero_range(high, low)
+    df["CMF_20"] = ad.rolling(20).sum() / volume.rolling(20).sum()
+    df["WILLR_14"] = talib.WILLR(high, low, close, 14)
+    df["WILLR_480"] = talib.WILLR(high, low, close, 480)
+    df["AROOND_14"], df["AROONU_14"] = talib.AROON(high, low, 14)
+    rsi = talib.RSI(close, 14)
+    lowest, highest = rsi.rolling(14).min(), rsi.rolling(14).max()
+    stoch = 100 * (rsi - lowest)
+    stoch /= _non_zero_range(highest, lowest)
+    df["STOCHRSIk_14_14_3_3"] = talib.SMA(stoch, 3)
+    df["STOCHRSId_14_14_3_3"] = talib.SMA(df["STOCHRSIk_14_14_3_3"], 3)
+    kst = 100 * sum(
+        weight * talib.ROC(close, length).rolling(window).mean()
+        for weight, length, window in (
+            (1, 10, 10),
+            (2, 15, 10),
+            (3, 20, 10),
+            (4, 30, 15),
+        )
+    )
+    df["KST_10_15_20_30_10_10_10_15"] = kst
+    df["KSTs_9"] = kst.rolling(9).mean()
+    df["OBV"] = talib.OBV(close, volume)
+    df["OBV_change_pct"] = (
+        (df["OBV"] - df["OBV"].shift(1)) / abs(df["OBV"].shift(1))
+    ) * 100.0
+    df["ROC_2"] = talib.ROC(close, 2)
+    df["ROC_9"] = talib.ROC(close, 9)
+    df["change_pct"] = (close - df["open"]) / df["open"] * 100.0
+    df["close_max_48"] = close.rolling(48).max()
+    df["num_empty_288"] = (volume <= 0).rolling(window=288, min_periods=288).sum()
+    return df
+
+
+def stoch(df, k=14, smooth_k=3, d=3):
+    lowest = df["low"].rolling(k).min()
+    highest = df["high"].rolling(k).max()
+    values = 100 * (df["close"] - lowest)
+    values /= _non_zero_range(highest, lowest)
+    stoch_k = talib.SMA(values, smooth_k)
+    return stoch_k, talib.SMA(stoch_k, d)
+
+
+def uo(df):
+    return talib.ULTOSC(df["high"], df["low"], df["close"], 7, 14, 28)
+
+
+def cci(df, length=20):
+    return talib.CCI(df["high"], df["low"], df["close"], length)
+
+
+# The module level helpers of NostalgiaForInfinityX5, and qtpylib.heikinashi()
+
+
+def is_support(row_data):
+    conditions = []
+    for row in range(len(row_data) - 1):
+        if row < len(row_data) // 2:
+            conditions.append(row_data[row] > row_data[row + 1])
+        else:
+            conditions.append(row_data[row] < row_data[row + 1])
+    return reduce(lambda x, y: x & y, conditions)
+
+
+def is_resistance(row_data):
+    conditions = []
+    for row in range(len(row_data) - 1):
+        if row < len(row_data) // 2:
+            conditions.append(row_data[row] < row_data[row + 1])
+        else:
+            conditions.append(row_data[row] > row_data[row + 1])
+    return reduce(lambda x, y: x & y, conditions)
+
+
+def pivot_points(df, mode="fibonacci"):
+    if mode == "simple":
+        hlc3_pivot = (df["high"] + df["low"] + df["close"]).shift(1) / 3
+        res1 = hlc3_pivot * 2 - df["low"].shift(1)
+        sup1 = hlc3_pivot * 2 - df["high"].shift(1)
+        res2 = hlc3_pivot + (df["high"] - df["low"]).shift()
+        sup2 = hlc3_pivot - (df["high"] - df["low"]).shift()
+        res3 = hlc3_pivot * 2 + (df["high"] - 2 * df["low"]).shift()
+        sup3 = hlc3_pivot * 2 - (2 * df["high"] - df["low"]).shift()
+        return hlc3_pivot, res1, res2, res3, sup1, sup2, sup3
+    elif mode == "fibonacci":
+        hlc3_pivot = (df["high"] + df["low"] + df["close"]).shift(1) / 3
+        hl_range = (df["high"] - df["low"]).shift(1)
+        res1 = hlc3_pivot + 0.382 * hl_range
+        sup1 = hlc3_pivot - 0.382 * hl_range
+        res2 = hlc3_pivot + 0.618 * hl_range
+        sup2 = hlc3_pivot - 0.618 * hl_range
+        res3 = hlc3_pivot + 1 * hl_range
+        sup3 = hlc3_pivot - 1 * hl_range
+        return hlc3_pivot, res1, res2, res3, sup1, sup2, sup3
+    elif mode == "DeMark":
+        demark_pivot_lt = df["low"] * 2 + df["high"] + df["close"]
+        demark_pivot_eq = df["close"] * 2 + df["low"] + df["high"]
+        demark_pivot_gt = df["high"] * 2 + df["low"] + df["close"]
+        demark_pivot = np.where(
+            (df["close"] < df["open"]),
+            demark_pivot_lt,
+            np.where((df["close"] > df["open"]), demark_pivot_gt, demark_pivot_eq),
+        )
+        dm_pivot = demark_pivot / 4
+        dm_res = demark_pivot / 2 - df["low"]
+        dm_sup = demark_pivot / 2 - df["high"]
+        return dm_pivot, dm_res, dm_sup
+
+
+def heikin_ashi(df, smooth_inputs=False, smooth_outputs=False, length=10):
+    df = df[["open", "close", "high", "low"]].copy().fillna(0)
+    if smooth_inputs:
+        df["open_s"] = ta.EMA(df["open"], timeframe=length)
+        df["high_s"] = ta.EMA(df["high"], timeframe=length)
+        df["low_s"] = ta.EMA(df["low"], timeframe=length)
+        df["close_s"] = ta.EMA(df["close"], timeframe=length)
+
+        open_ha = (df["open_s"].shift(1) + df["close_s"].shift(1)) / 2
+        high_ha = df.loc[:, ["high_s", "open_s", "close_s"]].max(axis=1)
+        low_ha = df.loc[:, ["low_s", "open_s", "close_s"]].min(axis=1)
+        close_ha = (df["open_s"] + df["high_s"] + df["low_s"] + df["close_s"]) / 4
+    else:
+        open_ha = (df["open"].shift(1) + df["close"].shift(1)) / 2
+        high_ha = df.loc[:, ["high", "open", "close"]].max(axis=1)
+        low_ha = df.loc[:, ["low", "open", "close"]].min(axis=1)
+        close_ha = (df["open"] + df["high"] + df["low"] + df["close"]) / 4
+
+    open_ha = open_ha.fillna(0)
+    high_ha = high_ha.fillna(0)
+    low_ha = low_ha.fillna(0)
+    close_ha = close_ha.fillna(0)
+
+    if smooth_outputs:
+        open_sha = ta.EMA(open_ha, timeframe=length)
+        low_sha = ta.EMA(low_ha, timeframe=length)
+        close_sha = ta.EMA(close_ha, timeframe=length)
+
+        return open_sha, close_sha, low_sha
+    else:
+        return open_ha, close_ha, low_ha
+
+
+def heikinashi(bars):
+    bars = bars.copy()
+    bars["ha_close"] = (bars["open"] + bars["high"] + bars["low"] + bars["close"]) / 4
+
+    bars.at[0, "ha_open"] = (bars.at[0, "open"] + bars.at[0, "close"]) / 2
+    for i in range(1, len(bars)):
+        bars.at[i, "ha_open"] = (
+            bars.at[i - 1, "ha_open"] + bars.at[i - 1, "ha_close"]
+        ) / 2
+
+    bars["ha_high"] = bars.loc[:, ["high", "ha_open", "ha_close"]].max(axis=1)
+    bars["ha_low"] = bars.loc[:, ["low", "ha_open", "ha_close"]].min(axis=1)
+
+    return pd.DataFrame(
+        index=bars.index,
+        data={
+            "open": bars["ha_open"],
+            "high": bars["ha_high"],
+            "low": bars["ha_low"],
+            "close": bars["ha_close"],
+        },
+    )
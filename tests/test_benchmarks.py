@@ -0,0 +1,120 @@
+import argparse
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+
+from benchmarks.baseline import (  # noqa: E402
+    CALIBRATION,
+    add_arguments,
+    regressions,
+    report,
+)
+from benchmarks.strategies import DataProvider, synthesized_pairs  # noqa: E402
+
+
+class TestRegressions:
+    def test_slower_than_tolerance(self):
+        baseline = {"a": 0.100, "b": 0.100, CALIBRATION: 0.05}
+        results = {"a": 0.105, "b": 0.120, CALIBRATION: 0.05}
+
+        assert regressions(results, baseline) == {
+            "b": {"baseline": 0.100, "seconds": 0.120}
+        }
+
+    def test_scaled_by_calibration(self):
+        # This machine is twice as slow as the baseline one
+        baseline = {"a": 0.100, "b": 0.100, CALIBRATION: 0.05}
+        results = {"a": 0.205, "b": 0.250, CALIBRATION: 0.10}
+
+        assert list(regressions(results, baseline)) == ["b"]
+        assert regressions(results, baseline)["b"]["baseline"] == pytest.approx(0.2)
+
+    def test_timer_noise(self):
+        assert regressions({"a": 0.0008}, {"a": 0.0001}) == {}
+
+    def test_missing_or_null(self):
+        baseline = {"a": 0.100, "b": None}
+        results = {"a": None, "b": 0.200, "c": 0.300}
+
+        assert regressions(results, baseline) == {}
+
+
+class TestReport:
+    def arguments(self, *argv):
+        parser = argparse.ArgumentParser()
+        add_arguments(parser, repeat=1)
+        return parser.parse_args(argv)
+
+    def test_regression(self, tmp_path):
+        baseline = tmp_path / "baseline.json"
+        baseline.write_text(json.dumps({"a": 0.001}))
+        output = tmp_path / "results.json"
+
+        status = report(
+            {"a": 10.0},
+            self.arguments("--baseline", str(baseline), "--output", str(output)),
+        )
+
+        assert status == 1
+        assert json.loads(output.read_text())["a"] == 10.0
+
+    def test_report_only(self, tmp_path, capsys):
+        baseline = tmp_path / "baseline.json"
+        baseline.write_text(json.dumps({"a": 0.001}))
+        output = tmp_path / "results.json"
+
+        status = report(
+            {"a": 10.0},
+            self.arguments(
+                "--baseline", str(baseline), "--output", str(output), "--report-only"
+            ),
+        )
+
+        assert status == 0
+        assert capsys.readouterr().err.startswith("a: 10.0000s")
+
+
+@pytest.fixture(scope="module")
+def pairs():
+    return synthesized_pairs(3)
+
+
+class TestSynthesizedPairs:
+    def test_pairs(self, pairs):
+        assert list(pairs) == ["BTC/USDT", "PAIR1/USDT", "PAIR2/USDT"]
+        for frames in pairs.values():
+            assert set(frames) == {"1m", "5m", "15m", "30m", "1h", "4h", "1d"}
+
+    def test_own_price_path(self, pairs):
+        btc = pairs["BTC/USDT"]["5m"]
+        pair = pairs["PAIR1/USDT"]["5m"]
+
+        assert (pair["date"] == btc["date"]).all()
+        assert not np.allclose(
+            (pair["close"] / btc["close"]).to_numpy(),
+            pair["close"].iloc[0] / btc["close"].iloc[0],
+        )
+        assert (pair["high"] >= pair[["open", "close"]].max(axis=1) * (1 - 1e-12)).all()
+        assert (pair["low"] <= pair[["open", "close"]].min(axis=1) * (1 + 1e-12)).all()
+
+    def test_resampled(self, pairs):
+        candles = pairs["PAIR2/USDT"]["5m"]
+        hourly = pairs["PAIR2/USDT"]["1h"]
+
+        first = candles[candles["date"] < hourly["date"].iloc[1]]
+        assert hourly["high"].iloc[0] == first["high"].max()
+        assert hourly["close"].iloc[0] == first["close"].iloc[-1]
+
+    def test_data_provider(self, pairs):
+        dp = DataProvider(pairs, "backtest")
+
+        df = dp.get_pair_dataframe("PAIR1/USDT", "15m")
+        df["close"] = 0.0
+
+        assert dp.current_whitelist() == list(pairs)
+        assert (pairs["PAIR1/USDT"]["15m"]["close"] > 0).all()
+        assert dp.get_pair_dataframe("BTC/USDT:USDT", "1h") is not None
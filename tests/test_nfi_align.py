@@ -0,0 +1,140 @@
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from nfi_lib import InformativeAligner, informative_index  # noqa: E402
+
+DATA_FILE = (
+    Path(__file__).resolve().parent.parent
+    / "user_data"
+    / "data"
+    / "binance"
+    / "BTC_USDT-5m.feather"
+)
+
+OHLCV = ["date", "open", "high", "low", "close", "volume"]
+
+
+def dates(start, periods, freq):
+    return pd.date_range(start, periods=periods, freq=freq, tz="UTC")
+
+
+def resample(df, rule):
+    informative = (
+        df.set_index("date")
+        .resample(rule, label="left", closed="left")
+        .agg(
+            {
+                "open": "first",
+                "high": "max",
+                "low": "min",
+                "close": "last",
+                "volume": "sum",
+            }
+        )
+        .dropna()
+        .reset_index()
+    )
+    informative["RSI_3"] = informative["close"].rolling(3).mean()
+    informative["green"] = informative["close"] > informative["open"]
+    return informative
+
+
+class TestInformativeIndex:
+    def test_forward_fill_of_matches(self):
+        base = dates("2025-01-01 00:00", 8, "5min").to_numpy()
+        # 15m candles merged at date + 15m - 5m
+        date_merge = (
+            dates("2025-01-01 00:00", 3, "15min") + pd.Timedelta("10min")
+        ).to_numpy()
+
+        index, filled = informative_index(base, date_merge)
+
+        assert index.tolist() == [-1, -1, 0, 0, 0, 1, 1, 1]
+        assert filled
+
+    def test_first_candles_take_the_previous_informative(self):
+        base = dates("2025-01-01 00:05", 6, "5min").to_numpy()
+        date_merge = (
+            dates("2024-12-31 23:45", 3, "15min") + pd.Timedelta("10min")
+        ).to_numpy()
+
+        index, filled = informative_index(base, date_merge)
+
+        assert index.tolist() == [0, 1, 1, 1, 2, 2]
+        assert filled
+
+    def test_missing_base_candle_keeps_previous_match(self):
+        base = dates("2025-01-01 00:00", 8, "5min").delete(5).to_numpy()
+        date_merge = (
+            dates("2025-01-01 00:00", 3, "15min") + pd.Timedelta("10min")
+        ).to_numpy()
+
+        index, _ = informative_index(base, date_merge)
+
+        assert index.tolist() == [-1, -1, 0, 0, 0, 0, 0]
+
+    def test_empty(self):
+        index, filled = informative_index(
+            dates("2025-01-01", 3, "5min").to_numpy(), np.array([], dtype="M8[ns]")
+        )
+
+        assert index.tolist() == [-1, -1, -1]
+        assert not filled
+
+
+class TestInformativeAligner:
+    def test_mapping_shared_between_frames_with_same_candles(self):
+        aligner = InformativeAligner()
+        base = pd.DataFrame({"date": dates("2025-01-01", 12, "5min")})
+        informative = pd.DataFrame(
+            {"date": dates("2025-01-01", 4, "15min"), "RSI_14": [1.0, 2.0, 3.0, 4.0]}
+        )
+        entry = ("15m", informative, pd.Timedelta("10min"), ["date_15m"])
+
+        first = aligner.merge(base, [entry])
+        second = aligner.merge(base, [entry])
+
+        assert aligner.misses == 1
+        assert aligner.hits == 1
+        pd.testing.assert_frame_equal(first, second)
+        assert list(first.columns) == ["date", "RSI_14_15m"]
+
+    def test_same_as_merge_informative_pair(self):
+        pytest.importorskip("freqtrade")
+        pytest.importorskip("pyarrow")
+        from freqtrade.strategy import merge_informative_pair
+
+        candles = pd.read_feather(DATA_FILE)
+        informatives = {
+            timeframe: resample(candles, rule)
+            for timeframe, rule in (("15m", "15min"), ("1h", "1h"), ("4h", "4h"))
+        }
+        minutes = {"15m": 15, "1h": 60, "4h": 240}
+        aligner = InformativeAligner()
+
+        # Starting between two informative candles, and with a missing base candle
+        base = candles.iloc[37:2000].drop(index=[500]).reset_index(drop=True)
+        expected = base.copy()
+        entries = []
+        for timeframe, informative in informatives.items():
+            drop_columns = [f"{column}_{timeframe}" for column in OHLCV]
+            expected = merge_informative_pair(
+                expected, informative, "5m", timeframe, ffill=True
+            )
+            expected.drop(
+                columns=expected.columns.intersection(drop_columns), inplace=True
+            )
+            entries.append(
+                (
+                    timeframe,
+                    informative,
+                    pd.Timedelta(minutes=minutes[timeframe] - 5),
+                    drop_columns,
+                )
+            )
+
+        pd.testing.assert_frame_equal(aligner.merge(base, entries), expected)
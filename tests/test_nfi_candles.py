@@ -0,0 +1,66 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from nfi_lib import CandleFrame  # noqa: E402
+
+
+def frame():
+    return pd.DataFrame(
+        {
+            "date": pd.date_range("2024-01-01", periods=8, freq="5min", tz="UTC"),
+            "close": np.linspace(100.0, 107.0, 8),
+            "RSI_14": np.linspace(30.0, 37.0, 8).astype(np.float32),
+            "num_empty_288": np.arange(8),
+            "is_green": [True, False] * 4,
+            "is_red_4h": pd.Series([np.nan] + [True] * 7, dtype=object),
+            "enter_tag": ["", "1 "] * 4,
+        }
+    )
+
+
+class TestCandleFrame:
+    def test_same_values_as_iloc(self):
+        df = frame()
+        candles = CandleFrame(df)
+
+        for position in (-1, -2, -8, 0, 3):
+            row = candles.row(position)
+            expected = df.iloc[position].squeeze()
+            for column in df.columns:
+                value = row[column]
+                assert type(value) is type(expected[column])
+                assert value == expected[column] or (
+                    pd.isna(value) and pd.isna(expected[column])
+                )
+
+    def test_float64_check(self):
+        row = CandleFrame(frame()).row(-1)
+
+        assert isinstance(row["close"], np.float64)
+        assert not isinstance(row["RSI_14"], np.float64)
+
+    def test_out_of_bounds(self):
+        candles = CandleFrame(frame())
+
+        with pytest.raises(IndexError):
+            candles.row(-9)
+        with pytest.raises(IndexError):
+            candles.row(8)
+
+    def test_missing_column(self):
+        row = CandleFrame(frame()).row(-1)
+
+        with pytest.raises(KeyError):
+            row["RSI_3"]
+        assert "RSI_3" not in row
+        assert row.get("RSI_3") is None
+
+    def test_arrays_read_once(self):
+        candles = CandleFrame(frame())
+
+        candles.row(-1)["close"]
+        candles.row(-2)["close"]
+
+        assert list(candles.arrays) == ["close"]
@@ -0,0 +1,246 @@
+import ast
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from nfi_lib import (  # noqa: E402
+    compact_frame,
+    exit_signal_differences,
+    float64_checked_columns,
+    signal_differences,
+)
+
+STRATEGY_FILE = (
+    Path(__file__).resolve().parent.parent
+    / "user_data"
+    / "strategies"
+    / "NostalgiaForInfinityX5.py"
+)
+
+DATA_FILE = (
+    Path(__file__).resolve().parent.parent
+    / "user_data"
+    / "data"
+    / "binance"
+    / "BTC_USDT-5m.feather"
+)
+
+# The strategy, and the modules of its functions installed on the class (the short side)
+STRATEGY_SOURCES = [
+    STRATEGY_FILE,
+    *sorted((STRATEGY_FILE.parent / "nfi_lib").glob("*.py")),
+]
+
+SIGNAL_COLUMNS = [
+    "enter_long",
+    "enter_short",
+    "enter_tag",
+    "exit_long",
+    "exit_short",
+    "exit_tag",
+]
+
+
+def frame():
+    return pd.DataFrame(
+        {
+            "close": [100000.01, 100000.02, 100000.03],
+            "EMA_200_1h": [99999.99, 100000.0, 100000.01],
+            "RSI_14_1h": [29.5, 30.0, np.nan],
+            "global_protections_long_pump": [True, False, True],
+            "is_green_4h": pd.Series([True, False, True], dtype=object),
+            "is_red_4h": pd.Series([np.nan, False, True], dtype=object),
+        }
+    )
+
+
+def type_checked_columns():
+    # The x["column"] of the isinstance(x["column"], np.float64) calls
+    columns = set()
+    for path in STRATEGY_SOURCES:
+        for node in ast.walk(ast.parse(path.read_text())):
+            if (
+                isinstance(node, ast.Call)
+                and isinstance(node.func, ast.Name)
+                and node.func.id == "isinstance"
+                and len(node.args) == 2
+                and ast.unparse(node.args[1]) == "np.float64"
+                and isinstance(node.args[0], ast.Subscript)
+                and isinstance(node.args[0].slice, ast.Constant)
+            ):
+                columns.add(node.args[0].slice.value)
+    return columns
+
+
+class TestCompactFrame:
+    def test_dtypes(self):
+        df = compact_frame(frame())
+
+        assert df.dtypes.to_dict() == {
+            "close": np.float64,
+            "EMA_200_1h": np.float64,
+            "RSI_14_1h": np.float32,
+            "global_protections_long_pump": bool,
+            "is_green_4h": bool,
+            # A missing value would become True
+            "is_red_4h": object,
+        }
+        np.testing.assert_array_equal(df["RSI_14_1h"], [29.5, 30.0, np.nan])
+
+    def test_type_checked_columns_stay_float64(self):
+        df = compact_frame(frame(), float64_columns={"RSI_14_1h"})
+
+        assert df["RSI_14_1h"].dtype == np.float64
+
+    def test_float64_checked_columns(self):
+        columns = float64_checked_columns(STRATEGY_FILE.read_text())
+
+        assert {"ROC_9_1d", "STOCHRSIk_14_14_3_3_1d"} <= columns
+        assert "RSI_3" not in columns
+
+    def test_already_compact(self):
+        df = compact_frame(frame())
+
+        assert compact_frame(df) is df
+
+
+class TestValidationHarness:
+    def test_signal_differences(self):
+        full = pd.DataFrame({"enter_long": [1, 0, 1], "enter_tag": ["1 ", "", None]})
+        compact = pd.DataFrame({"enter_long": [1, 1, 1], "enter_tag": ["1 ", "", None]})
+
+        assert signal_differences(full, compact, SIGNAL_COLUMNS) == {"enter_long": 1}
+
+    def test_exit_signal_differences(self):
+        full = pd.DataFrame({"RSI_14": [50.0] * 6 + [84.00000001]})
+        compact = full.astype(np.float32)
+
+        def exit_signal(
+            mode_name, current_profit, max_profit, max_loss, last_candle, *args
+        ):
+            if (last_candle["RSI_14"] > 84.0) and (current_profit > 0.01):
+                return True, f"exit_{mode_name}_1"
+            return False, None
+
+        differences = exit_signal_differences(
+            {"exit_signal": exit_signal}, full, compact
+        )
+
+        # Only the profitable evaluations of the last candle flip
+        assert differences == {"exit_signal": 5}
+
+
+# The NFI entry/exit signals on the bundled data, with and without the compact mode
+@pytest.fixture(scope="module")
+def analyzed(tmp_path_factory):
+    pytest.importorskip("freqtrade")
+    pytest.importorskip("pandas_ta")
+    pytest.importorskip("pyarrow")
+    from freqtrade.enums import CandleType, RunMode
+    from NostalgiaForInfinityX5 import NostalgiaForInfinityX5
+
+    candles = pd.read_feather(DATA_FILE)
+    frames = {"5m": candles}
+    for timeframe, rule in (
+        ("15m", "15min"),
+        ("1h", "1h"),
+        ("4h", "4h"),
+        ("1d", "1D"),
+    ):
+        frames[timeframe] = (
+            candles.set_index("date")
+            .resample(rule, label="left", closed="left")
+            .agg(
+                {
+                    "open": "first",
+                    "high": "max",
+                    "low": "min",
+                    "close": "last",
+                    "volume": "sum",
+                }
+            )
+            .dropna()
+            .reset_index()
+        )
+
+    class DataProvider:
+        runmode = RunMode.BACKTEST
+
+        def get_pair_dataframe(self, pair, timeframe):
+            return frames[timeframe].copy()
+
+    def analyze(compact):
+        strategy = NostalgiaForInfinityX5(
+            {
+                "exchange": {"name": "binance"},
+                "stake_currency": "USDT",
+                "max_open_trades": 6,
+                "runmode": RunMode.BACKTEST,
+                "candle_type_def": CandleType.SPOT,
+                "user_data_dir": tmp_path_factory.mktemp("user_data"),
+                "compact_mode_enable": compact,
+            }
+        )
+        strategy.dp = DataProvider()
+        metadata = {"pair": "BTC/USDT"}
+        df = strategy.populate_indicators(candles.copy(), metadata)
+        df = strategy.populate_entry_trend(df, metadata)
+        df = strategy.populate_exit_trend(df, metadata)
+        return strategy, df
+
+    _, full = analyze(False)
+    strategy, compact = analyze(True)
+    return strategy, full, compact
+
+
+class TestCompactSignals:
+    def test_memory(self, analyzed):
+        _, full, compact = analyzed
+
+        assert compact.memory_usage().sum() < full.memory_usage().sum()
+
+    def test_type_checked_columns_stay_float64(self, analyzed):
+        strategy, full, compact = analyzed
+        columns = type_checked_columns()
+
+        # Only type checked by the short side functions
+        assert "AROOND_14_1d" in columns
+        assert columns <= strategy.compact_float64_columns
+        assert columns <= set(compact.columns)
+        assert full["AROOND_14_1d"].dtype == np.float64
+        assert {
+            column: compact[column].dtype
+            for column in columns
+            if compact[column].dtype != full[column].dtype
+        } == {}
+
+    def test_entry_signals(self, analyzed):
+        _, full, compact = analyzed
+
+        assert signal_differences(full, compact, SIGNAL_COLUMNS) == {}
+
+    def test_exit_signals(self, analyzed):
+        strategy, full, compact = analyzed
+        exit_functions = {
+            name: getattr(strategy, name)
+            for name in (
+                "long_exit_signals",
+                "long_exit_main",
+                "long_exit_williams_r",
+                "long_exit_dec",
+                "short_exit_signals",
+                "short_exit_main",
+                "short_exit_williams_r",
+                "short_exit_dec",
+            )
+        }
+
+        assert (
+            exit_signal_differences(
+                exit_functions, full.iloc[-1000:], compact.iloc[-1000:]
+            )
+            == {}
+        )
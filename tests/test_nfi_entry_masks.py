@@ -0,0 +1,261 @@
+import inspect
+import traceback
+from functools import reduce
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from nfi_lib import (  # noqa: E402
+    EntryMask,
+    compile_entry_function,
+    compile_entry_source,
+    entry_tail_frame,
+    merge_tail_signals,
+)
+
+# Same structure as the entry conditions of populate_entry_trend()
+ENTRY_SOURCE = """
+def populate_entry_trend(self, df, metadata):
+    long_entry_conditions = []
+    df.loc[:, "enter_tag"] = ""
+    df.loc[:, "enter_long"] = False
+    for enabled, condition_index in ((True, 1), (True, 2), (False, 3)):
+        if not enabled:
+            continue
+        long_entry_logic = []
+        long_entry_logic.append(reduce(lambda x, y: x & y, [True]))
+        if condition_index == 1:
+            long_entry_logic.append(df["RSI_3"] < 20.0)
+            long_entry_logic.append(df["is_green"])
+            long_entry_logic.append(df["close"] > df["EMA_200"])
+            long_entry_logic.append(df["RSI_3"] < df["RSI_3"].shift(3))
+        if condition_index == 2:
+            long_entry_logic.append(df["RSI_3"] > 200.0)
+            long_entry_logic.append(df["missing_column"] > 0.0)
+        long_entry_logic.append(df["volume"] > 0)
+        item_long_entry = reduce(lambda x, y: x & y, long_entry_logic)
+        df.loc[item_long_entry, "enter_tag"] += f"{condition_index} "
+        long_entry_conditions.append(item_long_entry)
+        df.loc[:, "enter_long"] = item_long_entry
+    if long_entry_conditions:
+        df.loc[:, "enter_long"] = reduce(lambda x, y: x | y, long_entry_conditions)
+    return df
+"""
+
+
+DATA_FILE = (
+    Path(__file__).resolve().parent.parent
+    / "user_data"
+    / "data"
+    / "binance"
+    / "BTC_USDT-5m.feather"
+)
+
+
+def frame():
+    rng = np.random.default_rng(42)
+    size = 500
+    return pd.DataFrame(
+        {
+            "RSI_3": rng.uniform(0.0, 100.0, size),
+            "close": rng.normal(100.0, 2.0, size),
+            "EMA_200": rng.normal(100.0, 2.0, size),
+            "volume": rng.uniform(0.0, 10.0, size),
+            "is_green": pd.Series(rng.random(size) < 0.5, dtype=object),
+        }
+    )
+
+
+def compiled():
+    return compile_entry_source(ENTRY_SOURCE, "<entry>", 1, {"reduce": reduce})
+
+
+class TestEntryMask:
+    def test_clauses(self):
+        mask = EntryMask(pd.RangeIndex(4))
+        mask.append(True)
+        mask.append(pd.Series([True, True, False, True]))
+        mask.append(np.array([True, False, True, True]))
+        # Missing values are False, same as the & of pandas
+        mask.append(pd.Series([True, True, True, np.nan], dtype=object))
+
+        assert mask.series().tolist() == [True, False, False, False]
+        assert mask.evaluated == 4
+
+    def test_short_circuit(self):
+        mask = EntryMask(pd.RangeIndex(3))
+        mask.append(lambda: pd.Series([False, False, False]))
+        mask.append(lambda: 1 / 0)
+
+        assert not mask.series().any()
+        assert mask.evaluated == 1
+        assert mask.skipped == 1
+
+    def test_false_scalar(self):
+        mask = EntryMask(pd.RangeIndex(3))
+        mask.append(False)
+
+        assert mask.series().tolist() == [False, False, False]
+
+
+class TestCompileEntrySource:
+    def test_same_signals(self):
+        scope = {}
+        exec(ENTRY_SOURCE, {"reduce": reduce}, scope)
+        original = scope["populate_entry_trend"]
+        function, clauses = compiled()
+        df = frame()
+        df["missing_column"] = 1.0
+
+        expected = original(None, df.copy(), {})
+        result = function(None, df.copy(), {})
+
+        assert clauses == 8
+        assert expected["enter_long"].any()
+        pd.testing.assert_series_equal(result["enter_long"], expected["enter_long"])
+        pd.testing.assert_series_equal(result["enter_tag"], expected["enter_tag"])
+
+    def test_skipped_clauses(self):
+        function, _ = compiled()
+
+        # The clauses following an empty mask are not evaluated
+        df = function(None, frame(), {})
+
+        assert "2" not in "".join(df["enter_tag"])
+
+    def test_traceback_lines(self):
+        # Source compiled as if it started on the line 101 of a file
+        function, _ = compile_entry_source(
+            ENTRY_SOURCE, "<entry>", 101, {"reduce": reduce}
+        )
+        line = ENTRY_SOURCE.splitlines().index(
+            '        long_entry_logic.append(df["volume"] > 0)'
+        )
+
+        with pytest.raises(KeyError) as error:
+            function(None, frame().drop(columns=["volume"]), {})
+
+        lines = [entry.lineno for entry in traceback.extract_tb(error.tb)]
+        assert 101 + line in lines
+
+
+class TestTailEvaluation:
+    def test_same_tail_signals(self):
+        function, _ = compiled()
+        shifts = set()
+        tail_function, _ = compile_entry_source(
+            ENTRY_SOURCE, "<entry>", 1, {"reduce": reduce}, shifts
+        )
+        df = frame()
+
+        expected = function(None, df.copy(), {})
+        tail = tail_function(None, entry_tail_frame(df, 100, shifts), {})
+        result = merge_tail_signals(df, tail)
+
+        assert shifts == {("RSI_3", 3)}
+        assert expected["enter_long"].iloc[-100:].any()
+        for column in ("enter_long", "enter_tag"):
+            assert (
+                result[column].iloc[-100:].tolist()
+                == expected[column].iloc[-100:].tolist()
+            )
+        assert not result["enter_long"].iloc[:-100].any()
+        assert (result["enter_tag"].iloc[:-100] == "").all()
+
+    def test_shorter_frame(self):
+        shifts = set()
+        tail_function, _ = compile_entry_source(
+            ENTRY_SOURCE, "<entry>", 1, {"reduce": reduce}, shifts
+        )
+        df = frame().iloc[:2]
+
+        df = merge_tail_signals(
+            df, tail_function(None, entry_tail_frame(df, 5, shifts), {})
+        )
+
+        assert len(df) == 2
+        assert not df["enter_long"].any()
+
+    def test_rolling_not_evaluable(self):
+        source = ENTRY_SOURCE.replace(".shift(3)", ".rolling(3).min()")
+
+        with pytest.raises(ValueError, match="tail rows"):
+            compile_entry_source(source, "<entry>", 1, {"reduce": reduce}, set())
+
+
+def test_strategy_entry_conditions():
+    pytest.importorskip("freqtrade")
+    pytest.importorskip("pandas_ta")
+    from NostalgiaForInfinityX5 import NostalgiaForInfinityX5
+
+    function, clauses = compile_entry_function(
+        NostalgiaForInfinityX5.populate_entry_conditions
+    )
+
+    assert clauses > 1000
+    assert inspect.signature(function) == inspect.signature(
+        NostalgiaForInfinityX5.populate_entry_conditions
+    )
+
+
+def test_strategy_tail_signals(tmp_path):
+    # The tail evaluation of the strategy entry conditions, on the bundled data
+    pytest.importorskip("freqtrade")
+    pytest.importorskip("pandas_ta")
+    pytest.importorskip("pyarrow")
+    from freqtrade.enums import CandleType, RunMode
+    from freqtrade.exchange import timeframe_to_minutes
+    from NostalgiaForInfinityX5 import NostalgiaForInfinityX5
+
+    candles = pd.read_feather(DATA_FILE)
+
+    class DataProvider:
+        runmode = RunMode.BACKTEST
+
+        def get_pair_dataframe(self, pair, timeframe):
+            return (
+                candles.set_index("date")
+                .resample(
+                    f"{timeframe_to_minutes(timeframe)}min", label="left", closed="left"
+                )
+                .agg(
+                    {
+                        "open": "first",
+                        "high": "max",
+                        "low": "min",
+                        "close": "last",
+                        "volume": "sum",
+                    }
+                )
+                .dropna()
+                .reset_index()
+            )
+
+    strategy = NostalgiaForInfinityX5(
+        {
+            "exchange": {"name": "binance"},
+            "stake_currency": "USDT",
+            "max_open_trades": 6,
+            "runmode": RunMode.BACKTEST,
+            "candle_type_def": CandleType.SPOT,
+            "user_data_dir": tmp_path,
+        }
+    )
+    strategy.dp = DataProvider()
+    metadata = {"pair": "BTC/USDT"}
+    df = strategy.populate_indicators(candles.copy(), metadata)
+    shifts = set()
+    tail_function, _ = compile_entry_function(
+        NostalgiaForInfinityX5.populate_entry_conditions, shifts
+    )
+
+    expected = strategy.populate_entry_conditions(df.copy(), metadata)
+    tail = tail_function(strategy, entry_tail_frame(df, len(df), shifts), metadata)
+    result = merge_tail_signals(df.copy(), tail)
+
+    assert set(tail.signals) == {"enter_tag", "enter_long", "enter_short"}
+    for column in ("enter_long", "enter_short", "enter_tag"):
+        assert result[column].tolist() == expected[column].tolist()
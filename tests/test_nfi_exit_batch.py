@@ -0,0 +1,157 @@
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from nfi_lib import ExitBatch  # noqa: E402
+
+
+class FakeTrade(SimpleNamespace):
+    entry_side = "buy"
+    exit_side = "sell"
+
+    def select_filled_orders(self, side):
+        return [order for order in self.orders if order.side == side and order.filled]
+
+
+def order(side, filled, price, status_filled=True):
+    return SimpleNamespace(
+        side=side,
+        filled=status_filled,
+        safe_filled=filled,
+        safe_price=price,
+        average=price,
+        cost=filled * price,
+    )
+
+
+def trades():
+    rng = np.random.default_rng(3)
+    result = []
+    for trade_id in range(1, 21):
+        orders = [
+            order("buy", rng.uniform(0.1, 5.0), rng.uniform(90.0, 110.0))
+            for _ in range(rng.integers(1, 8))
+        ]
+        orders += [
+            order("sell", rng.uniform(0.01, 0.1), rng.uniform(90.0, 110.0))
+            for _ in range(rng.integers(0, 4))
+        ]
+        # An open order, not counted
+        orders.append(order("buy", 1.0, 100.0, status_filled=False))
+        result.append(
+            FakeTrade(
+                id=trade_id,
+                is_short=bool(trade_id % 3 == 0),
+                orders=orders,
+                amount=1.0,
+                open_rate=orders[0].safe_price,
+                max_rate=120.0,
+                min_rate=80.0,
+                fee_open=0.001,
+                fee_close=0.002,
+            )
+        )
+    return result
+
+
+def calc_total_profit(trade, exit_rate, fee_open_rate=None, fee_close_rate=None):
+    # Same as NostalgiaForInfinityX5.calc_total_profit() in spot
+    fee_open_rate = trade.fee_open if fee_open_rate is None else fee_open_rate
+    fee_close_rate = trade.fee_close if fee_close_rate is None else fee_close_rate
+    filled_entries = trade.select_filled_orders(trade.entry_side)
+    filled_exits = trade.select_filled_orders(trade.exit_side)
+    total_amount = 0.0
+    total_stake = 0.0
+    total_profit = 0.0
+    for entry_order in filled_entries:
+        if trade.is_short:
+            entry_stake = (
+                entry_order.safe_filled * entry_order.safe_price * (1 - fee_open_rate)
+            )
+            total_amount += entry_order.safe_filled
+            total_stake += entry_stake
+            total_profit += entry_stake
+        else:
+            entry_stake = (
+                entry_order.safe_filled * entry_order.safe_price * (1 + fee_open_rate)
+            )
+            total_amount += entry_order.safe_filled
+            total_stake += entry_stake
+            total_profit -= entry_stake
+    for exit_order in filled_exits:
+        if trade.is_short:
+            exit_stake = (
+                exit_order.safe_filled * exit_order.safe_price * (1 + fee_close_rate)
+            )
+            total_amount -= exit_order.safe_filled
+            total_profit -= exit_stake
+        else:
+            exit_stake = (
+                exit_order.safe_filled * exit_order.safe_price * (1 - fee_close_rate)
+            )
+            total_amount -= exit_order.safe_filled
+            total_profit += exit_stake
+    if trade.is_short:
+        current_stake = total_amount * exit_rate * (1 + fee_close_rate)
+        total_profit -= current_stake
+    else:
+        current_stake = total_amount * exit_rate * (1 - fee_close_rate)
+        total_profit += current_stake
+    return (
+        total_profit,
+        total_profit / total_stake,
+        total_profit / current_stake,
+        total_profit / filled_entries[0].cost,
+    )
+
+
+class TestExitBatch:
+    @pytest.mark.parametrize("fees", [(None, None), (0.0005, 0.0005)])
+    def test_same_profits(self, fees):
+        open_trades = trades()
+        batch = ExitBatch(open_trades, *fees)
+
+        for trade in open_trades:
+            inputs = batch.get(trade)
+            for exit_rate in (85.0, 100.0, 101.37, 130.0):
+                # Exactly the same floats
+                assert inputs.total_profit(exit_rate) == calc_total_profit(
+                    trade, exit_rate, *fees
+                )
+
+    def test_max_profit_loss(self):
+        trade = trades()[0]
+        trade.orders = [order("buy", 1.0, 100.0), order("buy", 1.0, 90.0)]
+        trade.open_rate = 95.0
+
+        inputs = ExitBatch([trade]).get(trade)
+
+        # Based on the first entry when there are several
+        assert inputs.max_profit == (120.0 - 100.0) / 100.0
+        assert inputs.max_loss == (100.0 - 80.0) / 80.0
+
+    def test_funding_fees(self):
+        trade = trades()[0]
+        inputs = ExitBatch([trade]).get(trade)
+
+        spot = inputs.total_profit(100.0)
+        futures = inputs.total_profit(100.0, 1.5)
+
+        assert futures[0] == spot[0] + 1.5
+
+    def test_outdated(self):
+        trade = trades()[0]
+        batch = ExitBatch([trade])
+
+        trade.max_rate = 125.0
+
+        assert batch.get(trade) is None
+        assert batch.get(SimpleNamespace(id=99)) is None
+
+    def test_no_filled_entry(self):
+        trade = trades()[0]
+        trade.orders = [order("buy", 1.0, 100.0, status_filled=False)]
+
+        assert ExitBatch([trade]).get(trade) is None
@@ -0,0 +1,206 @@
+import ast
+import inspect
+import textwrap
+from types import MethodType, SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from nfi_lib import CandleFrame, ExitColumns, compile_exit_function  # noqa: E402
+from nfi_lib.exit_columns import shifted_array  # noqa: E402
+
+EXIT_FUNCTIONS = [
+    "long_exit_signals",
+    "long_exit_main",
+    "long_exit_williams_r",
+    "long_exit_dec",
+    "short_exit_signals",
+    "short_exit_main",
+    "short_exit_williams_r",
+    "short_exit_dec",
+]
+
+PROFITS = [-0.05, 0.0, 0.005, 0.01, 0.015, 0.02, 0.05, 0.1, 0.2]
+
+
+def exit_signal(
+    mode_name,
+    current_profit,
+    max_profit,
+    max_loss,
+    last_candle,
+    previous_candle_1,
+    previous_candle_2,
+    previous_candle_3,
+    previous_candle_4,
+    previous_candle_5,
+    trade,
+    current_time,
+    buy_tag,
+):
+    if last_candle["close"] > last_candle["EMA_200"]:
+        if 0.02 > current_profit >= 0.01:
+            if (last_candle["RSI_14"] < 28.0) and (previous_candle_1["RSI_14"] < 30.0):
+                return True, f"exit_{mode_name}_o_1"
+        elif (current_profit > 0.02) and not (80.0 > last_candle["RSI_14"] > 20.0):
+            return True, f"exit_{mode_name}_o_2"
+    elif (
+        (last_candle["close"] < last_candle["EMA_200"])
+        and (
+            isinstance(last_candle["ROC_9_1d"], np.float64)
+            and (last_candle["ROC_9_1d"] > 50.0)
+        )
+        and (current_profit > 0.01)
+    ):
+        return True, f"exit_{mode_name}_u_1"
+    elif last_candle["close"] > last_candle["BBU_20_2.0_1h"] * 1.14:
+        if current_profit > 0.01:
+            return True, f"exit_{mode_name}_u_2"
+    return False, None
+
+
+def exit_with_candle_value(
+    mode_name,
+    current_profit,
+    max_profit,
+    max_loss,
+    last_candle,
+    previous_candle_1,
+    previous_candle_2,
+    previous_candle_3,
+    previous_candle_4,
+    previous_candle_5,
+    trade,
+    current_time,
+    buy_tag,
+):
+    if current_profit > last_candle["RSI_14"] / 1000.0:
+        return True, f"exit_{mode_name}_1"
+    return False, None
+
+
+def frame(rows=200, seed=0, columns=("close", "EMA_200", "RSI_14", "BBU_20_2.0_1h")):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({column: rng.uniform(0.0, 100.0, rows) for column in columns})
+    df.loc[rng.random(rows) < 0.05, "RSI_14"] = np.nan
+    df["ROC_9_1d"] = pd.Series(
+        [None if value < 10.0 else value for value in rng.uniform(0.0, 100.0, rows)],
+        dtype=object,
+    )
+    return df
+
+
+def candle_rows(df, position):
+    candles = CandleFrame(df)
+    return tuple(candles.row(position - periods) for periods in range(6))
+
+
+class TestCompile:
+    def test_conditions(self):
+        conditions = compile_exit_function(exit_signal)
+
+        # A test reading only the candles is one bit, the same test too
+        assert len(conditions.conditions) == 6
+        assert conditions.columns == ["exit_bits_exit_signal_0"]
+
+    def test_candle_value_not_compiled(self):
+        assert compile_exit_function(exit_with_candle_value) is None
+
+    def test_method_reading_self_not_compiled(self):
+        class Strategy:
+            def exit_signal(
+                self,
+                mode_name,
+                current_profit,
+                max_profit,
+                max_loss,
+                last_candle,
+                previous_candle_1,
+                previous_candle_2,
+                previous_candle_3,
+                previous_candle_4,
+                previous_candle_5,
+                trade,
+                current_time,
+                buy_tag,
+            ):
+                if last_candle["RSI_14"] > self.threshold:
+                    return True, "exit"
+                return False, None
+
+        assert compile_exit_function(Strategy().exit_signal) is None
+
+
+class TestExitColumns:
+    def test_same_as_function(self):
+        exit_columns = ExitColumns()
+        precomputed = exit_columns.precomputed(exit_signal)
+        df = exit_columns.populate(frame())
+
+        assert precomputed is not exit_signal
+        for position in range(5, len(df)):
+            rows = candle_rows(df, position)
+            for profit in PROFITS:
+                assert precomputed(
+                    "normal", profit, profit, 0.0, *rows, None, None, ""
+                ) == exit_signal("normal", profit, profit, 0.0, *rows, None, None, "")
+
+    def test_without_columns(self):
+        precomputed = ExitColumns().precomputed(exit_signal)
+        rows = candle_rows(frame(), -1)
+
+        assert precomputed("normal", 0.05, 0.05, 0.0, *rows, None, None, "") == (
+            exit_signal("normal", 0.05, 0.05, 0.0, *rows, None, None, "")
+        )
+
+    def test_not_compiled(self):
+        exit_columns = ExitColumns()
+
+        assert (
+            exit_columns.precomputed(exit_with_candle_value) is exit_with_candle_value
+        )
+        assert exit_columns.columns == []
+
+    def test_populate_again(self):
+        exit_columns = ExitColumns()
+        exit_columns.register(exit_signal)
+        df = exit_columns.populate(frame())
+
+        assert list(exit_columns.populate(df).columns) == list(df.columns)
+
+
+def test_shifted_array():
+    shifted = shifted_array(np.array([1.0, 2.0, 3.0, 4.0]), 2)
+
+    assert shifted.tolist() == [1.0, 1.0, 1.0, 2.0]
+
+
+def test_strategy_exit_columns():
+    pytest.importorskip("freqtrade")
+    pytest.importorskip("pandas_ta")
+    from NostalgiaForInfinityX5 import NostalgiaForInfinityX5
+
+    NostalgiaForInfinityX5.load_short_mode()
+    for seed, name in enumerate(EXIT_FUNCTIONS):
+        func = MethodType(getattr(NostalgiaForInfinityX5, name), SimpleNamespace())
+        tree = ast.parse(textwrap.dedent(inspect.getsource(func)))
+        columns = {
+            node.slice.value
+            for node in ast.walk(tree)
+            if isinstance(node, ast.Subscript)
+            and isinstance(node.slice, ast.Constant)
+            and isinstance(node.slice.value, str)
+        }
+        exit_columns = ExitColumns()
+        precomputed = exit_columns.precomputed(func)
+        df = exit_columns.populate(frame(100, seed, columns - {"ROC_9_1d"}))
+
+        assert precomputed is not func
+        for position in range(5, len(df)):
+            rows = candle_rows(df, position)
+            for profit in PROFITS:
+                assert precomputed(
+                    "normal", profit, profit + 0.01, 0.02, *rows, None, None, ""
+                ) == func("normal", profit, profit + 0.01, 0.02, *rows, None, None, "")
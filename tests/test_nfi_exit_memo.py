@@ -0,0 +1,143 @@
+from types import SimpleNamespace
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from nfi_lib import ExitMemo, profit_thresholds  # noqa: E402
+
+
+def exit_signal(
+    mode_name,
+    current_profit,
+    max_profit,
+    max_loss,
+    last_candle,
+    previous_candle_1,
+    previous_candle_2,
+    previous_candle_3,
+    previous_candle_4,
+    previous_candle_5,
+    trade,
+    current_time,
+    buy_tag,
+):
+    if 0.02 > current_profit >= 0.01:
+        if last_candle["RSI_14"] < 28.0:
+            return True, f"exit_{mode_name}_1"
+    elif current_profit > 0.02 and max_loss < -0.05:
+        if previous_candle_1["RSI_14"] > 80.0:
+            return True, f"exit_{mode_name}_2"
+    return False, None
+
+
+def exit_with_trade(
+    mode_name,
+    current_profit,
+    max_profit,
+    max_loss,
+    last_candle,
+    previous_candle_1,
+    previous_candle_2,
+    previous_candle_3,
+    previous_candle_4,
+    previous_candle_5,
+    trade,
+    current_time,
+    buy_tag,
+):
+    if current_profit > 0.01 and trade.open_rate > last_candle["close"]:
+        return True, f"exit_{mode_name}_1"
+    return False, None
+
+
+def exit_with_arithmetic(
+    mode_name,
+    current_profit,
+    max_profit,
+    max_loss,
+    last_candle,
+    previous_candle_1,
+    previous_candle_2,
+    previous_candle_3,
+    previous_candle_4,
+    previous_candle_5,
+    trade,
+    current_time,
+    buy_tag,
+):
+    if current_profit * 100.0 > last_candle["RSI_14"]:
+        return True, f"exit_{mode_name}_1"
+    return False, None
+
+
+def candles(date, rsi):
+    return [
+        pd.Series({"date": pd.Timestamp(date, tz="UTC"), "RSI_14": rsi})
+        for _ in range(6)
+    ]
+
+
+def call(func, profit, rows, trade, max_loss=-0.01):
+    return func("normal", profit, profit, max_loss, *rows, trade, None, ["1"])
+
+
+class TestProfitThresholds:
+    def test_thresholds(self):
+        assert profit_thresholds(exit_signal) == ((0.01, 0.02), (), (-0.05,))
+
+    def test_not_memoizable(self):
+        assert profit_thresholds(exit_with_trade) is None
+        assert profit_thresholds(exit_with_arithmetic) is None
+        assert ExitMemo().memoized(exit_with_trade) is exit_with_trade
+
+
+class TestExitMemo:
+    def test_same_band(self):
+        memo = ExitMemo()
+        memoized = memo.memoized(exit_signal)
+        trade = SimpleNamespace(id=1, orders=[1])
+        rows = candles("2024-01-01 00:00", 20.0)
+
+        assert call(memoized, 0.011, rows, trade) == (True, "exit_normal_1")
+        assert call(memoized, 0.015, rows, trade) == (True, "exit_normal_1")
+        # Equal to a threshold, and above
+        assert call(memoized, 0.02, rows, trade) == (False, None)
+        assert call(memoized, 0.03, rows, trade) == (False, None)
+        assert (memo.hits, memo.misses) == (1, 3)
+
+    def test_new_candle(self):
+        memo = ExitMemo()
+        memoized = memo.memoized(exit_signal)
+        trade = SimpleNamespace(id=1, orders=[1])
+
+        call(memoized, 0.015, candles("2024-01-01 00:00", 20.0), trade)
+        result = call(memoized, 0.015, candles("2024-01-01 00:05", 50.0), trade)
+
+        assert result == (False, None)
+        assert memo.misses == 2
+
+    def test_new_order(self):
+        memo = ExitMemo()
+        memoized = memo.memoized(exit_signal)
+        trade = SimpleNamespace(id=1, orders=[1])
+        rows = candles("2024-01-01 00:00", 20.0)
+
+        call(memoized, 0.015, rows, trade)
+        trade.orders.append(2)
+        call(memoized, 0.015, rows, trade)
+
+        assert memo.misses == 2
+
+    def test_same_results(self):
+        memo = ExitMemo()
+        memoized = memo.memoized(exit_signal)
+        trade = SimpleNamespace(id=1, orders=[1])
+        profits = [i / 1000 for i in range(-30, 60)] * 2
+        for date, rsi in (("2024-01-01 00:00", 20.0), ("2024-01-01 00:05", 90.0)):
+            rows = candles(date, rsi)
+            for profit in profits:
+                for max_loss in (-0.1, -0.05, 0.0):
+                    assert call(memoized, profit, rows, trade, max_loss) == call(
+                        exit_signal, profit, rows, trade, max_loss
+                    )
@@ -0,0 +1,168 @@
+import ast
+import inspect
+import textwrap
+from types import MethodType, SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from nfi_lib import ExitTable, ExitTables, profit_thresholds  # noqa: E402
+from nfi_lib.exit_tables import band_profits  # noqa: E402
+
+EXIT_FUNCTIONS = [
+    "long_exit_signals",
+    "long_exit_main",
+    "long_exit_williams_r",
+    "long_exit_dec",
+    "short_exit_signals",
+    "short_exit_main",
+    "short_exit_williams_r",
+    "short_exit_dec",
+]
+
+
+def exit_signal(
+    mode_name,
+    current_profit,
+    max_profit,
+    max_loss,
+    last_candle,
+    previous_candle_1,
+    previous_candle_2,
+    previous_candle_3,
+    previous_candle_4,
+    previous_candle_5,
+    trade,
+    current_time,
+    buy_tag,
+):
+    if 0.02 > current_profit >= 0.01:
+        if last_candle["RSI_14"] < 28.0:
+            return True, f"exit_{mode_name}_1"
+    elif current_profit > 0.02 and max_loss < -0.05:
+        if previous_candle_1["RSI_14"] > 80.0:
+            return True, f"exit_{mode_name}_2"
+    elif current_profit > 0.05 and max_profit >= 0.1:
+        return True, f"exit_{mode_name}_3"
+    return False, None
+
+
+def candles(rsi, date="2024-01-01 00:00"):
+    return tuple(
+        pd.Series({"date": pd.Timestamp(date, tz="UTC"), "RSI_14": rsi})
+        for _ in range(6)
+    )
+
+
+def profits():
+    return np.array(
+        [-0.1, 0.0, 0.005, 0.01, 0.015, 0.02, 0.03, 0.05, 0.06, 0.1, 0.2]
+        + list(np.random.default_rng(1).uniform(-0.1, 0.2, 50))
+    )
+
+
+class TestBands:
+    def test_band_profits(self):
+        assert band_profits(()) == [0.0]
+        assert band_profits((0.01, 0.02)) == [-0.99, 0.01, 0.015, 0.02, 1.02]
+
+
+class TestExitTable:
+    @pytest.mark.parametrize("rsi", [20.0, 50.0, 90.0])
+    def test_same_exits(self, rsi):
+        rows = candles(rsi)
+        table = ExitTable(exit_signal, profit_thresholds(exit_signal), "normal", rows)
+
+        for max_loss in (-0.1, -0.05, 0.0):
+            for max_profit in (0.05, 0.1, 0.2):
+                for profit in profits():
+                    expected = exit_signal(
+                        "normal", profit, max_profit, max_loss, *rows, None, None, ""
+                    )
+                    assert table.lookup(profit, max_profit, max_loss) == expected
+
+
+class TestExitTables:
+    def test_tabled(self):
+        tables = ExitTables()
+        tabled = tables.tabled(exit_signal)
+        trade = SimpleNamespace(pair="BTC/USDT")
+        rows = candles(20.0)
+
+        assert tabled("normal", 0.015, 0.0, 0.0, *rows, trade, None, "") == (
+            True,
+            "exit_normal_1",
+        )
+        assert tabled("normal", 0.019, 0.0, 0.0, *rows, trade, None, "") == (
+            True,
+            "exit_normal_1",
+        )
+        assert list(tables.tables) == [("BTC/USDT", "exit_signal", "normal")]
+
+    def test_new_candle(self):
+        tables = ExitTables()
+        tables.register(exit_signal)
+
+        table = tables.table("BTC/USDT", "exit_signal", "normal", candles(20.0))
+        same = tables.table("BTC/USDT", "exit_signal", "normal", candles(20.0))
+        new = tables.table(
+            "BTC/USDT", "exit_signal", "normal", candles(50.0, "2024-01-01 00:05")
+        )
+
+        assert same is table
+        assert new is not table
+        assert new.lookup(0.015, 0.0, 0.0) == (False, None)
+
+    def test_not_tabled(self):
+        def exit_with_time(
+            mode_name,
+            current_profit,
+            max_profit,
+            max_loss,
+            last_candle,
+            previous_candle_1,
+            previous_candle_2,
+            previous_candle_3,
+            previous_candle_4,
+            previous_candle_5,
+            trade,
+            current_time,
+            buy_tag,
+        ):
+            return current_time is not None and current_profit > 0.01, None
+
+        assert ExitTables().tabled(exit_with_time) is exit_with_time
+
+
+def test_strategy_exit_tables():
+    pytest.importorskip("freqtrade")
+    pytest.importorskip("pandas_ta")
+    from NostalgiaForInfinityX5 import NostalgiaForInfinityX5
+
+    NostalgiaForInfinityX5.load_short_mode()
+    rng = np.random.default_rng(0)
+    for name in EXIT_FUNCTIONS:
+        func = MethodType(getattr(NostalgiaForInfinityX5, name), SimpleNamespace())
+        tree = ast.parse(textwrap.dedent(inspect.getsource(func)))
+        columns = {
+            node.slice.value
+            for node in ast.walk(tree)
+            if isinstance(node, ast.Subscript)
+            and isinstance(node.slice, ast.Constant)
+            and isinstance(node.slice.value, str)
+        }
+        for _ in range(5):
+            rows = tuple(
+                pd.Series(
+                    {column: rng.uniform(0.0, 100.0) for column in columns}
+                    | {"date": pd.Timestamp("2024-01-01", tz="UTC")}
+                )
+                for _ in range(6)
+            )
+            table = ExitTable(func, profit_thresholds(func), "normal", rows)
+            for profit in profits():
+                assert table.lookup(profit, profit + 0.02, 0.05) == func(
+                    "normal", profit, profit + 0.02, 0.05, *rows, None, None, ""
+                )
@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from nfi_lib import FileWatcher  # noqa: E402
+
+BACKENDS = [
+    "poll",
+    pytest.param(
+        "inotify",
+        marks=pytest.mark.skipif(
+            not sys.platform.startswith("linux"), reason="inotify is Linux only"
+        ),
+    ),
+]
+
+
+def changed(watcher, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if watcher.consume():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture(params=BACKENDS)
+def watched(request, tmp_path):
+    path = tmp_path / "nfi-hold-trades.json"
+    watcher = FileWatcher(path, interval=0.02, backend=request.param)
+    # Unknown until the first consume()
+    assert watcher.consume()
+    yield path, watcher
+    watcher.close()
+
+
+class TestFileWatcher:
+    def test_created(self, watched):
+        path, watcher = watched
+
+        path.write_text("{}")
+
+        assert changed(watcher)
+        assert not watcher.consume()
+
+    def test_written(self, watched):
+        path, watcher = watched
+        path.write_text("{}")
+        assert changed(watcher)
+
+        with path.open("a") as wfh:
+            wfh.write("\n")
+
+        assert changed(watcher)
+
+    def test_replaced_and_deleted(self, watched):
+        path, watcher = watched
+        temp_path = path.with_name("holds.tmp")
+        temp_path.write_text("{}")
+
+        os.replace(temp_path, path)
+        assert changed(watcher)
+
+        path.unlink()
+        assert changed(watcher)
+
+    def test_other_file(self, watched):
+        path, watcher = watched
+
+        path.with_name("other.json").write_text("{}")
+        time.sleep(0.2)
+
+        assert not watcher.consume()
@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from nfi_lib import GrindLadder, GrindLadders, GrindRung  # noqa: E402
+
+
+def order(order_id, filled, price):
+    return SimpleNamespace(
+        id=order_id, order_id=f"o{order_id}", safe_filled=filled, safe_price=price
+    )
+
+
+def trade(trade_id=1):
+    return SimpleNamespace(id=trade_id, pair="BTC/USDT", open_date=0)
+
+
+class TestGrindRung:
+    def test_sums(self):
+        rung = GrindRung()
+
+        # Walked backwards, from the last buy
+        rung.add(order(3, 2.0, 90.0))
+        rung.add(order(2, 1.0, 100.0))
+
+        assert rung.count == 2
+        assert rung.total_amount == pytest.approx(3.0)
+        assert rung.total_cost == pytest.approx(280.0)
+        assert rung.buy_orders == [3, 2]
+        assert rung.distance_ratio(99.0) == pytest.approx(0.1)
+
+    def test_no_buy(self):
+        assert GrindRung().distance_ratio(100.0) == 0.0
+
+
+class TestGrindLadders:
+    def build(self, partial_sell):
+        self.builds.append(partial_sell)
+        return GrindLadder(("grind_1",))
+
+    def test_built_once_per_fill(self):
+        self.builds = []
+        ladders = GrindLadders()
+        orders = [order(1, 1.0, 100.0)]
+
+        first = ladders.ladder(trade(), "long_grind", orders, False, self.build)
+        again = ladders.ladder(trade(), "long_grind", orders, False, self.build)
+        partial = ladders.ladder(trade(), "long_grind", orders, True, self.build)
+        orders.append(order(2, 1.0, 95.0))
+        filled = ladders.ladder(trade(), "long_grind", orders, False, self.build)
+
+        assert again is first
+        assert partial is not first
+        assert filled is not first
+        assert self.builds == [False, True, False]
+        assert (ladders.hits, ladders.misses) == (1, 3)
+
+    def test_cleared_above_max_trades(self):
+        self.builds = []
+        ladders = GrindLadders(max_trades=2)
+        orders = [order(1, 1.0, 100.0)]
+
+        for trade_id in range(3):
+            ladders.ladder(trade(trade_id), "long_grind", orders, False, self.build)
+
+        assert len(ladders.ladders) == 1
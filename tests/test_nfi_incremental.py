@@ -0,0 +1,168 @@
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+talib = pytest.importorskip("talib")
+pytest.importorskip("pyarrow")
+
+from nfi_lib import BASE_TF_5M_COLUMNS, IncrementalIndicators  # noqa: E402
+from nfi_reference import full_indicators  # noqa: E402
+
+DATA_FILE = (
+    Path(__file__).resolve().parent.parent
+    / "user_data"
+    / "data"
+    / "binance"
+    / "BTC_USDT-5m.feather"
+)
+
+
+# Tolerance against the full path, the same as the seed verification of the engine. The
+# engine is not bit-exact: pandas_ta computes some columns (BBP) with other roundings,
+# about 2e-9 apart on the bundled candles.
+RTOL = 1e-6
+ATOL = 1e-6
+
+# Candles of the live frames (startup_candle_count), and rows of the full path warmup
+# (WILLR_480) on a frame
+FRAME = 800
+WARMUP = 480
+
+
+def assert_columns_close(columns, expected, rows=0, skip=()):
+    for column in BASE_TF_5M_COLUMNS:
+        if column in skip:
+            continue
+        np.testing.assert_allclose(
+            np.asarray(columns[column], dtype=np.float64)[-rows:],
+            expected[column].to_numpy(dtype=np.float64)[-rows:],
+            rtol=RTOL,
+            atol=ATOL,
+            equal_nan=True,
+            err_msg=column,
+        )
+
+
+@pytest.fixture(scope="module")
+def candles():
+    return pd.read_feather(DATA_FILE)
+
+
+# The full path of the strategy: base_tf_5m_indicators(), with the pandas_ta calls
+@pytest.fixture(scope="module")
+def strategy_indicators(tmp_path_factory):
+    pytest.importorskip("freqtrade")
+    pytest.importorskip("pandas_ta")
+    from freqtrade.enums import CandleType, RunMode
+    from NostalgiaForInfinityX5 import NostalgiaForInfinityX5
+
+    strategy = NostalgiaForInfinityX5(
+        {
+            "exchange": {"name": "binance"},
+            "stake_currency": "USDT",
+            "max_open_trades": 6,
+            "runmode": RunMode.BACKTEST,
+            "candle_type_def": CandleType.SPOT,
+            "user_data_dir": tmp_path_factory.mktemp("user_data"),
+        }
+    )
+    assert not strategy.incremental_indicators_enable
+    assert not strategy.indicator_kernel_enable
+
+    def indicators(df):
+        return strategy.base_tf_5m_indicators({"pair": "BTC/USDT"}, df.copy())
+
+    return indicators
+
+
+class TestIncrementalIndicators:
+    def test_seed_verifies_against_full_path(self, candles):
+        engine = IncrementalIndicators()
+
+        assert engine.seed(full_indicators(candles.iloc[:1000]))
+        assert engine.mismatched_columns == []
+
+    def test_seed_rejects_mismatch(self, candles):
+        df = full_indicators(candles.iloc[:1000])
+        df["RSI_14"] += 1.0
+        engine = IncrementalIndicators()
+
+        assert not engine.seed(df)
+        assert "RSI_14" in engine.mismatched_columns
+        assert engine.update(candles.iloc[:1001].reset_index(drop=True)) is None
+
+    def test_appended_candles_match_full_path(self, candles):
+        engine = IncrementalIndicators()
+        engine.seed(full_indicators(candles.iloc[:1000]))
+
+        for end in (1001, 1002, 1005):
+            df = candles.iloc[:end].reset_index(drop=True)
+            columns = engine.update(df)
+            assert_columns_close(columns, full_indicators(df))
+
+    def test_sliding_frame_matches_full_path(self, candles):
+        engine = IncrementalIndicators()
+        engine.seed(full_indicators(candles.iloc[:FRAME]))
+
+        # Up to the resync, the full path starts over from the first candle of each frame
+        for start in range(1, engine.resync_candles + 1):
+            df = candles.iloc[start : start + FRAME].reset_index(drop=True)
+            columns = engine.update(df)
+            assert_columns_close(columns, full_indicators(df), rows=FRAME - WARMUP)
+
+    def test_not_appended_frame_needs_full_path(self, candles):
+        engine = IncrementalIndicators()
+        engine.seed(full_indicators(candles.iloc[:1000]))
+
+        # Gap in the candles
+        assert engine.update(candles.iloc[1001:2000].reset_index(drop=True)) is None
+        # Frame going back in time
+        assert engine.update(candles.iloc[:900]) is None
+
+    def test_resync(self, candles):
+        engine = IncrementalIndicators(resync_candles=2)
+        engine.seed(full_indicators(candles.iloc[:1000]))
+
+        assert engine.update(candles.iloc[:1002]) is not None
+        assert engine.update(candles.iloc[:1003]) is None
+
+
+class TestAgainstStrategy:
+    def test_reference_matches_strategy(self, candles, strategy_indicators):
+        df = candles.iloc[:2000].reset_index(drop=True)
+
+        assert_columns_close(
+            {column: full_indicators(df)[column] for column in BASE_TF_5M_COLUMNS},
+            strategy_indicators(df),
+        )
+
+    def test_seed_verifies_against_strategy(self, candles, strategy_indicators):
+        engine = IncrementalIndicators()
+
+        assert engine.seed(strategy_indicators(candles.iloc[:1000]))
+        assert engine.mismatched_columns == []
+
+    def test_appended_candles_match_strategy(self, candles, strategy_indicators):
+        engine = IncrementalIndicators()
+        engine.seed(strategy_indicators(candles.iloc[:1000]))
+
+        # One candle at a time, for 8 hours
+        for end in range(1001, 1097):
+            df = candles.iloc[:end].reset_index(drop=True)
+            columns = engine.update(df)
+            assert_columns_close(columns, strategy_indicators(df))
+
+    def test_sliding_frame_matches_strategy(self, candles, strategy_indicators):
+        engine = IncrementalIndicators()
+        engine.seed(strategy_indicators(candles.iloc[:FRAME]))
+
+        for start in range(1, engine.resync_candles + 1):
+            df = candles.iloc[start : start + FRAME].reset_index(drop=True)
+            columns = engine.update(df)
+            # Every 16 frames, see test_sliding_frame_matches_full_path()
+            if start % 16 == 0:
+                assert_columns_close(
+                    columns, strategy_indicators(df), rows=FRAME - WARMUP
+                )
@@ -0,0 +1,88 @@
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("freqtrade")
+pytest.importorskip("pandas_ta")
+
+import pandas as pd
+from NostalgiaForInfinityX5 import InformativeCache, NostalgiaForInfinityX5
+
+
+class TestInformativeCache:
+    def test_miss_then_hit(self):
+        cache = InformativeCache()
+        date = pd.Timestamp("2025-10-06 07:00:00", tz="UTC")
+        df = pd.DataFrame({"date": [date], "btc_close": [1.0]})
+
+        assert cache.get("BTC/USDT", "1h", date) is None
+        cache.set("BTC/USDT", "1h", date, df)
+
+        assert cache.get("BTC/USDT", "1h", date) is df
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_new_candle_invalidates(self):
+        cache = InformativeCache()
+        date = pd.Timestamp("2025-10-06 07:00:00", tz="UTC")
+        cache.set("BTC/USDT", "1h", date, pd.DataFrame())
+
+        assert cache.get("BTC/USDT", "1h", date + pd.Timedelta(hours=1)) is None
+        assert cache.get("BTC/USDT", "4h", date) is None
+        assert cache.misses == 2
+
+    def test_concurrent_access(self):
+        cache = InformativeCache()
+        date = pd.Timestamp("2025-10-06 07:00:00", tz="UTC")
+
+        def worker(timeframe):
+            for _ in range(1000):
+                if cache.get("BTC/USDT", timeframe, date) is None:
+                    cache.set("BTC/USDT", timeframe, date, pd.DataFrame())
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(worker, ["1d", "4h", "1h", "15m"]))
+
+        assert cache.hits + cache.misses == 4000
+        assert cache.misses == 4
+
+
+class TestInformativeIndicators:
+    def _strategy(self, executor):
+        calls = []
+
+        def btc_info_cached(pair, timeframe, metadata):
+            calls.append(timeframe)
+            return f"btc_{timeframe}"
+
+        def info_switcher(metadata, timeframe):
+            calls.append(timeframe)
+            return f"info_{timeframe}"
+
+        strategy = SimpleNamespace(
+            btc_info_timeframes=["5m", "15m", "1h", "4h", "1d"],
+            info_timeframes=["15m", "1h", "4h", "1d"],
+            btc_info_cached=btc_info_cached,
+            info_switcher=info_switcher,
+            indicators_executor=executor,
+        )
+        return strategy, calls
+
+    def test_sequential_and_parallel_order(self):
+        results = []
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for pool in (None, executor):
+                strategy, calls = self._strategy(pool)
+                results.append(
+                    NostalgiaForInfinityX5.informative_indicators(
+                        strategy, "BTC/USDT", {"pair": "ETH/USDT"}
+                    )
+                )
+                assert len(calls) == 9
+
+        assert results[0] == results[1]
+        assert results[0] == (
+            ["btc_5m", "btc_15m", "btc_1h", "btc_4h", "btc_1d"],
+            ["info_15m", "info_1h", "info_4h", "info_1d"],
+        )
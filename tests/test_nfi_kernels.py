@@ -0,0 +1,103 @@
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+talib = pytest.importorskip("talib")
+pytest.importorskip("pyarrow")
+
+import nfi_reference  # noqa: E402
+from nfi_lib import (  # noqa: E402
+    BASE_TF_5M_COLUMNS,
+    indicator_kernel,
+    indicator_kernel_columns,
+)
+
+DATA_FILE = (
+    Path(__file__).resolve().parent.parent
+    / "user_data"
+    / "data"
+    / "binance"
+    / "BTC_USDT-15m.feather"
+)
+
+BASE_TF_5M_SET = {
+    "rsi": (3, 4, 14, 20),
+    "ema": (3, 9, 12, 16, 20, 26, 50, 200),
+    "sma": (16, 30),
+    "bbands": ((20, 2.0),),
+    "mfi": (14,),
+    "cmf": (20,),
+    "willr": (14, 480),
+    "aroon": (14,),
+    "stochrsi": ((14, 14, 3, 3),),
+    "kst": ((10, 15, 20, 30, 10, 10, 10, 15, 9),),
+    "obv": True,
+    "roc": (2, 9),
+    "fillna": {"EMA_200": 0.0},
+}
+
+
+def assert_same(actual, expected, column):
+    np.testing.assert_array_equal(actual, np.asarray(expected), err_msg=column)
+
+
+@pytest.fixture(scope="module")
+def candles():
+    return pd.read_feather(DATA_FILE)
+
+
+class TestIndicatorKernel:
+    def test_matches_individual_indicators(self, candles):
+        columns = indicator_kernel_columns(candles, BASE_TF_5M_SET)
+        expected = nfi_reference.full_indicators(candles)
+
+        # The columns derived from the indicators are computed by the strategy
+        derived = {
+            "RSI_3_change_pct",
+            "RSI_14_change_pct",
+            "OBV_change_pct",
+            "change_pct",
+            "close_max_48",
+            "num_empty_288",
+        }
+        assert set(columns) == set(BASE_TF_5M_COLUMNS) - derived
+        for column, values in columns.items():
+            assert_same(values, expected[column], column)
+
+    def test_stoch_uo_cci(self, candles):
+        columns = indicator_kernel_columns(
+            candles,
+            {
+                "willr": (84,),
+                "stoch": ((14, 3, 3),),
+                "uo": ((7, 14, 28),),
+                "cci": (20,),
+            },
+        )
+        stoch_k, stoch_d = nfi_reference.stoch(candles)
+
+        assert_same(columns["STOCHk_14_3_3"], stoch_k, "STOCHk_14_3_3")
+        assert_same(columns["STOCHd_14_3_3"], stoch_d, "STOCHd_14_3_3")
+        assert_same(columns["UO_7_14_28"], nfi_reference.uo(candles), "UO_7_14_28")
+        assert_same(columns["CCI_20"], nfi_reference.cci(candles), "CCI_20")
+        assert_same(
+            columns["WILLR_84"],
+            talib.WILLR(candles["high"], candles["low"], candles["close"], 84),
+            "WILLR_84",
+        )
+
+    def test_short_frame(self, candles):
+        columns = indicator_kernel_columns(
+            candles.iloc[:10], {"stoch": ((14, 3, 3),), "ema": (200,)}
+        )
+
+        assert np.isnan(columns["STOCHk_14_3_3"]).all()
+        assert np.isnan(columns["EMA_200"]).all()
+
+    def test_adds_columns(self, candles):
+        df = indicator_kernel(candles, {"rsi": (14,), "obv": True})
+
+        assert list(df.columns) == list(candles.columns) + ["RSI_14", "OBV"]
+        assert df.index.equals(candles.index)
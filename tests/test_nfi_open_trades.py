@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from nfi_lib import OpenTrades  # noqa: E402
+
+
+def trade(direction, enter_tag):
+    return SimpleNamespace(trade_direction=direction, enter_tag=enter_tag)
+
+
+class TestOpenTrades:
+    def test_counts(self):
+        trades = [
+            trade("long", "120"),
+            trade("long", "120 61"),
+            trade("long", "61 62"),
+            trade("short", "620"),
+            trade("long", None),
+        ]
+
+        open_trades = OpenTrades(
+            trades, {"long_grind": ["120"], "long_rebuy": ["61", "62"]}
+        )
+
+        assert open_trades.count == 5
+        assert (open_trades.long_count, open_trades.short_count) == (4, 1)
+        # All the tags of a trade are tags of the mode
+        assert open_trades.mode_counts == {"long_grind": 1, "long_rebuy": 1}
+
+    def test_snapshot(self):
+        trades = [trade("long", "120")]
+        open_trades = OpenTrades(iter(trades))
+
+        trades.append(trade("long", "120"))
+
+        assert open_trades.count == 1
+        assert open_trades.mode_counts == {}
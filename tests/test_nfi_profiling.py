@@ -0,0 +1,117 @@
+import json
+import os
+import time
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from nfi_lib import StageProfiler  # noqa: E402
+
+
+class TestStageProfiler:
+    def test_summary(self):
+        profiler = StageProfiler(enabled=True)
+        for i in range(1, 101):
+            profiler.record("informative_indicators", "ETH/USDT", "1h", i / 1000)
+        profiler.record("informative_indicators", "BTC/USDT", "1h", 1.0)
+
+        summary = profiler.summary()["informative_indicators"]["1h"]
+
+        assert summary["pairs"]["ETH/USDT"]["count"] == 100
+        assert summary["pairs"]["ETH/USDT"]["p50"] == pytest.approx(0.0505)
+        assert summary["pairs"]["ETH/USDT"]["p99"] == pytest.approx(0.09901)
+        assert summary["all"]["count"] == 101
+        assert summary["all"]["max"] == 1.0
+
+    def test_rolling_window(self):
+        profiler = StageProfiler(enabled=True, window=10)
+        for i in range(100):
+            profiler.record("populate_indicators", "ETH/USDT", "5m", float(i))
+
+        summary = profiler.summary()["populate_indicators"]["5m"]["all"]
+
+        assert summary["count"] == 10
+        assert summary["p50"] == 94.5
+
+    def test_disabled(self):
+        profiler = StageProfiler()
+        profiler.record("populate_indicators", "ETH/USDT", "5m", 1.0)
+
+        assert profiler.summary() == {}
+        assert not profiler.dump_due(1000.0)
+
+    def test_dump_schedule(self, tmp_path):
+        profiler = StageProfiler(enabled=True, dump_interval=60)
+        profiler.record("populate_indicators", "ETH/USDT", "5m", 1.0)
+        path = tmp_path / "profiling.json"
+
+        assert not profiler.dump_due(1000.0)
+        assert not profiler.dump_due(1059.0)
+        assert profiler.dump_due(1060.0)
+        profiler.dump(path, 1060.0)
+
+        data = json.loads(path.read_text())
+        assert data["timestamp"] == 1060.0
+        assert data["stages"]["populate_indicators"]["5m"]["all"]["count"] == 1
+        assert os.listdir(tmp_path) == ["profiling.json"]
+        assert not profiler.dump_due(1100.0)
+
+    def test_control_file(self, tmp_path):
+        profiler = StageProfiler()
+        path = tmp_path / "nfi-profiling.json"
+
+        assert not profiler.load_control(path)
+        path.write_text(json.dumps({"enabled": True, "dump_interval": 30}))
+        assert profiler.load_control(path)
+        assert profiler.enabled
+        assert profiler.dump_interval == 30
+        # Unchanged file
+        assert not profiler.load_control(path)
+
+        path.write_text(json.dumps({"enabled": False}))
+        os.utime(path, (0, 0))
+        assert profiler.load_control(path)
+        assert not profiler.enabled
+
+
+def test_control_file_watched(tmp_path):
+    # profiling_update() runs every bot loop, the control file is only read after a change
+    pytest.importorskip("freqtrade")
+    pytest.importorskip("pandas_ta")
+    from freqtrade.enums import CandleType, RunMode
+    from NostalgiaForInfinityX5 import NostalgiaForInfinityX5
+
+    strategy = NostalgiaForInfinityX5(
+        {
+            "exchange": {"name": "binance"},
+            "stake_currency": "USDT",
+            "max_open_trades": 6,
+            "runmode": RunMode.DRY_RUN,
+            "candle_type_def": CandleType.SPOT,
+            "user_data_dir": tmp_path,
+        }
+    )
+    profiler = strategy.stage_profiler = StageProfiler()
+    loads = []
+
+    def load_control(path):
+        loads.append(path)
+        return StageProfiler.load_control(profiler, path)
+
+    profiler.load_control = load_control
+
+    strategy.profiling_update()
+    strategy.profiling_update()
+    assert len(loads) == 1
+
+    (tmp_path / "nfi-profiling.json").write_text(json.dumps({"enabled": True}))
+    deadline = time.monotonic() + 5.0
+    while not strategy.profiling_control_watcher.changed:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    strategy.profiling_update()
+
+    assert len(loads) == 2
+    assert profiler.enabled
+    strategy.profiling_control_watcher.close()
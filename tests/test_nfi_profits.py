@@ -0,0 +1,150 @@
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from nfi_lib import TradeProfits, order_sums  # noqa: E402
+
+
+def order(order_id, filled, price):
+    return SimpleNamespace(
+        order_id=str(order_id),
+        safe_filled=filled,
+        safe_price=price,
+        cost=filled * price,
+    )
+
+
+def filled_orders(seed, entries, exits):
+    rng = np.random.default_rng(seed)
+    filled_entries = [
+        order(f"e{position}", rng.uniform(0.1, 5.0), rng.uniform(90.0, 110.0))
+        for position in range(entries)
+    ]
+    filled_exits = [
+        order(f"x{position}", rng.uniform(0.01, 0.1), rng.uniform(90.0, 110.0))
+        for position in range(exits)
+    ]
+    return filled_entries, filled_exits
+
+
+def trade(trade_id=1, is_short=False):
+    return SimpleNamespace(
+        id=trade_id, pair="BTC/USDT", open_date="2024-01-01", is_short=is_short
+    )
+
+
+def calc_total_profit(is_short, filled_entries, filled_exits, exit_rate, fees):
+    # Same as NostalgiaForInfinityX5.calc_total_profit() in spot
+    fee_open_rate, fee_close_rate = fees
+    total_amount = 0.0
+    total_stake = 0.0
+    total_profit = 0.0
+    for entry_order in filled_entries:
+        if is_short:
+            entry_stake = (
+                entry_order.safe_filled * entry_order.safe_price * (1 - fee_open_rate)
+            )
+            total_amount += entry_order.safe_filled
+            total_stake += entry_stake
+            total_profit += entry_stake
+        else:
+            entry_stake = (
+                entry_order.safe_filled * entry_order.safe_price * (1 + fee_open_rate)
+            )
+            total_amount += entry_order.safe_filled
+            total_stake += entry_stake
+            total_profit -= entry_stake
+    for exit_order in filled_exits:
+        if is_short:
+            exit_stake = (
+                exit_order.safe_filled * exit_order.safe_price * (1 + fee_close_rate)
+            )
+            total_amount -= exit_order.safe_filled
+            total_profit -= exit_stake
+        else:
+            exit_stake = (
+                exit_order.safe_filled * exit_order.safe_price * (1 - fee_close_rate)
+            )
+            total_amount -= exit_order.safe_filled
+            total_profit += exit_stake
+    if is_short:
+        current_stake = total_amount * exit_rate * (1 + fee_close_rate)
+        total_profit -= current_stake
+    else:
+        current_stake = total_amount * exit_rate * (1 - fee_close_rate)
+        total_profit += current_stake
+    return (
+        total_profit,
+        total_profit / total_stake,
+        total_profit / current_stake,
+        total_profit / filled_entries[0].cost,
+    )
+
+
+class TestOrderSums:
+    @pytest.mark.parametrize("is_short", [False, True])
+    @pytest.mark.parametrize("counts", [(1, 0), (7, 3), (40, 25)])
+    def test_same_profits(self, is_short, counts):
+        fees = (0.001, 0.002)
+        filled_entries, filled_exits = filled_orders(5, *counts)
+
+        sums = order_sums(is_short, filled_entries, filled_exits, *fees)
+
+        for exit_rate in (85.0, 100.0, 101.37, 130.0):
+            # Exactly the same floats
+            assert sums.total_profit(exit_rate) == calc_total_profit(
+                is_short, filled_entries, filled_exits, exit_rate, fees
+            )
+
+    def test_funding_fees(self):
+        sums = order_sums(False, *filled_orders(5, 3, 1), 0.001, 0.001)
+
+        assert sums.total_profit(100.0, 1.5)[0] == sums.total_profit(100.0)[0] + 1.5
+
+
+class TestTradeProfits:
+    def test_summed_once_per_fill(self):
+        profits = TradeProfits()
+        filled_entries, filled_exits = filled_orders(7, 4, 1)
+
+        for _ in range(3):
+            profits.order_sums(trade(), filled_entries, filled_exits, 0.001, 0.001)
+
+        assert (profits.misses, profits.hits) == (1, 2)
+
+    def test_new_fill(self):
+        profits = TradeProfits()
+        filled_entries, filled_exits = filled_orders(7, 4, 1)
+        profits.order_sums(trade(), filled_entries, filled_exits, 0.001, 0.001)
+
+        filled_entries.append(order("e4", 2.0, 95.0))
+        sums = profits.order_sums(trade(), filled_entries, filled_exits, 0.001, 0.001)
+
+        assert profits.misses == 2
+        assert sums.total_profit(100.0) == calc_total_profit(
+            False, filled_entries, filled_exits, 100.0, (0.001, 0.001)
+        )
+
+    def test_other_trade_same_id(self):
+        # The trade ids restart with each backtest
+        profits = TradeProfits()
+        profits.order_sums(trade(), *filled_orders(7, 4, 1), 0.001, 0.001)
+
+        other = trade()
+        other.open_date = "2024-02-01"
+        filled_entries, filled_exits = filled_orders(8, 4, 1)
+        sums = profits.order_sums(other, filled_entries, filled_exits, 0.001, 0.001)
+
+        assert profits.misses == 2
+        assert sums.total_profit(100.0) == calc_total_profit(
+            False, filled_entries, filled_exits, 100.0, (0.001, 0.001)
+        )
+
+    def test_max_trades(self):
+        profits = TradeProfits(max_trades=2)
+        for trade_id in range(3):
+            profits.order_sums(trade(trade_id), *filled_orders(7, 2, 0), 0.001, 0.001)
+
+        assert list(profits.sums) == [2]
@@ -0,0 +1,143 @@
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("talib")
+pytest.importorskip("pyarrow")
+
+from nfi_lib import (  # noqa: E402
+    ColumnDependencies,
+    IndicatorPruner,
+    indicator_kernel_columns,
+    prune_indicator_set,
+)
+
+DATA_FILE = (
+    Path(__file__).resolve().parent.parent
+    / "user_data"
+    / "data"
+    / "binance"
+    / "BTC_USDT-15m.feather"
+)
+
+STRATEGY_SOURCE = """
+class Strategy:
+    def informative_1h_indicators(self, metadata, info_timeframe):
+        if self.indicator_kernel_enable:
+            informative_1h = self.indicator_kernel_calc(informative_1h, "1h")
+        else:
+            bbands = pta.bbands(informative_1h["close"])
+            informative_1h["BBL_20_2.0"] = bbands["BBL_20_2.0"]
+        informative_1h["RSI_3_change_pct"] = informative_1h["RSI_3"].pct_change()
+        return informative_1h
+
+    def populate_entry_trend(self, df, metadata):
+        for enabled_long_entry_signal in self.long_entry_signal_params:
+            long_entry_condition_index = int(enabled_long_entry_signal.split("_")[3])
+            if long_entry_condition_index == 1:
+                long_entry_logic.append(df["RSI_14_1h"] < 30.0)
+            if long_entry_condition_index == 2:
+                long_entry_logic.append(df["EMA_200"] < df["close"])
+        return df
+
+    def long_exit_main(self, last_candle, previous_candle_1):
+        return last_candle["CMF_20_1h"] < 0.0 and previous_candle_1["ROC_9"] > 1.0
+
+
+class Other:
+    def method(self, df):
+        return df["WILLR_14"]
+
+
+def helper(df):
+    return df[["open", "close"]]
+"""
+
+
+@pytest.fixture(scope="module")
+def candles():
+    return pd.read_feather(DATA_FILE)
+
+
+@pytest.fixture()
+def dependencies():
+    dependencies = ColumnDependencies()
+    dependencies.add_source(STRATEGY_SOURCE, ["Strategy"])
+    return dependencies
+
+
+class TestColumnDependencies:
+    def test_reads(self, dependencies):
+        # The informative reads are named like the merged columns, without the pandas_ta branch
+        assert dependencies.reads["informative_1h_indicators"] == {"RSI_3_1h"}
+        assert dependencies.reads["long_exit_main"] == {"CMF_20_1h", "ROC_9"}
+        assert dependencies.reads["helper"] == {"open", "close"}
+        assert "method" not in dependencies.reads
+        assert dependencies.entry_conditions == {
+            ("long", 1): {"RSI_14_1h"},
+            ("long", 2): {"EMA_200", "close"},
+        }
+
+    def test_required_columns_of_enabled_conditions(self, dependencies):
+        required = dependencies.required_columns(
+            {
+                "long_entry_condition_1_enable": True,
+                "long_entry_condition_2_enable": False,
+            },
+            {},
+        )
+
+        assert "RSI_14_1h" in required
+        assert "EMA_200" not in required
+        assert "CMF_20_1h" in required
+
+
+class TestIndicatorPruner:
+    INDICATORS = {
+        "rsi": (3, 14),
+        "ema": (12, 200),
+        "bbands": ((20, 2.0),),
+        "stochrsi": ((14, 14, 3, 3),),
+        "obv": True,
+        "fillna": {"EMA_200": 0.0},
+    }
+
+    def test_prune_indicator_set(self, candles):
+        instances = []
+        indicator_kernel_columns(candles, self.INDICATORS, instances)
+
+        pruned, skipped = prune_indicator_set(
+            self.INDICATORS,
+            instances,
+            {"RSI_3_1h", "EMA_200_1h", "BBP_20_2.0_1h", "STOCHRSId_14_14_3_3_1h"},
+            "_1h",
+        )
+
+        assert pruned == {
+            "rsi": (3,),
+            "ema": (200,),
+            "bbands": ((20, 2.0),),
+            "stochrsi": ((14, 14, 3, 3),),
+            "fillna": {"EMA_200": 0.0},
+        }
+        assert skipped == ["RSI_14", "EMA_12", "OBV"]
+
+    def test_pruned_columns_are_the_same(self, candles):
+        pruner = IndicatorPruner({"RSI_14", "STOCHRSIk_14_14_3_3"}, "5m")
+        expected = indicator_kernel_columns(candles, self.INDICATORS)
+
+        for _ in range(2):
+            df = pruner.indicator_kernel(candles, "5m", self.INDICATORS)
+            assert list(df.columns) == list(candles.columns) + [
+                "RSI_14",
+                "STOCHRSIk_14_14_3_3",
+                "STOCHRSId_14_14_3_3",
+            ]
+            for column in df.columns[len(candles.columns) :]:
+                np.testing.assert_array_equal(df[column], expected[column])
+
+        assert pruner.plans["5m"] == {"rsi": (14,), "stochrsi": ((14, 14, 3, 3),)}
+        assert "EMA_200" in pruner.reports["5m"]["skipped"]
+        assert pruner.report("5m").startswith("5m: skipped 9 indicator columns")
@@ -0,0 +1,132 @@
+import ast
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+STRATEGIES_DIR = Path(__file__).resolve().parent.parent / "user_data" / "strategies"
+
+
+def class_functions(path, name):
+    tree = ast.parse(path.read_text())
+    node = next(
+        node
+        for node in tree.body
+        if isinstance(node, ast.ClassDef) and node.name == name
+    )
+    return node, {
+        child.name for child in node.body if isinstance(child, ast.FunctionDef)
+    }
+
+
+class TestShortModeSplit:
+    def test_not_in_strategy(self):
+        _, functions = class_functions(
+            STRATEGIES_DIR / "NostalgiaForInfinityX5.py", "NostalgiaForInfinityX5"
+        )
+
+        assert [name for name in functions if name.startswith("short_")] == []
+
+    def test_called_functions_defined(self):
+        strategy, _ = class_functions(
+            STRATEGIES_DIR / "NostalgiaForInfinityX5.py", "NostalgiaForInfinityX5"
+        )
+        short_mode, functions = class_functions(
+            STRATEGIES_DIR / "nfi_lib" / "short_mode.py", "ShortMode"
+        )
+        attributes = {
+            target.id
+            for node in strategy.body
+            if isinstance(node, ast.Assign)
+            for target in node.targets
+            if isinstance(target, ast.Name)
+        }
+        called = {
+            node.func.attr
+            for tree in (strategy, short_mode)
+            for node in ast.walk(tree)
+            if isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and isinstance(node.func.value, ast.Name)
+            and node.func.value.id == "self"
+            and node.func.attr.startswith("short_")
+        }
+
+        assert called
+        assert called - attributes <= functions
+        assert all(name.startswith("short_") for name in functions)
+
+
+def test_loaded_on_first_use(tmp_path):
+    pytest.importorskip("freqtrade")
+    pytest.importorskip("pandas_ta")
+    code = f"""
+import sys
+from pathlib import Path
+
+from freqtrade.enums import CandleType, RunMode
+from NostalgiaForInfinityX5 import NostalgiaForInfinityX5
+
+
+class Strategy(NostalgiaForInfinityX5):
+    def short_exit_stoploss(self, *args):
+        return True, "overridden"
+
+
+strategy = Strategy(
+    {{
+        "exchange": {{"name": "binance"}},
+        "stake_currency": "USDT",
+        "max_open_trades": 6,
+        "runmode": RunMode.BACKTEST,
+        "candle_type_def": CandleType.SPOT,
+        "user_data_dir": Path({str(tmp_path)!r}),
+    }}
+)
+assert "nfi_lib.short_mode" not in sys.modules
+assert callable(strategy.short_exit_normal)
+assert "nfi_lib.short_mode" in sys.modules
+assert strategy.short_exit_stoploss() == (True, "overridden")
+assert not hasattr(strategy, "short_missing")
+"""
+    process = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=STRATEGIES_DIR,
+        capture_output=True,
+        text=True,
+    )
+
+    assert process.returncode == 0, process.stderr
+
+
+def test_short_side_columns(tmp_path):
+    # Columns only the short side functions read (or type check), see strategy_sources()
+    pytest.importorskip("freqtrade")
+    pytest.importorskip("pandas_ta")
+    from freqtrade.enums import CandleType, RunMode
+    from NostalgiaForInfinityX5 import NostalgiaForInfinityX5
+
+    strategy = NostalgiaForInfinityX5(
+        {
+            "exchange": {"name": "binance"},
+            "stake_currency": "USDT",
+            "max_open_trades": 6,
+            "trading_mode": "futures",
+            "margin_mode": "isolated",
+            "runmode": RunMode.BACKTEST,
+            "candle_type_def": CandleType.FUTURES,
+            "user_data_dir": tmp_path,
+            "compact_mode_enable": True,
+            "indicator_kernel_enable": True,
+            "indicator_pruning_enable": True,
+        }
+    )
+
+    assert strategy.can_short
+    assert "AROOND_14_1d" in strategy.compact_float64_columns
+    assert {
+        "BBL_20_2.0_1h",
+        "bot_wick_pct_1d",
+        "low_min_30_1d",
+    } <= strategy.indicator_pruner.required
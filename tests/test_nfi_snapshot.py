@@ -0,0 +1,82 @@
+import json
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+talib = pytest.importorskip("talib")
+pytest.importorskip("pyarrow")
+
+from nfi_lib import (  # noqa: E402
+    BASE_TF_5M_COLUMNS,
+    IncrementalIndicators,
+    IndicatorSnapshot,
+)
+from nfi_reference import full_indicators  # noqa: E402
+
+DATA_FILE = (
+    Path(__file__).resolve().parent.parent
+    / "user_data"
+    / "data"
+    / "binance"
+    / "BTC_USDT-5m.feather"
+)
+
+PAIR = "BTC/USDT:USDT"
+
+
+@pytest.fixture(scope="module")
+def candles():
+    return pd.read_feather(DATA_FILE)
+
+
+@pytest.fixture
+def saved(tmp_path, candles):
+    df = full_indicators(candles.iloc[:1000])
+    engine = IncrementalIndicators()
+    engine.seed(df)
+    # Updated once, the state is not the seed one
+    df = candles.iloc[1:1002].reset_index(drop=True)
+    df = pd.concat([df, pd.DataFrame(engine.update(df), index=df.index)], axis=1)
+    snapshot = IndicatorSnapshot(tmp_path, "5m")
+
+    assert snapshot.save({PAIR: engine}, {PAIR: df}) == 1
+    return snapshot, engine
+
+
+class TestIndicatorSnapshot:
+    def test_resume_same_as_running(self, saved, candles):
+        snapshot, engine = saved
+
+        restored = snapshot.load()[PAIR]
+
+        # Restarted later: more candles, and the first ones dropped
+        df = candles.iloc[5:1010].reset_index(drop=True)
+        columns = restored.update(df)
+        expected = engine.update(df)
+        for column in BASE_TF_5M_COLUMNS:
+            np.testing.assert_array_equal(columns[column], expected[column], column)
+        assert restored.candles is None
+
+    def test_other_candles(self, saved, candles):
+        snapshot, _ = saved
+        df = candles.iloc[5:1010].reset_index(drop=True)
+        df.loc[990, "close"] *= 1.01
+
+        assert snapshot.load()[PAIR].update(df) is None
+
+    def test_other_timeframe(self, saved, tmp_path):
+        assert IndicatorSnapshot(tmp_path, "1m").load() == {}
+
+    def test_unsaved_state(self, tmp_path, candles):
+        df = full_indicators(candles.iloc[:1000])
+        engine = IncrementalIndicators()
+        engine.seed(df)
+        df = df.iloc[:999]
+
+        assert IndicatorSnapshot(tmp_path, "5m").save({PAIR: engine}, {PAIR: df}) == 0
+        assert json.loads((tmp_path / "snapshot.json").read_text())["pairs"] == {}
+
+    def test_without_snapshot(self, tmp_path):
+        assert IndicatorSnapshot(tmp_path / "missing", "5m").load() == {}
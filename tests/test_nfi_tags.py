@@ -0,0 +1,52 @@
+import pickle
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from nfi_lib import EntryTags, TagModes  # noqa: E402
+
+REBUY = ["61", "62"]
+GRIND = ["120"]
+RAPID = ["101", "102"]
+
+
+@pytest.fixture
+def tag_modes():
+    return TagModes({"rebuy": REBUY, "grind": GRIND, "rapid": RAPID})
+
+
+class TestEntryTags:
+    @pytest.mark.parametrize(
+        "enter_tag", ["", "61", "61 62", "61 120", "120", "101 61 120", "61 7", "7"]
+    )
+    def test_same_as_scans(self, tag_modes, enter_tag):
+        enter_tags = enter_tag.split()
+
+        parsed = tag_modes.parse(enter_tag)
+
+        assert list(parsed) == enter_tags
+        assert parsed.any("rebuy") == any(c in REBUY for c in enter_tags)
+        assert parsed.all("rebuy") == all(c in REBUY for c in enter_tags)
+        assert parsed.all("rebuy", "grind") == all(
+            c in (REBUY + GRIND) for c in enter_tags
+        )
+        assert parsed.in_mode("rebuy", "grind") == (
+            all(c in REBUY for c in enter_tags)
+            or (
+                any(c in REBUY for c in enter_tags)
+                and all(c in (REBUY + GRIND) for c in enter_tags)
+            )
+        )
+
+    def test_parsed_once(self, tag_modes):
+        assert tag_modes.parse("61 120") is tag_modes.parse("61 120")
+
+    def test_pickle(self, tag_modes):
+        parsed = tag_modes.parse("61 120")
+
+        restored = pickle.loads(pickle.dumps(parsed))
+
+        assert isinstance(restored, EntryTags)
+        assert restored.in_mode("rebuy", "grind")
+        assert pickle.loads(pickle.dumps(tag_modes)).parsed == {}
@@ -0,0 +1,62 @@
+import pytest
+
+pytest.importorskip("freqtrade")
+pytest.importorskip("pandas_ta")
+
+import rapidjson  # noqa: E402
+from NostalgiaForInfinityX5 import Cache  # noqa: E402
+
+
+def read(path):
+    return rapidjson.loads(path.read_text())
+
+
+class TestCache:
+    def test_save_on_change(self, tmp_path):
+        path = tmp_path / "profit.json"
+        cache = Cache(path)
+
+        cache.set("BTC/USDT", {"profit": 0.01})
+        cache.save()
+
+        assert read(path) == {"BTC/USDT": {"profit": 0.01}}
+        assert not cache.dirty
+
+    def test_no_change(self, tmp_path):
+        path = tmp_path / "profit.json"
+        cache = Cache(path)
+        cache.set("BTC/USDT", {"profit": 0.01})
+        cache.save()
+        version = cache.version
+
+        cache.set("BTC/USDT", {"profit": 0.01})
+        cache.pop("ETH/USDT")
+
+        assert cache.version == version
+        assert not cache.dirty
+
+    def test_write_behind(self, tmp_path):
+        path = tmp_path / "profit.json"
+        cache = Cache(path, write_behind=True)
+
+        cache.set("BTC/USDT", {"profit": 0.01})
+        cache.save()
+        cache.set("ETH/USDT", {"profit": 0.02})
+        cache.pop("BTC/USDT")
+        cache.save()
+
+        assert not path.exists()
+
+        cache.flush()
+
+        assert read(path) == {"ETH/USDT": {"profit": 0.02}}
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_reload(self, tmp_path):
+        path = tmp_path / "profit.json"
+        cache = Cache(path)
+        cache.set("BTC/USDT", {"profit": 0.01})
+        cache.save()
+
+        assert Cache(path).data == {"BTC/USDT": {"profit": 0.01}}
+        assert not Cache(path).dirty
@@ -0,0 +1,100 @@
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("talib")
+pytest.importorskip("pyarrow")
+
+import nfi_reference  # noqa: E402
+from nfi_lib import (  # noqa: E402
+    heikin_ashi,
+    heikinashi,
+    pivot_points,
+    rolling_resistance,
+    rolling_support,
+)
+
+DATA_FILE = (
+    Path(__file__).resolve().parent.parent
+    / "user_data"
+    / "data"
+    / "binance"
+    / "BTC_USDT-5m.feather"
+)
+
+
+@pytest.fixture(scope="module")
+def candles():
+    return pd.read_feather(DATA_FILE).iloc[:3000].reset_index(drop=True)
+
+
+class TestRollingTurns:
+    @pytest.mark.parametrize("window", [2, 5, 6])
+    @pytest.mark.parametrize("center", [False, True])
+    def test_same_as_rolling_apply(self, candles, window, center):
+        low = candles["low"].copy()
+        low.iloc[[100, 101, 2000]] = np.nan
+
+        support = rolling_support(low, window, center)
+        resistance = rolling_resistance(candles["high"], window, center)
+
+        np.testing.assert_array_equal(
+            support,
+            low.rolling(window, center=center).apply(
+                nfi_reference.is_support, raw=True
+            ),
+        )
+        np.testing.assert_array_equal(
+            resistance,
+            candles["high"]
+            .rolling(window, center=center)
+            .apply(nfi_reference.is_resistance, raw=True),
+        )
+        assert np.nansum(support) > 0
+
+    def test_shorter_than_window(self, candles):
+        assert np.isnan(rolling_support(candles["low"].iloc[:3], 5)).all()
+
+    def test_window_too_short(self, candles):
+        with pytest.raises(ValueError):
+            rolling_resistance(candles["high"], 1)
+
+
+class TestHeikinAshi:
+    @pytest.mark.parametrize(
+        "smooth_inputs, smooth_outputs",
+        [(False, False), (True, False), (False, True), (True, True)],
+    )
+    def test_same_as_strategy(self, candles, smooth_inputs, smooth_outputs):
+        # The strategy EMAs are always on 30 candles
+        columns = heikin_ashi(candles, smooth_inputs, smooth_outputs, 30)
+        expected = nfi_reference.heikin_ashi(candles, smooth_inputs, smooth_outputs)
+
+        for values, expected_values in zip(columns, expected):
+            np.testing.assert_array_equal(values, expected_values)
+
+    def test_same_as_qtpylib(self, candles):
+        df = heikinashi(candles)
+        expected = nfi_reference.heikinashi(candles)
+
+        pd.testing.assert_frame_equal(df, expected, rtol=1e-12)
+
+    def test_empty(self, candles):
+        assert heikinashi(candles.iloc[:0]).empty
+
+
+class TestPivotPoints:
+    @pytest.mark.parametrize("mode", ["simple", "fibonacci", "DeMark"])
+    def test_same_as_strategy(self, candles, mode):
+        levels = pivot_points(candles, mode)
+        expected = nfi_reference.pivot_points(candles, mode)
+
+        assert len(levels) == len(expected)
+        for values, expected_values in zip(levels, expected):
+            np.testing.assert_array_equal(values, expected_values)
+
+    def test_unknown_mode(self, candles):
+        with pytest.raises(ValueError):
+            pivot_points(candles, "camarilla")
@@ -8,6 +8,7 @@ from pandas import DataFrame
 
 import talib.abstract as ta
 import freqtrade.vendor.qtpylib.indicators as qtpylib
+from nfi_lib import heikinashi as vectorized_heikinashi
 
 
 class Strategy001(IStrategy):
@@ -84,7 +85,8 @@ class Strategy001(IStrategy):
         dataframe['ema50'] = ta.EMA(dataframe, timeperiod=50)
         dataframe['ema100'] = ta.EMA(dataframe, timeperiod=100)
 
-        heikinashi = qtpylib.heikinashi(dataframe)
+        # Same as qtpylib.heikinashi(), without its Python loop over the candles
+        heikinashi = vectorized_heikinashi(dataframe)
         dataframe['ha_open'] = heikinashi['open']
         dataframe['ha_close'] = heikinashi['close']
 
@@ -0,0 +1,52 @@
+"""
+Helper library for NostalgiaForInfinityX5.
+
+Pure NumPy/pandas code, without any freqtrade dependency, so it can be unit tested on its own.
+Freqtrade adds the strategies directory to the import path while loading a strategy, which makes
+this package importable from the strategy files.
+
+Except nfi_lib.short_mode, the short side functions of the strategy, which is not imported here:
+the strategy loads it on first use.
+"""
+
+from nfi_lib.align import InformativeAligner, informative_index
+from nfi_lib.candles import CandleFrame, CandleRow
+from nfi_lib.compact import (
+  compact_frame,
+  exit_signal_differences,
+  float64_checked_columns,
+  signal_differences,
+)
+from nfi_lib.entry_masks import (
+  EntryMask,
+  compile_entry_function,
+  compile_entry_source,
+  entry_tail_frame,
+  merge_tail_signals,
+)
+from nfi_lib.exit_batch import ExitBatch, ExitInputs
+from nfi_lib.exit_columns import (
+  ExitColumns,
+  ExitConditions,
+  compile_exit_function,
+  compile_exit_source,
+)
+from nfi_lib.exit_memo import ExitMemo, profit_thresholds
+from nfi_lib.exit_tables import ExitTable, ExitTables
+from nfi_lib.file_watch import FileWatcher
+from nfi_lib.grind_ladder import GrindLadder, GrindLadders, GrindRung
+from nfi_lib.incremental import BASE_TF_5M_COLUMNS, IncrementalIndicators
+from nfi_lib.kernels import indicator_kernel, indicator_kernel_columns
+from nfi_lib.open_trades import OpenTrades
+from nfi_lib.profiling import StageProfiler
+from nfi_lib.profits import OrderSums, TradeProfits, order_sums
+from nfi_lib.pruning import ColumnDependencies, IndicatorPruner, prune_indicator_set
+from nfi_lib.snapshot import IndicatorSnapshot
+from nfi_lib.tags import EntryTags, TagModes
+from nfi_lib.windows import (
+  heikin_ashi,
+  heikinashi,
+  pivot_points,
+  rolling_resistance,
+  rolling_support,
+)
@@ -0,0 +1,113 @@
+"""
+Pre-aligned merge of the informative timeframes into the base timeframe frame.
+
+Same result as a chain of freqtrade merge_informative_pair() calls (with ffill) followed by the
+drop of the unused columns, without copying the base frame for each informative frame: the row
+mapping from the base candles to the informative candles is computed once per candle and timeframe,
+and only the kept columns are gathered and appended to the base frame with a single concat.
+"""
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+
+def informative_index(dates: np.ndarray, date_merge: np.ndarray) -> tuple:
+  """
+  Maps each base candle to the informative row merged into it (-1 when there is none).
+
+  Follows merge_informative_pair(): an informative row is merged into the base candle with the
+  exact same date, the following base candles keep it until the next match (ffill), and the
+  base candles before the first match take the informative row preceding the first match.
+
+  :param dates: Sorted dates of the base candles.
+  :param date_merge: Sorted merge dates of the informative candles (date + informative
+                     timeframe - base timeframe).
+  :return tuple: Informative row positions, one per base candle, and whether the first base
+                 candles were filled after the merge (which upcasts the bool/int columns).
+  """
+  if len(dates) == 0 or len(date_merge) == 0:
+    return np.full(len(dates), -1, dtype=np.int64), False
+  pos = np.searchsorted(date_merge, dates)
+  pos_clipped = np.minimum(pos, len(date_merge) - 1)
+  matched = date_merge[pos_clipped] == dates
+  index = np.where(matched, pos_clipped, -1)
+  # Matches are increasing, so the running maximum is the forward fill of the matches
+  index = np.maximum.accumulate(index)
+  filled = index[0] == -1
+  if len(dates) > 1 and filled and matched.any():
+    first_match = np.argmax(matched)
+    if first_match > 0 and index[first_match] > 0:
+      index[:first_match] = index[first_match] - 1
+  return index, filled
+
+
+def _take(values: np.ndarray, index: np.ndarray, filled: bool) -> np.ndarray:
+  result = pd.api.extensions.take(values, index, allow_fill=True)
+  if filled and result.dtype.kind in "biu":
+    # The merge had missing rows, pandas already upcasted the column before the fill
+    result = result.astype(object if result.dtype.kind == "b" else np.float64)
+  return result
+
+
+class InformativeAligner:
+  """
+  Merges informative frames into the base frame.
+
+  The row mappings are cached per timeframe, and reused as long as the base and informative
+  candles are the same, so all the pairs of a candle (and BTC) share them.
+  """
+
+  def __init__(self):
+    self.mappings = {}
+    self.hits = 0
+    self.misses = 0
+
+  @staticmethod
+  def _key(df: DataFrame) -> tuple:
+    if len(df) == 0:
+      return (0,)
+    return (len(df), df["date"].iat[0], df["date"].iat[-1])
+
+  def index(self, df: DataFrame, informative: DataFrame, timeframe_inf: str, offset) -> tuple:
+    """
+    Returns the informative row positions for the base candles (see informative_index()).
+
+    :param df: Base frame.
+    :param informative: Informative frame (with its unprefixed "date" column).
+    :param timeframe_inf: Informative timeframe, used as cache key.
+    :param offset: Informative timeframe minus base timeframe, as a Timedelta.
+    """
+    key = (self._key(df), self._key(informative), offset)
+    mapping = self.mappings.get(timeframe_inf)
+    if mapping is not None and mapping[0] == key:
+      self.hits += 1
+      return mapping[1]
+    self.misses += 1
+    date_merge = (informative["date"] + offset).to_numpy()
+    index = informative_index(df["date"].to_numpy(), date_merge)
+    self.mappings[timeframe_inf] = (key, index)
+    return index
+
+  def merge(self, df: DataFrame, informatives: list) -> DataFrame:
+    """
+    Appends the informative columns, suffixed with their timeframe, to the base frame.
+
+    :param df: Base frame.
+    :param informatives: List of (timeframe, informative frame, offset, merged column names to
+                         leave out), in merge order. The offset is the Timedelta between the
+                         informative and the base timeframes.
+    :return DataFrame: A new frame, the same as the chain of merge_informative_pair() and drop.
+    """
+    columns = {}
+    for timeframe_inf, informative, offset, drop_columns in informatives:
+      index, filled = self.index(df, informative, timeframe_inf, offset)
+      dropped = set(drop_columns)
+      for column in informative.columns:
+        name = f"{column}_{timeframe_inf}"
+        if name in dropped:
+          continue
+        columns[name] = _take(informative[column].to_numpy(), index, filled)
+    if not columns:
+      return df.copy()
+    return pd.concat([df, DataFrame(columns, index=df.index)], axis=1)
@@ -0,0 +1,50 @@
+"""
+Row views on the candles of an analyzed frame.
+
+The callbacks read a handful of columns of the last candles, with df.iloc[-1].squeeze() each call
+building an object Series of all the (hundreds of) columns. A CandleFrame keeps the NumPy array of
+each column read, for the lifetime of the analyzed frame, and its CandleRow views read one value
+of the arrays, of the same type as the Series value (np.float64, np.bool_, str, Timestamp...).
+"""
+
+import pandas as pd
+
+
+class CandleFrame:
+  """Column arrays of an analyzed frame, converted on the first read of each column."""
+
+  def __init__(self, df: pd.DataFrame):
+    self.df = df
+    self.length = len(df)
+    self.arrays = {}
+
+  def array(self, column: str):
+    array = self.arrays.get(column)
+    if array is None:
+      array = self.arrays[column] = self.df[column].to_numpy()
+    return array
+
+  def row(self, position: int) -> "CandleRow":
+    """Returns the view of a candle, by position (negative from the end, like iloc)."""
+    if not -self.length <= position < self.length:
+      raise IndexError(f"Candle position {position} out of the {self.length} candles.")
+    return CandleRow(self, position % self.length)
+
+
+class CandleRow:
+  """Candle of a CandleFrame, read like the Series of df.iloc[position]."""
+
+  __slots__ = ("frame", "position")
+
+  def __init__(self, frame: CandleFrame, position: int):
+    self.frame = frame
+    self.position = position
+
+  def __getitem__(self, column: str):
+    return self.frame.array(column)[self.position]
+
+  def __contains__(self, column: str) -> bool:
+    return column in self.frame.df.columns
+
+  def get(self, column: str, default=None):
+    return self[column] if column in self else default
@@ -0,0 +1,141 @@
+"""
+Compact dataframe mode.
+
+Stores the indicator columns of the analyzed frame as float32, and the boolean columns that the
+informative merge left as object as bool, to cut the memory of the frames kept for every pair.
+
+The price-level columns (OHLCV, moving averages, bands, rolling highs/lows) stay float64: they are
+compared with the close price, where the float32 rounding (about 6e-8 relative, 0.008 on a 100000
+price) could flip a comparison at a near tie. The oscillators, ratios and percentages are compared
+with constant thresholds. The columns the strategy type checks with isinstance(..., np.float64)
+stay float64 as well, a float32 value would fail the check.
+
+The harness functions compare the entry/exit signals of a full and a compact frame.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+# Columns kept as float64, by name prefix
+FLOAT64_PREFIXES = (
+  "open",
+  "high",
+  "low",
+  "close",
+  "volume",
+  "EMA_",
+  "SMA_",
+  "BBL_",
+  "BBM_",
+  "BBU_",
+  "zlma_",
+)
+
+# isinstance(last_candle["ROC_9_1d"], np.float64)
+FLOAT64_CHECK = re.compile(r'isinstance\(\w+\["([^"]+)"\],\s*np\.float64\)')
+
+# Current profits the exit functions are called with by the harness
+EXIT_PROFITS = (-0.12, -0.06, -0.02, 0.005, 0.015, 0.03, 0.06, 0.12, 0.25)
+
+
+def float64_checked_columns(source: str) -> set:
+  """Returns the columns type checked as np.float64 in the strategy source."""
+  return set(FLOAT64_CHECK.findall(source))
+
+
+def compact_dtypes(df: DataFrame, float64_prefixes: tuple = FLOAT64_PREFIXES, float64_columns=()) -> dict:
+  """
+  Returns the compact dtype of each column that can be converted.
+
+  The object columns are only converted to bool when they hold nothing but booleans, a missing
+  value would become True (and the comparisons on NaN are all False).
+  """
+  dtypes = {}
+  for column, dtype in df.dtypes.items():
+    if dtype == np.float64:
+      if column not in float64_columns and not str(column).startswith(float64_prefixes):
+        dtypes[column] = np.float32
+    elif dtype.kind == "O" and pd.api.types.infer_dtype(df[column], skipna=False) == "boolean":
+      dtypes[column] = bool
+  return dtypes
+
+
+def compact_frame(df: DataFrame, float64_prefixes: tuple = FLOAT64_PREFIXES, float64_columns=()) -> DataFrame:
+  """
+  Returns the frame with the compact dtypes.
+
+  :param df: Analyzed frame.
+  :param float64_prefixes: Prefixes of the float columns kept as float64.
+  :param float64_columns: Float columns kept as float64 (see float64_checked_columns()).
+  :return DataFrame: A new frame, or the same frame if there was nothing to convert.
+  """
+  dtypes = compact_dtypes(df, float64_prefixes, float64_columns)
+  if not dtypes:
+    return df
+  return df.astype(dtypes)
+
+
+# Validation Harness
+# ---------------------------------------------------------------------------------------------
+def signal_differences(full: DataFrame, compact: DataFrame, columns: list) -> dict:
+  """
+  Returns the number of differing rows per signal column (missing values compare equal).
+
+  :param full: Frame analyzed without the compact mode.
+  :param compact: Frame analyzed with the compact mode.
+  :param columns: Signal columns to compare (enter_long, enter_tag, ...), missing ones are skipped.
+  """
+  differences = {}
+  for column in columns:
+    if column not in full.columns and column not in compact.columns:
+      continue
+    if column not in full.columns or column not in compact.columns:
+      differences[column] = len(full)
+      continue
+    same = full[column].eq(compact[column]) | (full[column].isna() & compact[column].isna())
+    differing = int((~same).sum())
+    if differing:
+      differences[column] = differing
+  return differences
+
+
+def exit_signal_differences(exit_functions: dict, full: DataFrame, compact: DataFrame, profits=EXIT_PROFITS) -> dict:
+  """
+  Returns the number of differing exit decisions per exit function.
+
+  Each function is called on every candle of both frames (as the candle rows custom_exit() reads),
+  for each of the profits. The functions have the signature of long_exit_signals() and
+  long_exit_main(): (mode_name, current_profit, max_profit, max_loss, last_candle,
+  previous_candle_1, ..., previous_candle_5, trade, current_time, buy_tag).
+
+  :param exit_functions: Name to exit function.
+  :param full: Frame analyzed without the compact mode.
+  :param compact: Frame analyzed with the compact mode.
+  :param profits: Current profits to evaluate the exits with.
+  """
+  candles = [(full.iloc[i], compact.iloc[i]) for i in range(len(full))]
+  differences = {}
+  for name, func in exit_functions.items():
+    differing = 0
+    for i in range(5, len(candles)):
+      for profit in profits:
+        results = [
+          func(
+            "compact",
+            profit,
+            max(profit, 0.0) + 0.02,
+            0.05,
+            *[candles[i - shift][version] for shift in range(6)],
+            None,
+            None,
+            "",
+          )
+          for version in (0, 1)
+        ]
+        differing += results[0] != results[1]
+    if differing:
+      differences[name] = differing
+  return differences
@@ -0,0 +1,266 @@
+"""
+Entry condition evaluation on a single preallocated mask.
+
+populate_entry_trend() builds every entry condition as a list of boolean Series
+(long_entry_logic.append(...)) reduced with &, which evaluates every clause over the whole frame and
+allocates a Series per clause. compile_entry_function() recompiles the function so that:
+
+  long_entry_logic = []                        ->  long_entry_logic = EntryMask(df.index)
+  long_entry_logic.append(<clause>)            ->  long_entry_logic.append(lambda: <clause>)
+  reduce(lambda x, y: x & y, long_entry_logic) ->  long_entry_logic.series()
+
+Each clause is then and-ed in place into the mask of its condition, and the clauses following a mask
+that went all False are not evaluated at all. The clauses are side effect free comparisons, so the
+result is the same as the list and reduce.
+
+In live/dry-run only the signals of the last candles are used. For the tail evaluation, the shifts of
+the conditions are also rewritten to precomputed columns:
+
+  df["close"].shift(288)                       ->  df["close__shift_288"]
+
+and the function is called on a TailFrame of the last rows (entry_tail_frame()), with the shifted
+columns taken from the full frame, and its signals are copied back to the full frame
+(merge_tail_signals()).
+"""
+
+import ast
+import inspect
+import textwrap
+
+import numpy as np
+import pandas as pd
+
+# Names of the clause lists in populate_entry_trend()
+MASK_NAMES = ("long_entry_logic", "short_entry_logic")
+
+# Methods reading other rows than the current one, only shift() can be evaluated on the tail
+ROW_METHODS = ("shift", "rolling", "expanding", "ewm", "diff", "pct_change", "cumsum", "cummax", "cummin")
+
+# Entry signal columns, with their value on the rows before the tail
+ENTRY_SIGNALS = {"enter_tag": "", "enter_long": False, "enter_short": False}
+
+
+class EntryMask:
+  """Boolean mask of an entry condition, with its clauses and-ed in place."""
+
+  def __init__(self, index: pd.Index):
+    self.index = index
+    self.mask = np.ones(len(index), dtype=bool)
+    self.evaluated = 0
+    self.skipped = 0
+
+  def append(self, clause) -> None:
+    """
+    Ands a clause into the mask.
+
+    :param clause: Boolean Series/array or bool, or a callable returning one, called only if some
+                   rows of the mask are still True.
+    """
+    if not self.mask.any():
+      self.skipped += 1
+      return
+    value = clause() if callable(clause) else clause
+    self.evaluated += 1
+    if isinstance(value, (bool, np.bool_)):
+      if not value:
+        self.mask[:] = False
+      return
+    if isinstance(value, pd.Series) and value.dtype != bool:
+      # Same as the & of pandas, missing values are False
+      value = value.fillna(False)
+    self.mask &= np.asarray(value, dtype=bool)
+
+  def series(self) -> pd.Series:
+    return pd.Series(self.mask, index=self.index)
+
+
+class _LazyClauses(ast.NodeTransformer):
+  def __init__(self, frame_name: str):
+    self.frame_name = frame_name
+    self.clauses = 0
+
+  @staticmethod
+  def _is_mask(node: ast.AST) -> bool:
+    return isinstance(node, ast.Name) and node.id in MASK_NAMES
+
+  def visit_Assign(self, node: ast.Assign):
+    self.generic_visit(node)
+    if (
+      len(node.targets) == 1
+      and self._is_mask(node.targets[0])
+      and isinstance(node.value, ast.List)
+      and not node.value.elts
+    ):
+      node.value = ast.copy_location(ast.parse(f"EntryMask({self.frame_name}.index)", mode="eval").body, node.value)
+    return node
+
+  def visit_Call(self, node: ast.Call):
+    self.generic_visit(node)
+    func = node.func
+    if (
+      isinstance(func, ast.Attribute)
+      and func.attr == "append"
+      and self._is_mask(func.value)
+      and len(node.args) == 1
+      and not node.keywords
+    ):
+      self.clauses += 1
+      arguments = ast.arguments(posonlyargs=[], args=[], kwonlyargs=[], kw_defaults=[], defaults=[])
+      node.args[0] = ast.copy_location(ast.Lambda(args=arguments, body=node.args[0]), node.args[0])
+    elif (
+      isinstance(func, ast.Name) and func.id == "reduce" and len(node.args) == 2 and self._is_mask(node.args[1])
+    ):
+      series = ast.Attribute(value=node.args[1], attr="series", ctx=ast.Load())
+      return ast.copy_location(ast.Call(func=series, args=[], keywords=[]), node)
+    return node
+
+
+class _ShiftedColumns(ast.NodeTransformer):
+  def __init__(self, frame_name: str, shifts: set):
+    self.frame_name = frame_name
+    self.shifts = shifts
+
+  def visit_Call(self, node: ast.Call):
+    self.generic_visit(node)
+    func = node.func
+    if not isinstance(func, ast.Attribute) or func.attr not in ROW_METHODS:
+      return node
+    column = func.value
+    periods = node.args[0] if node.args else ast.Constant(1)
+    if (
+      func.attr != "shift"
+      or len(node.args) > 1
+      or node.keywords
+      or not isinstance(column, ast.Subscript)
+      or not isinstance(column.value, ast.Name)
+      or column.value.id != self.frame_name
+      or not isinstance(column.slice, ast.Constant)
+      or not isinstance(column.slice.value, str)
+      or not isinstance(periods, ast.Constant)
+      or not isinstance(periods.value, int)
+    ):
+      raise ValueError(f"Line {node.lineno}: {ast.unparse(node)} can't be evaluated on the tail rows.")
+    self.shifts.add((column.slice.value, periods.value))
+    shifted = ast.Constant(shifted_column(column.slice.value, periods.value))
+    return ast.copy_location(ast.Subscript(value=column.value, slice=shifted, ctx=ast.Load()), node)
+
+
+def shifted_column(column: str, periods: int) -> str:
+  return f"{column}__shift_{periods}"
+
+
+def compile_entry_source(source: str, filename: str, first_line: int, namespace: dict, shifts: set = None) -> tuple:
+  """
+  Compiles the source of a populate_entry_trend() like function with lazy clauses on EntryMask.
+
+  :param source: Source of the function (indented or not).
+  :param filename: File of the source, for the tracebacks.
+  :param first_line: Line of the function in the file, for the tracebacks.
+  :param namespace: Globals of the function.
+  :param shifts: If set, the shifts are rewritten for the tail evaluation, and their (column, periods)
+                 added to the set. ValueError is raised if another row method is used.
+  :return tuple: The compiled function, and the number of clauses made lazy.
+  """
+  tree = ast.parse(textwrap.dedent(source))
+  function = tree.body[0]
+  if not isinstance(function, ast.FunctionDef):
+    raise ValueError("The source is not a function.")
+  function.decorator_list = []
+  # The frame is the first argument after self
+  frame_name = function.args.args[1].arg
+  lazy_clauses = _LazyClauses(frame_name)
+  tree = lazy_clauses.visit(tree)
+  if shifts is not None:
+    tree = _ShiftedColumns(frame_name, shifts).visit(tree)
+  tree = ast.fix_missing_locations(tree)
+  ast.increment_lineno(tree, first_line - 1)
+  code = compile(tree, filename, "exec")
+  scope = {}
+  exec(code, {**namespace, "EntryMask": EntryMask}, scope)
+  return scope[function.name], lazy_clauses.clauses
+
+
+def compile_entry_function(func, shifts: set = None) -> tuple:
+  """
+  Same as compile_entry_source(), for a function defined in a source file.
+
+  :param func: populate_entry_trend() like function (not bound).
+  :param shifts: See compile_entry_source().
+  :return tuple: The compiled function, and the number of clauses made lazy.
+  """
+  source_lines, first_line = inspect.getsourcelines(func)
+  return compile_entry_source(
+    "".join(source_lines), inspect.getsourcefile(func), first_line, func.__globals__, shifts
+  )
+
+
+class _TailLoc:
+  def __init__(self, frame):
+    self.frame = frame
+
+  def _rows(self, rows):
+    return rows if isinstance(rows, slice) else np.asarray(rows, dtype=bool)
+
+  def __getitem__(self, key):
+    rows, column = key
+    return self.frame.signals[column][self._rows(rows)]
+
+  def __setitem__(self, key, value):
+    rows, column = key
+    signal = self.frame.signals.get(column)
+    if signal is None:
+      signal = self.frame.signals[column] = np.empty(len(self.frame.index), dtype=object)
+    signal[self._rows(rows)] = value if np.isscalar(value) else np.asarray(value, dtype=object)
+
+
+class TailFrame:
+  """
+  Last rows of an analyzed frame, as seen by the entry conditions compiled for the tail evaluation.
+
+  The columns are read as NumPy arrays, which the comparisons and the arithmetic of the conditions
+  handle the same way as the Series, without the per-operation overhead of pandas (that is most of
+  the time on a few rows). The shifted columns are the shifts of the full frame columns. Only the
+  signal columns can be set, through loc.
+  """
+
+  def __init__(self, df: pd.DataFrame, rows: int, shifts: set):
+    self.df = df
+    self.index = df.index[-rows:]
+    self.shifts = {shifted_column(column, periods): (column, periods) for column, periods in shifts}
+    self.values = {}
+    self.signals = {}
+    self.loc = _TailLoc(self)
+
+  def __getitem__(self, column: str) -> np.ndarray:
+    if column in self.signals:
+      return self.signals[column]
+    value = self.values.get(column)
+    if value is None:
+      rows = len(self.index)
+      if column in self.shifts:
+        source, periods = self.shifts[column]
+        value = self.df[source].shift(periods).to_numpy()[-rows:]
+      else:
+        value = self.df[column].to_numpy()[-rows:]
+      self.values[column] = value
+    return value
+
+
+def entry_tail_frame(df: pd.DataFrame, rows: int, shifts: set) -> TailFrame:
+  """
+  Returns the last rows of the frame for the tail evaluation.
+
+  :param df: Analyzed frame.
+  :param rows: Number of rows to evaluate.
+  :param shifts: (column, periods) of the shifts, see compile_entry_source().
+  """
+  return TailFrame(df, rows, shifts)
+
+
+def merge_tail_signals(df: pd.DataFrame, tail: TailFrame) -> pd.DataFrame:
+  """Sets the entry signals set on the tail to the frame, the rows before the tail are without signal."""
+  head = len(df) - len(tail.index)
+  for column, empty in ENTRY_SIGNALS.items():
+    if column in tail.signals:
+      df[column] = np.concatenate([np.full(head, empty, dtype=object), tail.signals[column]])
+  return df
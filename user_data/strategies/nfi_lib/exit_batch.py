@@ -0,0 +1,115 @@
+"""
+Exit inputs of all the open trades, precomputed once per bot loop.
+
+custom_exit() runs for every open trade, each call selecting the filled orders, summing them for the
+total profit and computing max_profit/max_loss. ExitBatch computes these for all the open trades at
+the start of the bot loop, with the order sums as NumPy arrays over the orders of all the trades
+(np.add.at adds in order, so the sums are the same as the sequential ones of calc_total_profit()).
+custom_exit() then reads the inputs of its trade, with only the exit rate dependent part left to
+compute.
+
+The inputs of a trade are used only while its orders, amount, open rate and min/max rates are the
+ones they were computed with: an order filled or a new high/low during the loop falls back to the
+regular computation.
+"""
+
+import numpy as np
+
+from nfi_lib.profits import OrderSums
+
+
+def trade_state(trade) -> tuple:
+  """The attributes of a trade the exit inputs depend on."""
+  return (len(trade.orders), trade.amount, trade.open_rate, trade.max_rate, trade.min_rate)
+
+
+class ExitInputs(OrderSums):
+  """Exit inputs of a trade, with the sums of its filled orders."""
+
+  __slots__ = ("state", "filled_entries", "filled_exits", "max_profit", "max_loss")
+
+
+class ExitBatch:
+  """Exit inputs of the open trades, by trade id."""
+
+  def __init__(self, trades: list, fee_open_rate: float = None, fee_close_rate: float = None):
+    """
+    :param trades: Open trades.
+    :param fee_open_rate: Custom open fee rate, the fee of the trade if None.
+    :param fee_close_rate: Custom close fee rate, the fee of the trade if None.
+    """
+    self.inputs = {}
+    trades = [trade for trade in trades if trade.select_filled_orders(trade.entry_side)]
+    count = len(trades)
+    # Per trade
+    is_short = np.zeros(count, dtype=bool)
+    fee_open = np.zeros(count)
+    fee_close = np.zeros(count)
+    base_rate = np.zeros(count)
+    max_rate = np.zeros(count)
+    min_rate = np.zeros(count)
+    # Per filled order: trade position, is entry, filled amount, price
+    positions, is_entry, filled, price = [], [], [], []
+    orders = []
+    for position, trade in enumerate(trades):
+      filled_entries = trade.select_filled_orders(trade.entry_side)
+      filled_exits = trade.select_filled_orders(trade.exit_side)
+      orders.append((filled_entries, filled_exits))
+      is_short[position] = trade.is_short
+      fee_open[position] = trade.fee_open if fee_open_rate is None else fee_open_rate
+      fee_close[position] = trade.fee_close if fee_close_rate is None else fee_close_rate
+      base_rate[position] = trade.open_rate
+      if len(filled_entries) > 1 and filled_entries[0] is not None and filled_entries[0].average is not None:
+        base_rate[position] = filled_entries[0].average
+      max_rate[position] = trade.max_rate
+      min_rate[position] = trade.min_rate
+      for order in filled_entries:
+        positions.append(position)
+        is_entry.append(True)
+        filled.append(order.safe_filled)
+        price.append(order.safe_price)
+      for order in filled_exits:
+        positions.append(position)
+        is_entry.append(False)
+        filled.append(order.safe_filled)
+        price.append(order.safe_price)
+
+    max_profit = (max_rate - base_rate) / base_rate
+    max_loss = (base_rate - min_rate) / min_rate
+
+    positions = np.array(positions, dtype=np.intp)
+    is_entry = np.array(is_entry, dtype=bool)
+    filled = np.array(filled, dtype=np.float64)
+    price = np.array(price, dtype=np.float64)
+    order_is_short = is_short[positions]
+    # The entries of a short and the exits of a long are sold (the fee is deducted from their stake)
+    sold = is_entry == order_is_short
+    fee = np.where(is_entry, fee_open[positions], fee_close[positions])
+    stake = filled * price * np.where(sold, 1 - fee, 1 + fee)
+    total_amount = np.zeros(count)
+    np.add.at(total_amount, positions, np.where(is_entry, filled, -filled))
+    total_stake = np.zeros(count)
+    np.add.at(total_stake, positions[is_entry], stake[is_entry])
+    orders_profit = np.zeros(count)
+    np.add.at(orders_profit, positions, np.where(sold, stake, -stake))
+
+    for position, trade in enumerate(trades):
+      inputs = ExitInputs()
+      inputs.state = trade_state(trade)
+      inputs.is_short = bool(is_short[position])
+      inputs.fee_close_rate = float(fee_close[position])
+      inputs.filled_entries, inputs.filled_exits = orders[position]
+      inputs.max_profit = float(max_profit[position])
+      inputs.max_loss = float(max_loss[position])
+      inputs.total_amount = float(total_amount[position])
+      inputs.total_stake = float(total_stake[position])
+      inputs.orders_profit = float(orders_profit[position])
+      inputs.first_entry_cost = inputs.filled_entries[0].cost
+      self.inputs[trade.id] = inputs
+
+  def get(self, trade):
+    """Returns the exit inputs of a trade, None if unknown or outdated."""
+    inputs = self.inputs.get(trade.id)
+    if inputs is None or inputs.state != trade_state(trade):
+      return None
+    return inputs
@@ -0,0 +1,360 @@
+"""
+Candle conditions of the exit signal functions, precomputed as columns for the backtests.
+
+populate_exit_trend() sets no exit signal, every exit goes through custom_exit(), called for each
+open trade on each candle, with the exit signal functions comparing the candles with constants in
+each of their if tests:
+
+  if last_candle["close"] > last_candle["EMA_200"]:
+    if 0.02 > current_profit >= 0.01:
+      if (last_candle["RSI_14"] < 28.0) and (previous_candle_1["RSI_14"] < 30.0):
+
+The tests (or the operands of and/or/not in the tests) reading only the candles are the candle
+conditions of the function. They are evaluated once on all the candles of a pair, with the previous
+candles as shifted columns, and each one is a bit of the uint64 exit bits columns of the function.
+The function is compiled again with each candle condition replaced by the test of its bit:
+
+  if masks[0] & 1:
+    if 0.02 > current_profit >= 0.01:
+      if masks[0] & 2:
+
+so for a trade it only reads the exit bits of the candle and compares its profits.
+"""
+
+import ast
+import inspect
+import operator
+import textwrap
+from functools import wraps
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from nfi_lib.exit_memo import CANDLE_ARGUMENTS, EXIT_ARGUMENTS
+
+# Bits of an exit bits column
+COLUMN_BITS = 64
+
+COMPARE_OPERATORS = {
+  ast.Gt: operator.gt,
+  ast.GtE: operator.ge,
+  ast.Lt: operator.lt,
+  ast.LtE: operator.le,
+  ast.Eq: operator.eq,
+  ast.NotEq: operator.ne,
+}
+
+# Globals the candle conditions can read
+CONDITION_GLOBALS = ("np", "isinstance")
+
+
+def _truth(values):
+  # Same as bool() on each value, NaN is True
+  if isinstance(values, np.ndarray):
+    if values.dtype == bool:
+      return values
+    if values.dtype == object:
+      return np.fromiter((bool(value) for value in values), dtype=bool, count=len(values))
+    return values != 0
+  return bool(values)
+
+
+def _and(*values):
+  result = _truth(values[0])
+  for value in values[1:]:
+    result = result & _truth(value)
+  return result
+
+
+def _or(*values):
+  result = _truth(values[0])
+  for value in values[1:]:
+    result = result | _truth(value)
+  return result
+
+
+def _not(value):
+  value = _truth(value)
+  return ~value if isinstance(value, np.ndarray) else not value
+
+
+def _compare(op, left, right):
+  if (isinstance(left, np.ndarray) and left.dtype == object) or (
+    isinstance(right, np.ndarray) and right.dtype == object
+  ):
+    # Values of other types (None) are guarded by isinstance() in the conditions, their result is not used
+    def compare(left_value, right_value):
+      try:
+        return bool(op(left_value, right_value))
+      except TypeError:
+        return False
+
+    with np.errstate(invalid="ignore"):
+      return np.frompyfunc(compare, 2, 1)(left, right).astype(bool)
+  return op(left, right)
+
+
+def _isinstance(values, types):
+  if not isinstance(values, np.ndarray):
+    return isinstance(values, types)
+  if values.dtype == object:
+    return np.fromiter((isinstance(value, types) for value in values), dtype=bool, count=len(values))
+  # The values of the candle rows are the scalars of the array type
+  return np.full(len(values), issubclass(values.dtype.type, types))
+
+
+def shifted_array(array: np.ndarray, periods: int) -> np.ndarray:
+  """
+  Returns the values of the candle periods before each candle, with the same type.
+
+  The first candles, without previous candles (custom_exit() doesn't run on them), repeat the first one.
+  """
+  if periods == 0 or len(array) == 0:
+    return array
+  shifted = np.empty_like(array)
+  shifted[periods:] = array[:-periods]
+  shifted[:periods] = array[0]
+  return shifted
+
+
+class _Columns(ast.NodeTransformer):
+  # Candle reads to the column arrays: previous_candle_2["close"] -> _column(2, "close")
+  def __init__(self, candle_names: dict):
+    self.candle_names = candle_names
+
+  def visit_Subscript(self, node: ast.Subscript):
+    if isinstance(node.value, ast.Name) and node.value.id in self.candle_names:
+      if not isinstance(node.slice, ast.Constant) or not isinstance(node.slice.value, str):
+        raise ValueError(f"Line {node.lineno}: {ast.unparse(node)} is not a column read.")
+      arguments = [ast.Constant(self.candle_names[node.value.id]), node.slice]
+      return ast.copy_location(ast.Call(func=ast.Name("_column", ast.Load()), args=arguments, keywords=[]), node)
+    return self.generic_visit(node)
+
+  def visit_Name(self, node: ast.Name):
+    if node.id in self.candle_names:
+      raise ValueError(f"Line {node.lineno}: {node.id} is not a column read.")
+    return node
+
+  def _call(self, name: str, arguments: list, node: ast.AST) -> ast.Call:
+    return ast.copy_location(ast.Call(func=ast.Name(name, ast.Load()), args=arguments, keywords=[]), node)
+
+  def visit_BoolOp(self, node: ast.BoolOp):
+    self.generic_visit(node)
+    return self._call("_and" if isinstance(node.op, ast.And) else "_or", node.values, node)
+
+  def visit_UnaryOp(self, node: ast.UnaryOp):
+    self.generic_visit(node)
+    return self._call("_not", [node.operand], node) if isinstance(node.op, ast.Not) else node
+
+  def visit_Compare(self, node: ast.Compare):
+    self.generic_visit(node)
+    operands = [node.left, *node.comparators]
+    comparisons = []
+    for op, left, right in zip(node.ops, operands, operands[1:]):
+      if type(op) not in COMPARE_OPERATORS:
+        raise ValueError(f"Line {node.lineno}: {ast.unparse(node)} can't be evaluated on the columns.")
+      op_name = ast.Attribute(ast.Name("_operator", ast.Load()), COMPARE_OPERATORS[type(op)].__name__, ast.Load())
+      comparisons.append(self._call("_compare", [op_name, left, right], node))
+    return comparisons[0] if len(comparisons) == 1 else self._call("_and", comparisons, node)
+
+  def visit_Call(self, node: ast.Call):
+    self.generic_visit(node)
+    if isinstance(node.func, ast.Name) and node.func.id == "isinstance" and len(node.args) == 2 and not node.keywords:
+      return self._call("_isinstance", node.args, node)
+    raise ValueError(f"Line {node.lineno}: {ast.unparse(node)} can't be evaluated on the columns.")
+
+
+class _Conditions(ast.NodeTransformer):
+  # The candle conditions of the tests to the tests of their bits
+  def __init__(self, candle_names: dict, masks_name: str):
+    self.candle_names = candle_names
+    self.masks_name = masks_name
+    # ast.dump() of the condition -> bit
+    self.bits = {}
+    self.conditions = []
+
+  def _candle_only(self, node: ast.AST) -> bool:
+    names = {name.id for name in ast.walk(node) if isinstance(name, ast.Name)}
+    return bool(names & set(self.candle_names)) and names <= set(self.candle_names) | set(CONDITION_GLOBALS)
+
+  def _test(self, node: ast.expr) -> ast.expr:
+    if self._candle_only(node):
+      key = ast.dump(node)
+      bit = self.bits.get(key)
+      if bit is None:
+        bit = self.bits[key] = len(self.conditions)
+        self.conditions.append(node)
+      masks = ast.Subscript(ast.Name(self.masks_name, ast.Load()), ast.Constant(bit // COLUMN_BITS), ast.Load())
+      return ast.copy_location(ast.BinOp(masks, ast.BitAnd(), ast.Constant(1 << (bit % COLUMN_BITS))), node)
+    if isinstance(node, ast.BoolOp):
+      node.values = [self._test(value) for value in node.values]
+    elif isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+      node.operand = self._test(node.operand)
+    return node
+
+  def visit_If(self, node: ast.If):
+    node.test = self._test(node.test)
+    return self.generic_visit(node)
+
+  def visit_IfExp(self, node: ast.IfExp):
+    node.test = self._test(node.test)
+    return self.generic_visit(node)
+
+
+class ExitConditions:
+  """Candle conditions of an exit signal function, and the function on their bits."""
+
+  def __init__(self, name: str, conditions: list, function, namespace: dict):
+    """
+    :param name: Name of the exit signal function.
+    :param conditions: Compiled candle conditions (on the column arrays), in bit order.
+    :param function: The function on the bits, called with mode_name, current_profit, max_profit,
+                     max_loss, masks (the values of the exit bits columns), trade, current_time and buy_tag.
+    :param namespace: Globals of the exit signal function.
+    """
+    self.name = name
+    self.conditions = conditions
+    self.function = function
+    self.columns = [f"exit_bits_{name}_{word}" for word in range(-(-len(conditions) // COLUMN_BITS))]
+    self.namespace = {
+      **{name: namespace[name] for name in CONDITION_GLOBALS if name in namespace},
+      "_and": _and,
+      "_or": _or,
+      "_not": _not,
+      "_compare": _compare,
+      "_isinstance": _isinstance,
+      "_operator": operator,
+    }
+
+  def evaluate(self, df: pd.DataFrame) -> dict:
+    """Returns the exit bits columns of the candles of a frame, column name -> uint64 array."""
+    arrays = {}
+
+    def column(periods: int, name: str) -> np.ndarray:
+      array = arrays.get((periods, name))
+      if array is None:
+        array = arrays[(periods, name)] = shifted_array(df[name].to_numpy(), periods)
+      return array
+
+    namespace = {**self.namespace, "_column": column}
+    words = [np.zeros(len(df), dtype=np.uint64) for _ in self.columns]
+    for bit, code in enumerate(self.conditions):
+      condition = np.broadcast_to(np.asarray(eval(code, namespace), dtype=bool), (len(df),))
+      words[bit // COLUMN_BITS] |= condition.astype(np.uint64) << np.uint64(bit % COLUMN_BITS)
+    return dict(zip(self.columns, words))
+
+
+def compile_exit_source(source: str, filename: str, first_line: int, namespace: dict) -> Optional[ExitConditions]:
+  """
+  Compiles the source of an exit signal function into its candle conditions and the function on
+  their bits.
+
+  :param source: Source of the function (indented or not), with the arguments of EXIT_ARGUMENTS.
+  :param filename: File of the source, for the tracebacks.
+  :param first_line: Line of the function in the file, for the tracebacks.
+  :param namespace: Globals of the function.
+  :return ExitConditions: None if the function can't be compiled: it reads the candles outside of the
+                          tests, or otherwise than with column reads, comparisons, and/or/not and
+                          isinstance().
+  """
+  tree = ast.parse(textwrap.dedent(source))
+  function = tree.body[0]
+  if not isinstance(function, ast.FunctionDef):
+    raise ValueError("The source is not a function.")
+  function.decorator_list = []
+  function.returns = None
+  arguments = function.args.args
+  if arguments and arguments[0].arg == "self":
+    if any(isinstance(node, ast.Name) and node.id == "self" for node in ast.walk(function)):
+      return None
+    arguments = arguments[1:]
+  if len(arguments) != EXIT_ARGUMENTS or function.args.vararg or function.args.kwarg:
+    return None
+  candle_names = {arguments[position].arg: periods for periods, position in enumerate(CANDLE_ARGUMENTS)}
+  masks_name = "masks"
+  while any(isinstance(node, ast.Name) and node.id == masks_name for node in ast.walk(function)):
+    masks_name = "_" + masks_name
+  conditions = _Conditions(candle_names, masks_name)
+  function = conditions.visit(function)
+  if any(isinstance(node, ast.Name) and node.id in candle_names for node in ast.walk(function)):
+    return None
+  code = []
+  for condition in conditions.conditions:
+    try:
+      expression = ast.fix_missing_locations(ast.Expression(_Columns(candle_names).visit(condition)))
+    except ValueError:
+      return None
+    ast.increment_lineno(expression, first_line - 1)
+    code.append(compile(expression, filename, "eval"))
+  function.args.args = [
+    *arguments[: CANDLE_ARGUMENTS[0]],
+    ast.arg(masks_name),
+    *arguments[CANDLE_ARGUMENTS[-1] + 1 :],
+  ]
+  for argument in function.args.args:
+    argument.annotation = None
+  tree = ast.fix_missing_locations(tree)
+  ast.increment_lineno(tree, first_line - 1)
+  scope = {}
+  exec(compile(tree, filename, "exec"), namespace, scope)
+  return ExitConditions(function.name, code, scope[function.name], namespace)
+
+
+def compile_exit_function(func) -> Optional[ExitConditions]:
+  """Same as compile_exit_source(), for a function (or method) defined in a source file."""
+  source_lines, first_line = inspect.getsourcelines(func)
+  return compile_exit_source("".join(source_lines), inspect.getsourcefile(func), first_line, func.__globals__)
+
+
+class ExitColumns:
+  """Exit bits columns of the compiled exit signal functions."""
+
+  def __init__(self):
+    # function name -> ExitConditions
+    self.functions = {}
+
+  def register(self, func) -> Optional[ExitConditions]:
+    """Compiles and registers an exit signal function, returns None if it can't be compiled."""
+    conditions = compile_exit_function(func)
+    if conditions is not None:
+      self.functions[conditions.name] = conditions
+    return conditions
+
+  @property
+  def columns(self) -> list:
+    return [column for conditions in self.functions.values() for column in conditions.columns]
+
+  def populate(self, df: pd.DataFrame) -> pd.DataFrame:
+    """Adds the exit bits columns of the registered functions to an analyzed frame."""
+    columns = {}
+    for conditions in self.functions.values():
+      columns.update(conditions.evaluate(df))
+    # One concat, instead of inserting the columns one by one in a frame of hundreds of columns
+    df = df.drop(columns=[column for column in columns if column in df.columns])
+    return pd.concat([df, pd.DataFrame(columns, index=df.index)], axis=1)
+
+  def precomputed(self, func):
+    """
+    Returns a version of the exit signal function reading the exit bits columns of the last candle,
+    or the function itself if it can't be compiled. Without the columns (a frame not populated), the
+    function itself is called.
+    """
+    conditions = self.register(func)
+    if conditions is None:
+      return func
+    function = conditions.function
+    columns = conditions.columns
+
+    @wraps(func)
+    def precomputed_func(*args, **kwargs):
+      if kwargs or len(args) != EXIT_ARGUMENTS:
+        return func(*args, **kwargs)
+      last_candle = args[CANDLE_ARGUMENTS[0]]
+      try:
+        masks = [int(last_candle[column]) for column in columns]
+      except KeyError:
+        return func(*args)
+      return function(*args[: CANDLE_ARGUMENTS[0]], masks, *args[CANDLE_ARGUMENTS[-1] + 1 :])
+
+    return precomputed_func
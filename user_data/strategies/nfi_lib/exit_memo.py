@@ -0,0 +1,132 @@
+"""
+Per-candle memoization of the exit sub-decisions.
+
+custom_exit() runs every bot loop for every open trade, but the exit signal functions
+(long_exit_signals(), long_exit_main(), ...) only read the candles, which change on candle close,
+and the profits, which they only compare with constants:
+
+  if 0.02 > current_profit >= 0.01:
+    if last_candle["RSI_14"] < 28.0:
+
+So their result is the same for all the profits between the same two thresholds. The results are
+memoized per (trade id, candle date, order count) and per profit band: the position of each profit
+among the thresholds of the function, found in its source.
+"""
+
+import ast
+import inspect
+import textwrap
+from bisect import bisect_left, bisect_right
+from functools import wraps
+from typing import Optional
+
+# (mode_name, current_profit, max_profit, max_loss, last_candle, previous_candle_1, ..., previous_candle_5,
+# trade, current_time, buy_tag)
+EXIT_ARGUMENTS = 13
+PROFIT_ARGUMENTS = (1, 2, 3)
+CANDLE_ARGUMENTS = (4, 5, 6, 7, 8, 9)
+
+
+def _number(node: ast.AST) -> Optional[float]:
+  if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+    value = _number(node.operand)
+    return None if value is None else -value
+  if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+    return float(node.value)
+  return None
+
+
+def profit_thresholds(func) -> Optional[tuple]:
+  """
+  Returns the sorted thresholds the profit arguments are compared with, per profit argument.
+
+  :param func: Exit signal function (or method), with the arguments of EXIT_ARGUMENTS.
+  :return tuple: The thresholds of current_profit, max_profit and max_loss, or None if the function
+                 can't be memoized: it reads the trade, the time or the tag, or uses a profit
+                 otherwise than compared with constants.
+  """
+  return function_thresholds(ast.parse(textwrap.dedent(inspect.getsource(func))).body[0])
+
+
+def function_thresholds(function: ast.FunctionDef) -> Optional[tuple]:
+  """Same as profit_thresholds(), from the syntax tree of the function."""
+  names = [argument.arg for argument in function.args.args]
+  if names and names[0] == "self":
+    names = names[1:]
+  if len(names) != EXIT_ARGUMENTS or function.args.vararg or function.args.kwarg:
+    return None
+  profits = {names[position]: set() for position in PROFIT_ARGUMENTS}
+  others = set(names) - set(profits) - {names[0]} - {names[position] for position in CANDLE_ARGUMENTS}
+  compared = set()
+  for node in ast.walk(function):
+    if isinstance(node, ast.Compare):
+      operands = [node.left, *node.comparators]
+      for left, right in zip(operands, operands[1:]):
+        for name, constant in ((left, right), (right, left)):
+          if isinstance(name, ast.Name) and name.id in profits:
+            value = _number(constant)
+            if value is None:
+              return None
+            profits[name.id].add(value)
+            compared.add(name)
+  for node in ast.walk(function):
+    if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+      if node.id in others or (node.id in profits and node not in compared):
+        return None
+  return tuple(tuple(sorted(profits[names[position]])) for position in PROFIT_ARGUMENTS)
+
+
+def _band(thresholds: tuple, value: float) -> tuple:
+  # Equal to a threshold is a band of its own (>= and > differ there)
+  return bisect_left(thresholds, value), bisect_right(thresholds, value)
+
+
+class ExitMemo:
+  """Results of the memoized exit functions, for the last candle of each trade."""
+
+  def __init__(self):
+    # trade id -> (candle date, order count, results)
+    self.entries = {}
+    self.candle_date = None
+    self.hits = 0
+    self.misses = 0
+
+  def results(self, trade, candle_date) -> dict:
+    if self.candle_date is None or candle_date > self.candle_date:
+      # A new candle, the results of the previous one (and of the closed trades) are stale
+      self.candle_date = candle_date
+      self.entries.clear()
+    order_count = len(trade.orders)
+    entry = self.entries.get(trade.id)
+    if entry is None or entry[0] != candle_date or entry[1] != order_count:
+      entry = self.entries[trade.id] = (candle_date, order_count, {})
+    return entry[2]
+
+  def memoized(self, func):
+    """
+    Returns the memoized version of an exit function, or the function itself if it can't be memoized
+    (see profit_thresholds()).
+    """
+    thresholds = profit_thresholds(func)
+    if thresholds is None:
+      return func
+    name = func.__name__
+
+    @wraps(func)
+    def memoized_func(*args, **kwargs):
+      if kwargs or len(args) != EXIT_ARGUMENTS:
+        return func(*args, **kwargs)
+      profits = [args[position] for position in PROFIT_ARGUMENTS]
+      if any(profit != profit for profit in profits):
+        return func(*args)
+      results = self.results(args[10], args[4]["date"])
+      key = (name, args[0], *(_band(values, profit) for values, profit in zip(thresholds, profits)))
+      result = results.get(key)
+      if result is None:
+        self.misses += 1
+        result = results[key] = func(*args)
+      else:
+        self.hits += 1
+      return result
+
+    return memoized_func
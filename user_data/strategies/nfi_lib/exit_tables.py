@@ -0,0 +1,132 @@
+"""
+Decision tables of the exit signal functions.
+
+An exit signal function only compares the profits with constants (see profit_thresholds()), so for
+the candles of a pair its result is a step function of the profits: constant between two thresholds,
+and on each threshold. With k sorted thresholds t_0 < ... < t_k-1 of a profit, there are 2k + 1
+bands, numbered:
+
+  0: below t_0, 1: t_0, 2: between t_0 and t_1, ..., 2k - 1: t_k-1, 2k: above t_k-1
+
+and the band of a profit p is bisect_left(t, p) + bisect_right(t, p).
+
+An ExitTable evaluates the function once per band (per combination of the bands of current_profit,
+max_profit and max_loss) on a profit inside the band, for the candles of a pair. The exit of each
+trade on the pair is then a lookup of its bands in the table, from custom_exit(). A single pass over
+all the trades of the loop is not possible: the profits depend on the current rate of each
+custom_exit() call.
+"""
+
+from bisect import bisect_left, bisect_right
+from functools import wraps
+from itertools import product
+
+import numpy as np
+
+from nfi_lib.exit_memo import (
+  CANDLE_ARGUMENTS,
+  EXIT_ARGUMENTS,
+  PROFIT_ARGUMENTS,
+  profit_thresholds,
+)
+
+# Above this number of cells, a function is not tabled (its calls are not replaced)
+MAX_TABLE_CELLS = 4096
+
+
+def band_profits(thresholds: tuple) -> list:
+  """Returns a profit inside each band of the thresholds, in band order."""
+  if not thresholds:
+    return [0.0]
+  profits = [thresholds[0] - 1.0]
+  for previous, threshold in zip((None, *thresholds), thresholds):
+    if previous is not None:
+      profits.append((previous + threshold) / 2.0)
+    profits.append(threshold)
+  profits.append(thresholds[-1] + 1.0)
+  return profits
+
+
+class ExitTable:
+  """Results of an exit signal function for the candles of a pair, per profit band."""
+
+  def __init__(self, func, thresholds: tuple, mode_name: str, candles: tuple, extra_args: tuple = (None, None, None)):
+    """
+    :param func: Exit signal function (see profit_thresholds()).
+    :param thresholds: Its thresholds, from profit_thresholds().
+    :param mode_name: Mode name the function is called with.
+    :param candles: last_candle, previous_candle_1, ..., previous_candle_5.
+    :param extra_args: trade, current_time and buy_tag (not read by the function).
+    """
+    self.bounds = thresholds
+    shape = tuple(2 * len(values) + 1 for values in thresholds)
+    self.sells = np.zeros(shape, dtype=bool)
+    self.signals = np.empty(shape, dtype=object)
+    for cell in product(*(enumerate(band_profits(values)) for values in thresholds)):
+      bands = tuple(band for band, _ in cell)
+      sell, signal_name = func(mode_name, *(profit for _, profit in cell), *candles, *extra_args)
+      self.sells[bands] = sell
+      self.signals[bands] = signal_name
+
+  def lookup(self, current_profit: float, max_profit: float, max_loss: float) -> tuple:
+    """Returns the (sell, signal_name) of a trade."""
+    bands = tuple(
+      bisect_left(values, profit) + bisect_right(values, profit)
+      for values, profit in zip(self.bounds, (current_profit, max_profit, max_loss))
+    )
+    return bool(self.sells[bands]), self.signals[bands]
+
+
+class ExitTables:
+  """Exit tables of the tabled exit functions, for the last candle of each pair."""
+
+  def __init__(self):
+    # function name -> (function, thresholds)
+    self.functions = {}
+    # (pair, function name, mode name) -> (candle date, table)
+    self.tables = {}
+    self.candle_date = None
+
+  def register(self, func) -> bool:
+    """Registers an exit function, returns False if it can't be tabled."""
+    thresholds = profit_thresholds(func)
+    if thresholds is None or np.prod([2 * len(values) + 1 for values in thresholds]) > MAX_TABLE_CELLS:
+      return False
+    self.functions[func.__name__] = (func, thresholds)
+    return True
+
+  def table(self, pair: str, name: str, mode_name: str, candles: tuple, extra_args=(None, None, None)) -> ExitTable:
+    """Returns the table of a registered function for the candles of the pair, built on the first call."""
+    candle_date = candles[0]["date"]
+    if self.candle_date is None or candle_date > self.candle_date:
+      # A new candle, the tables of the previous one are stale
+      self.candle_date = candle_date
+      self.tables.clear()
+    key = (pair, name, mode_name)
+    entry = self.tables.get(key)
+    if entry is None or entry[0] != candle_date:
+      func, thresholds = self.functions[name]
+      entry = self.tables[key] = (candle_date, ExitTable(func, thresholds, mode_name, candles, extra_args))
+    return entry[1]
+
+  def tabled(self, func):
+    """
+    Returns a version of the exit function reading its results from the tables, or the function
+    itself if it can't be tabled.
+    """
+    if not self.register(func):
+      return func
+    name = func.__name__
+
+    @wraps(func)
+    def tabled_func(*args, **kwargs):
+      if kwargs or len(args) != EXIT_ARGUMENTS:
+        return func(*args, **kwargs)
+      profits = [args[position] for position in PROFIT_ARGUMENTS]
+      if any(profit != profit for profit in profits):
+        return func(*args)
+      candles = tuple(args[position] for position in CANDLE_ARGUMENTS)
+      table = self.table(args[10].pair, name, args[0], candles, args[10:])
+      return table.lookup(*profits)
+
+    return tabled_func
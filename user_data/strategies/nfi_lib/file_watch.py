@@ -0,0 +1,123 @@
+"""
+Change detection of a file, off the bot loop.
+
+The hold trades file is checked every bot loop (and on each exit) with a stat() call, for a file
+which rarely changes. A FileWatcher watches it from a daemon thread, with inotify on Linux (through
+libc, on the directory of the file, so that a file replaced by a rename or created later is seen) and
+by polling its stat() elsewhere, and only sets a flag: the loop checks a boolean.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+
+# inotify(7)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_IGNORED = 0x00008000
+IN_WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+# struct inotify_event: wd, mask, cookie, len (then the name, of len bytes)
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def _file_state(path: Path):
+  try:
+    stat = path.stat()
+  except FileNotFoundError:
+    return None
+  return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+class FileWatcher:
+  """Sets changed when the file is written, replaced, created or deleted."""
+
+  def __init__(self, path, interval: float = 5.0, backend: str = None):
+    """
+    :param path: File to watch.
+    :param interval: Polling interval in seconds, of the polling backend.
+    :param backend: "inotify" or "poll", inotify when available if None.
+    """
+    self.path = Path(path)
+    self.interval = interval
+    # Changed since the last consume(), the file is unknown until then
+    self.changed = True
+    self._closed = threading.Event()
+    self._fd = None
+    self._state = _file_state(self.path)
+    if backend in (None, "inotify"):
+      self._fd = self._inotify_fd()
+      if self._fd is None and backend == "inotify":
+        raise OSError(f"inotify is not available to watch {self.path}.")
+    self.backend = "poll" if self._fd is None else "inotify"
+    target = self._poll if self._fd is None else self._read_events
+    self._thread = threading.Thread(target=target, name=f"FileWatcher-{self.path.name}", daemon=True)
+    self._thread.start()
+
+  def consume(self) -> bool:
+    """Returns True if the file changed since the last call."""
+    if not self.changed:
+      return False
+    self.changed = False
+    return True
+
+  def close(self):
+    self._closed.set()
+    self._thread.join()
+
+  def _inotify_fd(self):
+    if not sys.platform.startswith("linux"):
+      return None
+    try:
+      libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+      fd = libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+    except (OSError, AttributeError):
+      return None
+    if fd < 0:
+      return None
+    if libc.inotify_add_watch(fd, os.fsencode(self.path.parent), IN_WATCH_MASK) < 0:
+      os.close(fd)
+      return None
+    return fd
+
+  def _read_events(self):
+    name = os.fsencode(self.path.name)
+    try:
+      while not self._closed.is_set():
+        # With a timeout, for close()
+        if not select.select([self._fd], [], [], 1.0)[0]:
+          continue
+        try:
+          data = os.read(self._fd, 65536)
+        except BlockingIOError:
+          continue
+        offset = 0
+        while offset < len(data):
+          _, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+          offset += EVENT_HEADER.size
+          if mask & IN_IGNORED:
+            # The directory is gone, polled from now on
+            self.changed = True
+            self.backend = "poll"
+            self._state = _file_state(self.path)
+            return self._poll()
+          if data[offset : offset + length].rstrip(b"\0") == name:
+            self.changed = True
+          offset += length
+    finally:
+      os.close(self._fd)
+
+  def _poll(self):
+    while not self._closed.wait(self.interval):
+      state = _file_state(self.path)
+      if state != self._state:
+        self._state = state
+        self.changed = True
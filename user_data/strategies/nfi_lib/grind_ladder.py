@@ -0,0 +1,86 @@
+"""
+Grind ladders of the trades: their grind/rebuy buys, per grind, from the filled orders.
+
+The grind adjust functions walk all the filled orders of a trade (backwards, from the last one) on
+each call, to sum the buys of each grind since its last sell. The walk only depends on the filled
+orders, except for the last exit: a partial exit (its remaining stake at the exit rate above the min
+stake) stops the walk there. A ladder is built once per fill and kind of walk (full, or stopped at
+the last exit) and kept per trade, the exit rate dependent parts (distance to the last buy, current
+stake) are computed from it.
+"""
+
+from nfi_lib.profits import order_fills
+
+
+class GrindRung:
+  """Buys of a grind, since its last sell."""
+
+  __slots__ = ("count", "total_amount", "total_cost", "buy_orders", "last_buy", "is_sell_found")
+
+  def __init__(self):
+    self.count = 0
+    self.total_amount = 0.0
+    self.total_cost = 0.0
+    self.buy_orders = []
+    # The last (the first found walking backwards) buy
+    self.last_buy = None
+    self.is_sell_found = False
+
+  def add(self, order):
+    self.count += 1
+    self.total_amount += order.safe_filled
+    self.total_cost += order.safe_filled * order.safe_price
+    self.buy_orders.append(order.id)
+    if self.last_buy is None:
+      self.last_buy = order
+
+  def distance_ratio(self, exit_rate: float) -> float:
+    """Returns the distance of the exit rate from the last buy, 0.0 without buy."""
+    if self.last_buy is None:
+      return 0.0
+    return (exit_rate - self.last_buy.safe_price) / self.last_buy.safe_price
+
+
+class GrindLadder:
+  """Rungs of the grinds of a trade, and the flags of the walk (set by the walk)."""
+
+  def __init__(self, names: tuple):
+    self.rungs = {name: GrindRung() for name in names}
+    # The walk stopped at a partial last exit
+    self.partial_sell = False
+    self.is_derisk = False
+
+
+class GrindLadders:
+  """Ladders of the trades, built again when a trade has a new filled order."""
+
+  def __init__(self, max_trades: int = 1000):
+    # (trade id, walk name, partial sell) -> (fills, ladder)
+    self.ladders = {}
+    # Above, the ladders are cleared (of the closed trades mostly) and built again on the next call
+    self.max_trades = max_trades
+    self.hits = 0
+    self.misses = 0
+
+  def ladder(self, trade, name: str, filled_orders, partial_sell: bool, build) -> GrindLadder:
+    """
+    Returns the ladder of a trade.
+
+    :param name: Name of the walk.
+    :param filled_orders: Filled orders of the trade.
+    :param partial_sell: The walk stops at the last exit.
+    :param build: Function building the ladder, called with partial_sell.
+    """
+    key = (trade.id, name, partial_sell)
+    # The trade ids restart with each backtest
+    fills = (trade.pair, trade.open_date, order_fills(filled_orders))
+    entry = self.ladders.get(key)
+    if entry is not None and entry[0] == fills:
+      self.hits += 1
+      return entry[1]
+    self.misses += 1
+    if len(self.ladders) >= self.max_trades:
+      self.ladders.clear()
+    ladder = build(partial_sell)
+    self.ladders[key] = (fills, ladder)
+    return ladder
@@ -0,0 +1,578 @@
+"""
+Incremental (append-only) indicators for the 5m base timeframe of NostalgiaForInfinityX5.
+
+The recursive indicators (EMA, Wilder RSI, the running sums of SMA/BBANDS/MFI, OBV) keep their
+state between candles, and the rolling window ones only look at the last window of the frame, so
+a new candle costs a handful of scalar updates instead of a full recompute of the frame.
+
+The recursions follow the reference TA-Lib implementations used by pandas_ta, in the same order of
+operations, so the values match the full path up to the rounding of the TA-Lib build in use. This
+is verified when seeding: if any column doesn't match the frame computed by pandas_ta, the state
+is flagged as unverified and never used.
+
+In live the frame slides, and the full path starts its recursions over from the first candle of
+the frame. Those that remember that start are rebased on each update of a slid frame: OBV (a
+shift) and EMA_200 (recomputed over the frame, its seed still weighs about 3e-4 after 800 candles).
+The other recursions forget it well within the frame (below 1e-13 after 800 candles).
+"""
+
+import sys
+from collections import deque
+from typing import Optional
+
+import numpy as np
+import talib
+from pandas import DataFrame, Timestamp
+
+# Same guard as pandas_ta non_zero_range()
+EPSILON = sys.float_info.epsilon
+
+# Columns produced by NostalgiaForInfinityX5.base_tf_5m_indicators(), in the same order
+BASE_TF_5M_COLUMNS = [
+  "RSI_3",
+  "RSI_4",
+  "RSI_14",
+  "RSI_20",
+  "RSI_3_change_pct",
+  "RSI_14_change_pct",
+  "EMA_3",
+  "EMA_9",
+  "EMA_12",
+  "EMA_16",
+  "EMA_20",
+  "EMA_26",
+  "EMA_50",
+  "EMA_200",
+  "SMA_16",
+  "SMA_30",
+  "BBL_20_2.0",
+  "BBM_20_2.0",
+  "BBU_20_2.0",
+  "BBB_20_2.0",
+  "BBP_20_2.0",
+  "MFI_14",
+  "CMF_20",
+  "WILLR_14",
+  "WILLR_480",
+  "AROONU_14",
+  "AROOND_14",
+  "STOCHRSIk_14_14_3_3",
+  "STOCHRSId_14_14_3_3",
+  "KST_10_15_20_30_10_10_10_15",
+  "KSTs_9",
+  "OBV",
+  "OBV_change_pct",
+  "ROC_2",
+  "ROC_9",
+  "change_pct",
+  "close_max_48",
+  "num_empty_288",
+]
+
+
+def _non_zero(value: float) -> float:
+  return value + EPSILON if value == 0.0 else value
+
+
+def epoch_seconds(dates) -> np.ndarray:
+  """Returns the candle dates (Series of Timestamps) as epoch seconds."""
+  return dates.map(Timestamp.timestamp).to_numpy(dtype=np.float64)
+
+
+def _recursion_state(state) -> dict:
+  return {name: list(value) if isinstance(value, deque) else value for name, value in vars(state).items()}
+
+
+def _restore_recursion(state, values: dict) -> None:
+  for name, value in values.items():
+    current = getattr(state, name)
+    if isinstance(current, deque):
+      # JSON has no tuples (the money flows of MFI)
+      value = deque((tuple(item) if isinstance(item, list) else item for item in value), maxlen=current.maxlen)
+    setattr(state, name, value)
+
+
+# TA-Lib EMA, seeded with the SMA of the first values
+# ---------------------------------------------------------------------------------------------
+class EMAState:
+  def __init__(self, length: int):
+    self.length = length
+    self.k = 2.0 / (length + 1)
+    self.count = 0
+    self.total = 0.0
+    self.value = np.nan
+
+  def step(self, x: float) -> float:
+    if self.count < self.length:
+      self.count += 1
+      self.total += x
+      if self.count == self.length:
+        self.value = self.total / self.length
+      return self.value
+    self.value = ((x - self.value) * self.k) + self.value
+    return self.value
+
+
+# TA-Lib RSI (Wilder smoothing)
+# ---------------------------------------------------------------------------------------------
+class RSIState:
+  def __init__(self, length: int):
+    self.length = length
+    self.count = 0
+    self.previous = None
+    self.gain = 0.0
+    self.loss = 0.0
+
+  def _value(self) -> float:
+    total = self.gain + self.loss
+    if -0.00000000000001 < total < 0.00000000000001:
+      return 0.0
+    return 100.0 * (self.gain / total)
+
+  def step(self, x: float) -> float:
+    if self.previous is None:
+      self.previous = x
+      return np.nan
+    diff = x - self.previous
+    self.previous = x
+    if self.count < self.length:
+      self.count += 1
+      if diff < 0:
+        self.loss -= diff
+      else:
+        self.gain += diff
+      if self.count < self.length:
+        return np.nan
+      self.loss /= self.length
+      self.gain /= self.length
+      return self._value()
+    self.loss *= self.length - 1
+    self.gain *= self.length - 1
+    if diff < 0:
+      self.loss -= diff
+    else:
+      self.gain += diff
+    self.loss /= self.length
+    self.gain /= self.length
+    return self._value()
+
+
+# TA-Lib SMA (running total), leading NaNs are skipped like the TA-Lib wrapper does
+# ---------------------------------------------------------------------------------------------
+class SMAState:
+  def __init__(self, length: int):
+    self.length = length
+    self.window = deque()
+    self.total = 0.0
+
+  def step(self, x: float) -> float:
+    if not self.window and np.isnan(x):
+      return np.nan
+    self.total += x
+    self.window.append(x)
+    if len(self.window) < self.length:
+      return np.nan
+    value = self.total / self.length
+    self.total -= self.window.popleft()
+    return value
+
+
+# TA-Lib BBANDS (SMA middle band, running sum of squares for the deviation)
+# ---------------------------------------------------------------------------------------------
+class BBandsState:
+  def __init__(self, length: int, std: float):
+    self.length = length
+    self.std = std
+    self.window = deque()
+    self.total = 0.0
+    self.total_squares = 0.0
+
+  def step(self, x: float) -> tuple:
+    self.total += x
+    self.total_squares += x * x
+    self.window.append(x)
+    if len(self.window) < self.length:
+      return np.nan, np.nan, np.nan
+    middle = self.total / self.length
+    mean_squares = self.total_squares / self.length
+    trailing = self.window.popleft()
+    self.total -= trailing
+    self.total_squares -= trailing * trailing
+    mean_squares -= middle * middle
+    deviation = (np.sqrt(mean_squares) if mean_squares >= 0.00000000000001 else 0.0) * self.std
+    return middle - deviation, middle, middle + deviation
+
+
+# TA-Lib MFI (circular buffer of the positive/negative money flows)
+# ---------------------------------------------------------------------------------------------
+class MFIState:
+  def __init__(self, length: int):
+    self.length = length
+    self.flows = deque()
+    self.previous = None
+    self.positive = 0.0
+    self.negative = 0.0
+
+  def step(self, high: float, low: float, close: float, volume: float) -> float:
+    typical = high
+    typical += low
+    typical += close
+    typical /= 3.0
+    if self.previous is None:
+      self.previous = typical
+      return np.nan
+    if len(self.flows) == self.length:
+      positive, negative = self.flows.popleft()
+      self.positive -= positive
+      self.negative -= negative
+    diff = typical - self.previous
+    self.previous = typical
+    flow = typical * volume
+    if diff < 0:
+      self.flows.append((0.0, flow))
+      self.negative += flow
+    elif diff > 0:
+      self.flows.append((flow, 0.0))
+      self.positive += flow
+    else:
+      self.flows.append((0.0, 0.0))
+    if len(self.flows) < self.length:
+      return np.nan
+    total = self.positive + self.negative
+    if total < 1.0:
+      return 0.0
+    return 100.0 * (self.positive / total)
+
+
+# TA-Lib OBV
+# ---------------------------------------------------------------------------------------------
+class OBVState:
+  def __init__(self):
+    self.previous = None
+    self.value = 0.0
+
+  def step(self, close: float, volume: float) -> float:
+    if self.previous is None:
+      self.value = volume
+    elif close > self.previous:
+      self.value += volume
+    elif close < self.previous:
+      self.value -= volume
+    self.previous = close
+    return self.value
+
+
+# Rolling window helpers, computed for the last row only
+# ---------------------------------------------------------------------------------------------
+def _willr(high, low, close, i: int, length: int) -> float:
+  if i < length - 1:
+    return np.nan
+  highest = high[i - length + 1 : i + 1].max()
+  lowest = low[i - length + 1 : i + 1].min()
+  diff = (highest - lowest) / (-100.0)
+  if diff != 0.0:
+    return (highest - close[i]) / diff
+  return 0.0
+
+
+def _aroon(high, low, i: int, length: int) -> tuple:
+  if i < length:
+    return np.nan, np.nan
+  factor = 100.0 / length
+  # TA-Lib keeps the most recent extreme on ties
+  high_age = int(np.argmax(high[i - length : i + 1][::-1]))
+  low_age = int(np.argmin(low[i - length : i + 1][::-1]))
+  return factor * (length - high_age), factor * (length - low_age)
+
+
+def _roc(close, i: int, length: int) -> float:
+  if i < length:
+    return np.nan
+  previous = close[i - length]
+  if previous != 0.0:
+    return ((close[i] / previous) - 1.0) * 100.0
+  return 0.0
+
+
+def _roc_mean(close, i: int, length: int, window: int) -> float:
+  if i < length + window - 1:
+    return np.nan
+  current = close[i - window + 1 : i + 1]
+  previous = close[i - window + 1 - length : i + 1 - length]
+  with np.errstate(divide="ignore", invalid="ignore"):
+    roc = np.where(previous != 0.0, ((current / previous) - 1.0) * 100.0, 0.0)
+  return roc.sum() / window
+
+
+def _rolling(values, i: int, window: int, func) -> float:
+  if i < window - 1:
+    return np.nan
+  return func(values[i - window + 1 : i + 1])
+
+
+# Incremental Indicators
+# ---------------------------------------------------------------------------------------------
+class IncrementalIndicators:
+  """
+  Indicator state of one pair, for the columns listed in BASE_TF_5M_COLUMNS.
+
+  :param resync_candles: Number of incremental candles before a full recompute is requested.
+  :param verify_rows: Number of trailing rows compared against the full path when seeding.
+  """
+
+  # Tolerance of the seed verification, TA-Lib builds differ in the last digits
+  rtol = 1e-6
+  atol = 1e-6
+
+  def __init__(self, resync_candles: int = 288, verify_rows: int = 200):
+    self.resync_candles = resync_candles
+    self.verify_rows = verify_rows
+    self.verified = False
+    self.mismatched_columns = []
+    self.last_date = None
+    self.updates = 0
+    self.outputs = {}
+    self._rsi = {length: RSIState(length) for length in (3, 4, 14, 20)}
+    self._ema = {length: EMAState(length) for length in (3, 9, 12, 16, 20, 26, 50, 200)}
+    self._sma = {length: SMAState(length) for length in (16, 30)}
+    self._bbands = BBandsState(20, 2.0)
+    self._mfi = MFIState(14)
+    self._obv = OBVState()
+    self._stochrsi_k = SMAState(3)
+    self._stochrsi_d = SMAState(3)
+    self._ad = deque(maxlen=20)
+    # Restored from a snapshot: dates and OHLCV of the rows of outputs, checked on the next update
+    self.candles = None
+
+  def seed(self, df: DataFrame) -> bool:
+    """
+    Builds the state from a frame already populated by the full (pandas_ta) path.
+
+    :param df: The analyzed frame, with the OHLCV and the BASE_TF_5M_COLUMNS columns.
+    :return bool: True if the state reproduces the frame columns and can be used.
+    """
+    arrays = self._arrays(df)
+    length = len(df)
+    columns = {column: np.full(length, np.nan) for column in BASE_TF_5M_COLUMNS}
+    with np.errstate(divide="ignore", invalid="ignore"):
+      for i in range(length):
+        self._step(i, arrays, columns)
+
+    start = max(0, length - self.verify_rows)
+    self.mismatched_columns = [
+      column
+      for column in BASE_TF_5M_COLUMNS
+      if not np.allclose(
+        columns[column][start:],
+        df[column].to_numpy(dtype=np.float64)[start:],
+        rtol=self.rtol,
+        atol=self.atol,
+        equal_nan=True,
+      )
+    ]
+    self.verified = (length > 0) and not self.mismatched_columns
+    # Keep the full path values for the rows that are already known
+    self.outputs = {column: df[column].to_numpy(dtype=np.float64, copy=True) for column in BASE_TF_5M_COLUMNS}
+    self.last_date = df["date"].iat[-1] if length > 0 else None
+    self.updates = 0
+    return self.verified
+
+  def update(self, df: DataFrame) -> Optional[dict]:
+    """
+    Computes the indicator columns for a frame that only appended candles since the last call.
+
+    :param df: The new frame (OHLCV).
+    :return dict: Column name to values (aligned with df), or None when a full recompute is needed.
+    """
+    if not self.verified or self.last_date is None:
+      return None
+    dates = df["date"]
+    pos = int(dates.searchsorted(self.last_date))
+    if pos >= len(df) or dates.iat[pos] != self.last_date:
+      return None
+    known_rows = pos + 1
+    offset = len(self.outputs[BASE_TF_5M_COLUMNS[0]]) - known_rows
+    if offset < 0:
+      return None
+    if self.candles is not None:
+      if not self._same_candles(df, known_rows, offset):
+        return None
+      self.candles = None
+    new_rows = len(df) - known_rows
+    if (self.updates + new_rows) > self.resync_candles:
+      return None
+
+    arrays = self._arrays(df)
+    columns = {}
+    for column in BASE_TF_5M_COLUMNS:
+      values = np.empty(len(df))
+      values[:known_rows] = self.outputs[column][offset:]
+      columns[column] = values
+    with np.errstate(divide="ignore", invalid="ignore"):
+      if offset > 0:
+        self._rebase_obv(arrays, columns)
+      for i in range(known_rows, len(df)):
+        self._step(i, arrays, columns)
+      if offset > 0:
+        self._rebase_ema_200(arrays, columns)
+
+    self.outputs = columns
+    self.last_date = dates.iat[-1]
+    self.updates += new_rows
+    return {column: values.copy() for column, values in columns.items()}
+
+  def state(self) -> dict:
+    """Returns the state of the recursions (JSON serializable), see restore()."""
+    return {
+      "last_date": None if self.last_date is None else self.last_date.isoformat(),
+      "updates": self.updates,
+      "recursions": {name: _recursion_state(state) for name, state in self._recursions().items()},
+      "ad": list(self._ad),
+    }
+
+  def restore(self, state: dict, outputs: dict, candles: np.ndarray) -> None:
+    """
+    Restores a verified state saved with state(), the next update() only accepts a frame with the same
+    candles.
+
+    :param state: The saved state().
+    :param outputs: Column name to values, of the BASE_TF_5M_COLUMNS columns at the time of the state.
+    :param candles: Dates (epoch seconds) and OHLCV of the rows of outputs, array of shape (6, rows).
+    """
+    for name, recursion in self._recursions().items():
+      _restore_recursion(recursion, state["recursions"][name])
+    self._ad.extend(state["ad"])
+    self.outputs = outputs
+    self.candles = candles
+    self.last_date = Timestamp(state["last_date"])
+    self.updates = state["updates"]
+    self.verified = True
+
+  def _recursions(self) -> dict:
+    return {
+      **{f"RSI_{length}": state for length, state in self._rsi.items()},
+      **{f"EMA_{length}": state for length, state in self._ema.items()},
+      **{f"SMA_{length}": state for length, state in self._sma.items()},
+      "BBANDS": self._bbands,
+      "MFI": self._mfi,
+      "OBV": self._obv,
+      "STOCHRSIk": self._stochrsi_k,
+      "STOCHRSId": self._stochrsi_d,
+    }
+
+  def _same_candles(self, df: DataFrame, known_rows: int, offset: int) -> bool:
+    # The rows known by the state, up to verify_rows, are the same candles in the frame
+    start = max(0, known_rows - self.verify_rows)
+    candles = self.candles[:, offset + start : offset + known_rows]
+    return np.array_equal(candles[0], epoch_seconds(df["date"].iloc[start:known_rows])) and all(
+      np.array_equal(candles[row], array[start:known_rows], equal_nan=True)
+      for row, array in enumerate(self._arrays(df), 1)
+    )
+
+  @staticmethod
+  def _arrays(df: DataFrame) -> tuple:
+    return tuple(df[column].to_numpy(dtype=np.float64) for column in ("open", "high", "low", "close", "volume"))
+
+  def _rebase_obv(self, arrays: tuple, columns: dict):
+    # OBV starts from the volume of the first candle of the frame, so it moves when old candles
+    # drop out of the frame
+    shift = arrays[4][0] - columns["OBV"][0]
+    obv = columns["OBV"]
+    obv += shift
+    self._obv.value += shift
+    previous = np.roll(obv, 1)
+    previous[0] = np.nan
+    columns["OBV_change_pct"][:] = ((obv - previous) / abs(previous)) * 100.0
+
+  def _rebase_ema_200(self, arrays: tuple, columns: dict):
+    # EMA_200 is seeded with the SMA of the first 200 candles of the frame, so it moves (slowly)
+    # when old candles drop out of the frame: recomputed as the full path does, and the recursion
+    # goes on from its last value
+    close = arrays[3]
+    ema = talib.EMA(close, 200)
+    state = self._ema[200]
+    if len(close) >= state.length:
+      state.count = state.length
+      state.value = ema[-1]
+    else:
+      state.count = len(close)
+      state.total = close.sum()
+      state.value = np.nan
+    columns["EMA_200"][:] = np.nan_to_num(ema, nan=0.0)
+
+  def _step(self, i: int, arrays: tuple, columns: dict):
+    open_, high, low, close, volume = arrays
+    c = close[i]
+
+    # RSI
+    for length, state in self._rsi.items():
+      columns[f"RSI_{length}"][i] = state.step(c)
+    for length in (3, 14):
+      rsi = columns[f"RSI_{length}"]
+      previous = rsi[i - 1] if i > 0 else np.nan
+      columns[f"RSI_{length}_change_pct"][i] = ((rsi[i] - previous) / previous) * 100.0
+    # EMA
+    for length, state in self._ema.items():
+      columns[f"EMA_{length}"][i] = state.step(c)
+    if np.isnan(columns["EMA_200"][i]):
+      columns["EMA_200"][i] = 0.0
+    # SMA
+    for length, state in self._sma.items():
+      columns[f"SMA_{length}"][i] = state.step(c)
+    # BB 20 - STD2
+    lower, middle, upper = self._bbands.step(c)
+    columns["BBL_20_2.0"][i] = lower
+    columns["BBM_20_2.0"][i] = middle
+    columns["BBU_20_2.0"][i] = upper
+    columns["BBB_20_2.0"][i] = 100 * (upper - lower) / middle
+    columns["BBP_20_2.0"][i] = _non_zero(c - lower) / _non_zero(upper - lower)
+    # MFI
+    columns["MFI_14"][i] = self._mfi.step(high[i], low[i], c, volume[i])
+    # CMF
+    ad = 2 * c - (high[i] + low[i])
+    ad *= volume[i] / _non_zero(high[i] - low[i])
+    self._ad.append(ad)
+    if i >= 19:
+      columns["CMF_20"][i] = np.sum(self._ad) / volume[i - 19 : i + 1].sum()
+    else:
+      columns["CMF_20"][i] = np.nan
+    # Williams %R
+    columns["WILLR_14"][i] = _willr(high, low, close, i, 14)
+    columns["WILLR_480"][i] = _willr(high, low, close, i, 480)
+    # AROON
+    columns["AROONU_14"][i], columns["AROOND_14"][i] = _aroon(high, low, i, 14)
+    # Stochastic RSI
+    rsi_14 = columns["RSI_14"]
+    stoch = np.nan
+    if i >= 13:
+      window = rsi_14[i - 13 : i + 1]
+      if not np.isnan(window).any():
+        lowest = window.min()
+        stoch = 100 * (rsi_14[i] - lowest)
+        stoch /= _non_zero(window.max() - lowest)
+    k = self._stochrsi_k.step(stoch)
+    columns["STOCHRSIk_14_14_3_3"][i] = k
+    columns["STOCHRSId_14_14_3_3"][i] = self._stochrsi_d.step(k)
+    # KST
+    kst = 100 * (
+      _roc_mean(close, i, 10, 10)
+      + 2 * _roc_mean(close, i, 15, 10)
+      + 3 * _roc_mean(close, i, 20, 10)
+      + 4 * _roc_mean(close, i, 30, 15)
+    )
+    columns["KST_10_15_20_30_10_10_10_15"][i] = kst
+    columns["KSTs_9"][i] = _rolling(columns["KST_10_15_20_30_10_10_10_15"], i, 9, lambda w: w.sum() / 9)
+    # OBV
+    obv = self._obv.step(c, volume[i])
+    columns["OBV"][i] = obv
+    previous_obv = columns["OBV"][i - 1] if i > 0 else np.nan
+    columns["OBV_change_pct"][i] = ((obv - previous_obv) / abs(previous_obv)) * 100.0
+    # ROC
+    columns["ROC_2"][i] = _roc(close, i, 2)
+    columns["ROC_9"][i] = _roc(close, i, 9)
+    # Candle change
+    columns["change_pct"][i] = (c - open_[i]) / open_[i] * 100.0
+    # Close max
+    columns["close_max_48"][i] = _rolling(close, i, 48, np.max)
+    # Number of empty candles
+    columns["num_empty_288"][i] = _rolling(volume, i, 288, lambda w: float((w <= 0).sum()))
@@ -0,0 +1,228 @@
+"""
+Fused indicator kernel.
+
+Computes a declared set of indicators for a frame in a single call, on the raw NumPy arrays of the
+frame, instead of one pandas_ta call per indicator. Intermediates are shared between the
+indicators: one RSI per length (also feeding STOCHRSI), one ROC per length (shared by ROC and KST),
+one BBANDS pass for the five BB columns of a length.
+
+The results are the same as the pandas_ta ones: the recursive indicators use the same TA-Lib
+functions pandas_ta calls when TA-Lib is installed, and the rolling sums/means use pandas, like
+pandas_ta does.
+
+The indicator set is a dict of family name to the parameters of each instance, for example:
+
+  {
+    "rsi": (3, 14),
+    "ema": (12, 200),
+    "bbands": ((20, 2.0),),
+    "stochrsi": ((14, 14, 3, 3),),
+    "fillna": {"EMA_200": 0.0},
+  }
+"""
+
+import sys
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import talib
+from pandas import DataFrame
+
+
+def _non_zero_range(values: np.ndarray) -> np.ndarray:
+  # Same as pandas_ta non_zero_range(), on the whole series
+  if (values == 0.0).any():
+    return values + sys.float_info.epsilon
+  return values
+
+
+def _sma(values: np.ndarray, length: int) -> np.ndarray:
+  # TA-Lib skips the leading NaNs by itself, but refuses an input without any valid value
+  if np.isnan(values).all():
+    return np.full(len(values), np.nan)
+  return talib.SMA(values, length)
+
+
+class _Arrays:
+  """Input arrays of the frame and the intermediates shared between the indicators."""
+
+  def __init__(self, df: DataFrame):
+    self.open = df["open"].to_numpy(dtype=np.float64)
+    self.high = df["high"].to_numpy(dtype=np.float64)
+    self.low = df["low"].to_numpy(dtype=np.float64)
+    self.close = df["close"].to_numpy(dtype=np.float64)
+    self.volume = df["volume"].to_numpy(dtype=np.float64)
+    self._cache = {}
+
+  def cached(self, key: tuple, func):
+    if key not in self._cache:
+      self._cache[key] = func()
+    return self._cache[key]
+
+  def rsi(self, length: int) -> np.ndarray:
+    return self.cached(("rsi", length), lambda: talib.RSI(self.close, length))
+
+  def roc(self, length: int) -> np.ndarray:
+    return self.cached(("roc", length), lambda: talib.ROC(self.close, length))
+
+
+# Indicator families
+# ---------------------------------------------------------------------------------------------
+def _rsi(arrays: _Arrays, length: int) -> dict:
+  return {f"RSI_{length}": arrays.rsi(length)}
+
+
+def _ema(arrays: _Arrays, length: int) -> dict:
+  return {f"EMA_{length}": talib.EMA(arrays.close, length)}
+
+
+def _sma_close(arrays: _Arrays, length: int) -> dict:
+  return {f"SMA_{length}": talib.SMA(arrays.close, length)}
+
+
+def _bbands(arrays: _Arrays, params: tuple) -> dict:
+  length, std = params
+  upper, middle, lower = talib.BBANDS(arrays.close, length, std, std, 0)
+  suffix = f"{length}_{float(std)}"
+  return {
+    f"BBL_{suffix}": lower,
+    f"BBM_{suffix}": middle,
+    f"BBU_{suffix}": upper,
+    f"BBB_{suffix}": 100 * (upper - lower) / middle,
+    f"BBP_{suffix}": _non_zero_range(arrays.close - lower) / _non_zero_range(upper - lower),
+  }
+
+
+def _mfi(arrays: _Arrays, length: int) -> dict:
+  return {f"MFI_{length}": talib.MFI(arrays.high, arrays.low, arrays.close, arrays.volume, length)}
+
+
+def _cmf(arrays: _Arrays, length: int) -> dict:
+  ad = 2 * arrays.close - (arrays.high + arrays.low)
+  ad *= arrays.volume / _non_zero_range(arrays.high - arrays.low)
+  ad_sum = pd.Series(ad).rolling(length).sum().to_numpy()
+  volume_sum = pd.Series(arrays.volume).rolling(length).sum().to_numpy()
+  return {f"CMF_{length}": ad_sum / volume_sum}
+
+
+def _willr(arrays: _Arrays, length: int) -> dict:
+  return {f"WILLR_{length}": talib.WILLR(arrays.high, arrays.low, arrays.close, length)}
+
+
+def _aroon(arrays: _Arrays, length: int) -> dict:
+  down, up = talib.AROON(arrays.high, arrays.low, length)
+  return {f"AROONU_{length}": up, f"AROOND_{length}": down}
+
+
+def _stoch(arrays: _Arrays, params: tuple) -> dict:
+  k, smooth_k, d = params
+  lowest = talib.MIN(arrays.low, k)
+  stoch = 100 * (arrays.close - lowest)
+  stoch /= _non_zero_range(talib.MAX(arrays.high, k) - lowest)
+  stoch_k = _sma(stoch, smooth_k)
+  stoch_d = _sma(stoch_k, d)
+  return {f"STOCHk_{k}_{smooth_k}_{d}": stoch_k, f"STOCHd_{k}_{smooth_k}_{d}": stoch_d}
+
+
+def _stochrsi(arrays: _Arrays, params: tuple) -> dict:
+  length, rsi_length, k, d = params
+  rsi = pd.Series(arrays.rsi(rsi_length))
+  lowest = rsi.rolling(length).min().to_numpy()
+  highest = rsi.rolling(length).max().to_numpy()
+  stoch = 100 * (rsi.to_numpy() - lowest)
+  stoch /= _non_zero_range(highest - lowest)
+  stochrsi_k = _sma(stoch, k)
+  stochrsi_d = _sma(stochrsi_k, d)
+  suffix = f"{length}_{rsi_length}_{k}_{d}"
+  return {f"STOCHRSIk_{suffix}": stochrsi_k, f"STOCHRSId_{suffix}": stochrsi_d}
+
+
+def _kst(arrays: _Arrays, params: tuple) -> dict:
+  roc1, roc2, roc3, roc4, sma1, sma2, sma3, sma4, signal = params
+  rocma = [
+    pd.Series(arrays.roc(roc)).rolling(sma).mean()
+    for roc, sma in ((roc1, sma1), (roc2, sma2), (roc3, sma3), (roc4, sma4))
+  ]
+  kst = 100 * (rocma[0] + 2 * rocma[1] + 3 * rocma[2] + 4 * rocma[3])
+  return {
+    f"KST_{roc1}_{roc2}_{roc3}_{roc4}_{sma1}_{sma2}_{sma3}_{sma4}": kst.to_numpy(),
+    f"KSTs_{signal}": kst.rolling(signal).mean().to_numpy(),
+  }
+
+
+def _uo(arrays: _Arrays, params: tuple) -> dict:
+  fast, medium, slow = params
+  return {f"UO_{fast}_{medium}_{slow}": talib.ULTOSC(arrays.high, arrays.low, arrays.close, fast, medium, slow)}
+
+
+def _obv(arrays: _Arrays, enabled: bool) -> dict:
+  return {"OBV": talib.OBV(arrays.close, arrays.volume)} if enabled else {}
+
+
+def _roc(arrays: _Arrays, length: int) -> dict:
+  return {f"ROC_{length}": arrays.roc(length)}
+
+
+def _cci(arrays: _Arrays, length: int) -> dict:
+  return {f"CCI_{length}": talib.CCI(arrays.high, arrays.low, arrays.close, length)}
+
+
+INDICATOR_FAMILIES = {
+  "rsi": _rsi,
+  "ema": _ema,
+  "sma": _sma_close,
+  "bbands": _bbands,
+  "mfi": _mfi,
+  "cmf": _cmf,
+  "willr": _willr,
+  "aroon": _aroon,
+  "stoch": _stoch,
+  "stochrsi": _stochrsi,
+  "kst": _kst,
+  "uo": _uo,
+  "obv": _obv,
+  "roc": _roc,
+  "cci": _cci,
+}
+
+
+# Indicator Kernel
+# ---------------------------------------------------------------------------------------------
+def indicator_kernel_columns(df: DataFrame, indicators: dict, instances: Optional[list] = None) -> dict:
+  """
+  Computes the declared indicator set.
+
+  :param df: Frame with the OHLCV columns.
+  :param indicators: Indicator set, family name to the parameters of each instance.
+  :param instances: Optional list, filled with the (family, parameters, column names) of each
+                    computed instance.
+  :return dict: Column name to values, in the declaration order.
+  """
+  arrays = _Arrays(df)
+  columns = {}
+  with np.errstate(divide="ignore", invalid="ignore"):
+    for family, params in indicators.items():
+      if family == "fillna":
+        continue
+      func = INDICATOR_FAMILIES[family]
+      for param in (params,) if isinstance(params, bool) else params:
+        instance_columns = func(arrays, param)
+        columns.update(instance_columns)
+        if instances is not None:
+          instances.append((family, param, list(instance_columns)))
+  for column, value in indicators.get("fillna", {}).items():
+    columns[column] = np.where(np.isnan(columns[column]), value, columns[column])
+  return columns
+
+
+def indicator_kernel(df: DataFrame, indicators: dict) -> DataFrame:
+  """
+  Returns the frame with the declared indicator set added as columns.
+
+  :param df: Frame with the OHLCV columns.
+  :param indicators: Indicator set, family name to the parameters of each instance.
+  :return DataFrame: A new frame with the indicator columns appended.
+  """
+  columns = indicator_kernel_columns(df, indicators)
+  return pd.concat([df, DataFrame(columns, index=df.index)], axis=1)
@@ -0,0 +1,29 @@
+"""
+Snapshot of the open trades, for the callbacks of a bot loop.
+
+The entry callbacks query the open trades (or their count) on each call: populate_entry_trend() for
+every pair, confirm_trade_entry() and its mode checks for every entry. An OpenTrades snapshot is
+taken once per bot loop, with the counts the callbacks need.
+"""
+
+
+def mode_trade(enter_tag, tags) -> bool:
+  """True if all the entry tags of a trade are tags of the mode (same as the checks of the strategy)."""
+  return enter_tag is not None and all(tag in tags for tag in enter_tag.split())
+
+
+class OpenTrades:
+  """Open trades, with their count by direction and by mode."""
+
+  def __init__(self, trades: list, modes: dict = None):
+    """
+    :param trades: Open trades.
+    :param modes: Mode name -> entry tags of the mode, the modes to count the trades of.
+    """
+    self.trades = list(trades)
+    self.count = len(self.trades)
+    self.long_count = sum(1 for trade in self.trades if trade.trade_direction == "long")
+    self.short_count = sum(1 for trade in self.trades if trade.trade_direction == "short")
+    self.mode_counts = {
+      name: sum(1 for trade in self.trades if mode_trade(trade.enter_tag, tags)) for name, tags in (modes or {}).items()
+    }
@@ -0,0 +1,128 @@
+"""
+Per-stage profiling of the indicator pipeline.
+
+The durations are recorded per stage, pair and timeframe in rolling windows, summarized as
+percentiles (p50/p95/p99) and dumped to a JSON file. Recording can be switched on and off at runtime
+with a small JSON control file ({"enabled": true, "dump_interval": 300}), checked once per bot loop.
+"""
+
+import json
+import os
+import threading
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+
+
+def histogram(samples) -> dict:
+  """Returns the count, percentiles, max and total (in seconds) of the samples."""
+  values = np.fromiter(samples, dtype=np.float64)
+  p50, p95, p99 = np.percentile(values, [50, 95, 99])
+  return {
+    "count": len(values),
+    "p50": float(p50),
+    "p95": float(p95),
+    "p99": float(p99),
+    "max": float(values.max()),
+    "total": float(values.sum()),
+  }
+
+
+class StageProfiler:
+  """
+  Rolling per stage, pair and timeframe durations.
+
+  Safe to record from the threads calculating the informative timeframes concurrently.
+  """
+
+  def __init__(self, enabled: bool = False, window: int = 500, dump_interval: float = 300.0):
+    self.enabled = enabled
+    # Number of durations kept per stage, pair and timeframe
+    self.window = window
+    # Seconds between two dumps
+    self.dump_interval = dump_interval
+    self.last_dump = None
+    self._samples = {}
+    self._lock = threading.Lock()
+    self._control_mtime = None
+
+  def record(self, stage: str, pair: str, timeframe: str, seconds: float) -> None:
+    if not self.enabled:
+      return
+    key = (stage, pair, timeframe)
+    with self._lock:
+      samples = self._samples.get(key)
+      if samples is None:
+        samples = self._samples[key] = deque(maxlen=self.window)
+      samples.append(seconds)
+
+  def clear(self) -> None:
+    with self._lock:
+      self._samples.clear()
+
+  def summary(self) -> dict:
+    """
+    Returns the histograms, per stage and timeframe, of all the pairs and of each pair.
+
+    {"informative_indicators": {"1h": {"all": {...}, "pairs": {"BTC/USDT": {...}}}}}
+    """
+    with self._lock:
+      samples = {key: list(values) for key, values in self._samples.items()}
+    grouped = {}
+    for (stage, pair, timeframe), values in samples.items():
+      grouped.setdefault(stage, {}).setdefault(timeframe, {})[pair] = values
+    summary = {}
+    for stage, timeframes in grouped.items():
+      for timeframe, pairs in timeframes.items():
+        summary.setdefault(stage, {})[timeframe] = {
+          "all": histogram(value for values in pairs.values() for value in values),
+          "pairs": {pair: histogram(values) for pair, values in sorted(pairs.items())},
+        }
+    return summary
+
+  def dump(self, path: Path, now: float) -> None:
+    """Writes the summary to the JSON file (replaced atomically)."""
+    data = {"timestamp": now, "window": self.window, "stages": self.summary()}
+    temp_path = path.with_name(f"{path.name}.tmp")
+    temp_path.write_text(json.dumps(data, indent=1, sort_keys=True))
+    os.replace(temp_path, path)
+    self.last_dump = now
+
+  def dump_due(self, now: float) -> bool:
+    if not self.enabled:
+      return False
+    if self.last_dump is None:
+      # First dump a full interval after the start
+      self.last_dump = now
+      return False
+    return now - self.last_dump >= self.dump_interval
+
+  def load_control(self, path: Path) -> bool:
+    """
+    Applies the control file, when it changed since the last call.
+
+    :param path: JSON file with the optional "enabled" and "dump_interval" keys.
+    :return bool: True if the control file was (re)loaded.
+    """
+    try:
+      mtime = path.stat().st_mtime
+    except OSError:
+      return False
+    if mtime == self._control_mtime:
+      return False
+    self._control_mtime = mtime
+    try:
+      control = json.loads(path.read_text())
+    except (OSError, ValueError):
+      return False
+    if "dump_interval" in control:
+      self.dump_interval = float(control["dump_interval"])
+    if "enabled" in control:
+      enabled = bool(control["enabled"])
+      if enabled and not self.enabled:
+        # Restart the dump schedule and the windows
+        self.last_dump = None
+        self.clear()
+      self.enabled = enabled
+    return True
@@ -0,0 +1,117 @@
+"""
+Per-trade sums of the filled orders, for the total profit of calc_total_profit().
+
+The total profit of a trade is the profit of its filled orders (their stakes, net of the fees) plus
+the stake of the remaining amount at the exit rate. The order part only changes when an order is
+filled, so it is summed once per fill (in the order of calc_total_profit(), for the same floats) and
+kept per trade: the profit for an exit rate is then O(1) instead of O(orders).
+"""
+
+
+class OrderSums:
+  """Sums of the filled orders of a trade."""
+
+  __slots__ = ("is_short", "fee_close_rate", "total_amount", "total_stake", "orders_profit", "first_entry_cost")
+
+  def total_profit(self, exit_rate: float, funding_fees: float = None) -> tuple:
+    """
+    Returns the total profit in stake, ratio, ratio based on current stake, and ratio based on the first
+    entry stake, same as calc_total_profit().
+
+    :param exit_rate: The exit rate.
+    :param funding_fees: The funding fees of the trade in futures mode, None in spot.
+    """
+    if self.is_short:
+      current_stake = self.total_amount * exit_rate * (1 + self.fee_close_rate)
+      total_profit = self.orders_profit - current_stake
+    else:
+      current_stake = self.total_amount * exit_rate * (1 - self.fee_close_rate)
+      total_profit = self.orders_profit + current_stake
+    if funding_fees is not None:
+      total_profit += funding_fees
+    total_profit_ratio = total_profit / self.total_stake
+    current_profit_ratio = total_profit / current_stake
+    init_profit_ratio = total_profit / self.first_entry_cost
+    return total_profit, total_profit_ratio, current_profit_ratio, init_profit_ratio
+
+
+def order_sums(is_short: bool, filled_entries, filled_exits, fee_open_rate: float, fee_close_rate: float) -> OrderSums:
+  """Returns the sums of the filled orders (of a trade with at least one filled entry)."""
+  total_amount = 0.0
+  total_stake = 0.0
+  total_profit = 0.0
+  for entry_order in filled_entries:
+    if is_short:
+      entry_stake = entry_order.safe_filled * entry_order.safe_price * (1 - fee_open_rate)
+      total_amount += entry_order.safe_filled
+      total_stake += entry_stake
+      total_profit += entry_stake
+    else:
+      entry_stake = entry_order.safe_filled * entry_order.safe_price * (1 + fee_open_rate)
+      total_amount += entry_order.safe_filled
+      total_stake += entry_stake
+      total_profit -= entry_stake
+  for exit_order in filled_exits:
+    if is_short:
+      exit_stake = exit_order.safe_filled * exit_order.safe_price * (1 + fee_close_rate)
+      total_amount -= exit_order.safe_filled
+      total_profit -= exit_stake
+    else:
+      exit_stake = exit_order.safe_filled * exit_order.safe_price * (1 - fee_close_rate)
+      total_amount -= exit_order.safe_filled
+      total_profit += exit_stake
+  sums = OrderSums()
+  sums.is_short = is_short
+  sums.fee_close_rate = fee_close_rate
+  sums.total_amount = total_amount
+  sums.total_stake = total_stake
+  sums.orders_profit = total_profit
+  sums.first_entry_cost = filled_entries[0].cost
+  return sums
+
+
+def order_fills(orders) -> tuple:
+  """Identifies filled orders: their count, first and last order (a filled order does not change)."""
+  if not orders:
+    return (0,)
+  return (len(orders), orders[0].order_id, orders[-1].order_id, orders[-1].safe_filled, orders[-1].safe_price)
+
+
+class TradeProfits:
+  """Order sums of the trades, recomputed when a trade has a new filled order."""
+
+  def __init__(self, max_trades: int = 1000):
+    # trade id -> (fills, order sums)
+    self.sums = {}
+    # Above, the sums are cleared (of the closed trades mostly) and recomputed on the next call
+    self.max_trades = max_trades
+    self.hits = 0
+    self.misses = 0
+
+  def order_sums(self, trade, filled_entries, filled_exits, fee_open_rate: float, fee_close_rate: float) -> OrderSums:
+    """
+    Returns the order sums of a trade, see order_sums().
+
+    The filled orders are identified by their count and their first and last order, a filled order does
+    not change (its amount and price are final). The trade is identified by its id, pair and open date
+    (the ids restart with each backtest).
+    """
+    fills = (
+      trade.pair,
+      trade.open_date,
+      trade.is_short,
+      order_fills(filled_entries),
+      order_fills(filled_exits),
+      fee_open_rate,
+      fee_close_rate,
+    )
+    entry = self.sums.get(trade.id)
+    if entry is not None and entry[0] == fills:
+      self.hits += 1
+      return entry[1]
+    self.misses += 1
+    if len(self.sums) >= self.max_trades:
+      self.sums.clear()
+    sums = order_sums(trade.is_short, filled_entries, filled_exits, fee_open_rate, fee_close_rate)
+    self.sums[trade.id] = (fills, sums)
+    return sums
@@ -0,0 +1,213 @@
+"""
+Indicator column pruning.
+
+A static dependency analysis of the strategy source records the dataframe columns read by each
+entry condition, exit function, grind path and derived indicator. The kernel indicator sets are
+then pruned of the indicator instances whose columns are read by nothing enabled.
+
+Only literal column names are seen by the analysis (df["RSI_14"], last_candle["RSI_14"]), which is
+how the strategy reads all its columns. The reads inside informative_<timeframe>_indicators() are
+suffixed with the timeframe, like merge_informative_pair() does with the columns.
+"""
+
+import ast
+import re
+import time
+
+import pandas as pd
+from pandas import DataFrame
+
+from nfi_lib.kernels import indicator_kernel_columns
+
+ENTRY_CONDITION_INDEXES = {
+  "long_entry_condition_index": "long",
+  "short_entry_condition_index": "short",
+}
+
+INFORMATIVE_INDICATORS = re.compile(r"^informative_(\w+)_indicators$")
+
+
+def _literal_columns(node: ast.AST) -> list:
+  if isinstance(node, ast.Constant) and isinstance(node.value, str):
+    return [node.value]
+  if isinstance(node, (ast.List, ast.Tuple)):
+    return [column for element in node.elts for column in _literal_columns(element)]
+  return []
+
+
+def _entry_condition(test: ast.AST):
+  # "if long_entry_condition_index == 1:" -> ("long", 1)
+  if (
+    isinstance(test, ast.Compare)
+    and isinstance(test.left, ast.Name)
+    and test.left.id in ENTRY_CONDITION_INDEXES
+    and len(test.ops) == 1
+    and isinstance(test.ops[0], ast.Eq)
+    and isinstance(test.comparators[0], ast.Constant)
+  ):
+    return ENTRY_CONDITION_INDEXES[test.left.id], test.comparators[0].value
+  return None
+
+
+def _is_kernel_switch(test: ast.AST) -> bool:
+  # "if self.indicator_kernel_enable:", the else branch computes the same columns with pandas_ta
+  return isinstance(test, ast.Attribute) and test.attr == "indicator_kernel_enable"
+
+
+class _ColumnReads(ast.NodeVisitor):
+  def __init__(self, suffix: str):
+    self.suffix = suffix
+    self.reads = set()
+    self.entry_conditions = {}
+
+  def visit_Subscript(self, node: ast.Subscript):
+    if isinstance(node.ctx, ast.Load):
+      self.reads.update(f"{column}{self.suffix}" for column in _literal_columns(node.slice))
+    self.generic_visit(node)
+
+  def visit_If(self, node: ast.If):
+    condition = _entry_condition(node.test)
+    if condition is not None:
+      condition_reads = _ColumnReads(self.suffix)
+      for statement in node.body:
+        condition_reads.visit(statement)
+      self.entry_conditions.setdefault(condition, set()).update(condition_reads.reads)
+      for statement in node.orelse:
+        self.visit(statement)
+    elif _is_kernel_switch(node.test):
+      for statement in node.body:
+        self.visit(statement)
+    else:
+      self.generic_visit(node)
+
+
+class ColumnDependencies:
+  """
+  Dataframe columns read by each function of the strategy, and by each entry condition.
+
+  The entry conditions are the "if long_entry_condition_index == N:" blocks of
+  populate_entry_trend(), their reads are only required when the condition is enabled.
+  """
+
+  def __init__(self):
+    # Function name -> columns read, outside of the entry conditions
+    self.reads = {}
+    # (side, condition index) -> columns read
+    self.entry_conditions = {}
+
+  def add_source(self, source: str, class_names: list) -> None:
+    """
+    Records the reads of the methods of the given classes, and of the module level functions.
+
+    :param source: Source of the strategy module.
+    :param class_names: Names of the strategy classes defined in the module.
+    """
+    tree = ast.parse(source)
+    functions = []
+    for node in tree.body:
+      if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        functions.append(node)
+      elif isinstance(node, ast.ClassDef) and node.name in class_names:
+        functions += [item for item in node.body if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))]
+    for function in functions:
+      match = INFORMATIVE_INDICATORS.match(function.name)
+      function_reads = _ColumnReads(f"_{match.group(1)}" if match else "")
+      function_reads.visit(function)
+      self.reads.setdefault(function.name, set()).update(function_reads.reads)
+      for condition, reads in function_reads.entry_conditions.items():
+        self.entry_conditions.setdefault(condition, set()).update(reads)
+
+  def required_columns(self, long_entry_signal_params: dict, short_entry_signal_params: dict) -> set:
+    """
+    Returns the columns read with the given entry conditions enabled.
+
+    :param long_entry_signal_params: The "long_entry_condition_N_enable" switches.
+    :param short_entry_signal_params: The "short_entry_condition_N_enable" switches.
+    """
+    required = set().union(*self.reads.values())
+    for side, params in (("long", long_entry_signal_params), ("short", short_entry_signal_params)):
+      for condition_key, enabled in params.items():
+        if enabled:
+          required |= self.entry_conditions.get((side, int(condition_key.split("_")[3])), set())
+    return required
+
+
+def prune_indicator_set(indicators: dict, instances: list, required: set, suffix: str = "") -> tuple:
+  """
+  Removes the indicator instances with none of their columns required.
+
+  :param indicators: Indicator set of the kernel.
+  :param instances: The (family, parameters, column names) of each instance of the set.
+  :param required: Required columns, as named in the merged frame.
+  :param suffix: Suffix of the columns in the merged frame ("_1h" for the 1h informative).
+  :return tuple: The pruned indicator set, and the names of the skipped columns.
+  """
+  pruned = {}
+  skipped = []
+  for family, param, columns in instances:
+    if not any(f"{column}{suffix}" in required for column in columns):
+      skipped += columns
+    elif isinstance(param, bool):
+      pruned[family] = param
+    else:
+      pruned[family] = pruned.get(family, ()) + (param,)
+  fillna = {column: value for column, value in indicators.get("fillna", {}).items() if column not in skipped}
+  if fillna:
+    pruned["fillna"] = fillna
+  return pruned, skipped
+
+
+class IndicatorPruner:
+  """
+  Computes the kernel indicator sets without the indicators that are not required.
+
+  The first call for a timeframe computes the full set, once, to find the columns of each
+  instance and to time the full set against the pruned one. The report of the timeframe lists the
+  skipped columns and the time saved per call.
+  """
+
+  def __init__(self, required: set, base_timeframe: str):
+    self.required = required
+    self.base_timeframe = base_timeframe
+    # Timeframe -> pruned indicator set
+    self.plans = {}
+    # Timeframe -> skipped columns, and the full and pruned set durations in seconds
+    self.reports = {}
+
+  def indicator_kernel(self, df: DataFrame, timeframe: str, indicators: dict) -> DataFrame:
+    """
+    Returns the frame with the pruned indicator set of the timeframe added as columns.
+
+    :param df: Frame with the OHLCV columns.
+    :param timeframe: Timeframe of the frame.
+    :param indicators: Full indicator set of the timeframe.
+    """
+    plan = self.plans.get(timeframe)
+    if plan is None:
+      instances = []
+      tik = time.perf_counter()
+      indicator_kernel_columns(df, indicators, instances)
+      tok = time.perf_counter()
+      suffix = "" if timeframe == self.base_timeframe else f"_{timeframe}"
+      plan, skipped = prune_indicator_set(indicators, instances, self.required, suffix)
+      columns = indicator_kernel_columns(df, plan)
+      self.reports[timeframe] = {
+        "skipped": skipped,
+        "full_seconds": tok - tik,
+        "pruned_seconds": time.perf_counter() - tok,
+      }
+      self.plans[timeframe] = plan
+    else:
+      columns = indicator_kernel_columns(df, plan)
+    return pd.concat([df, DataFrame(columns, index=df.index)], axis=1)
+
+  def report(self, timeframe: str) -> str:
+    """Returns a one line summary of the pruning of the timeframe."""
+    report = self.reports[timeframe]
+    skipped = ", ".join(report["skipped"]) if report["skipped"] else "none"
+    saved = report["full_seconds"] - report["pruned_seconds"]
+    return (
+      f"{timeframe}: skipped {len(report['skipped'])} indicator columns ({skipped}), "
+      f"{report['full_seconds'] * 1000:0.2f} ms -> {report['pruned_seconds'] * 1000:0.2f} ms per call "
+      f"(saved {saved * 1000:0.2f} ms)"
+    )
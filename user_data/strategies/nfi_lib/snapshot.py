@@ -0,0 +1,116 @@
+"""
+Warm-start snapshot of the incremental indicators.
+
+After a restart, the 5m indicators of every pair are calculated again on all the startup candles
+before the first decision. The snapshot keeps, per pair, the state of the incremental indicators
+(IncrementalIndicators.state()) and the candles and indicator values it was calculated on, in a
+directory of user_data_dir:
+
+  snapshot.json     version, timeframe, and per pair: file, rows, last date and state
+  <pair>.npy        float64 array of shape (6 + columns, rows): dates (epoch seconds), OHLCV, and
+                    the BASE_TF_5M_COLUMNS values
+
+The arrays are memory-mapped on load. A restored state is only used if the frame of its first update
+has the same candles, then only the candles after the snapshot are calculated (see
+IncrementalIndicators.update()).
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+
+import numpy as np
+
+from nfi_lib.incremental import BASE_TF_5M_COLUMNS, IncrementalIndicators, epoch_seconds
+
+SNAPSHOT_VERSION = 1
+
+CANDLE_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+def pair_file_name(pair: str) -> str:
+  return re.sub(r"[^A-Za-z0-9]", "_", pair) + ".npy"
+
+
+class IndicatorSnapshot:
+  """Snapshot of the incremental indicators of the pairs, in a directory."""
+
+  def __init__(self, path: Path, timeframe: str):
+    """
+    :param path: Directory of the snapshot.
+    :param timeframe: Timeframe of the indicators, a snapshot of another timeframe is not loaded.
+    """
+    self.path = Path(path)
+    self.timeframe = timeframe
+
+  def save(self, engines: dict, frames: dict) -> int:
+    """
+    Writes the snapshot of the verified states (replaced atomically, per file).
+
+    :param engines: Pair -> IncrementalIndicators.
+    :param frames: Pair -> the analyzed frame the state was last updated with (OHLCV and the
+                   BASE_TF_5M_COLUMNS values).
+    :return int: Number of pairs saved.
+    """
+    self.path.mkdir(parents=True, exist_ok=True)
+    pairs = {}
+    for pair, engine in engines.items():
+      df = frames.get(pair)
+      if not engine.verified or engine.last_date is None or df is None or len(df) == 0:
+        continue
+      if df["date"].iat[-1] != engine.last_date or len(df) != len(engine.outputs[BASE_TF_5M_COLUMNS[0]]):
+        # Not the frame of the state
+        continue
+      array = np.empty((1 + len(CANDLE_COLUMNS) + len(BASE_TF_5M_COLUMNS), len(df)))
+      array[0] = epoch_seconds(df["date"])
+      for row, column in enumerate(CANDLE_COLUMNS, 1):
+        array[row] = df[column].to_numpy(dtype=np.float64)
+      for row, column in enumerate(BASE_TF_5M_COLUMNS, 1 + len(CANDLE_COLUMNS)):
+        array[row] = engine.outputs[column]
+      file_name = pair_file_name(pair)
+      temp_path = self.path / f"{file_name}.tmp"
+      with open(temp_path, "wb") as file:
+        np.save(file, array)
+      os.replace(temp_path, self.path / file_name)
+      pairs[pair] = {"file": file_name, "rows": len(df), "state": engine.state()}
+    data = {"version": SNAPSHOT_VERSION, "timeframe": self.timeframe, "columns": BASE_TF_5M_COLUMNS, "pairs": pairs}
+    index_path = self.path / "snapshot.json"
+    temp_path = index_path.with_name(f"{index_path.name}.tmp")
+    temp_path.write_text(json.dumps(data))
+    os.replace(temp_path, index_path)
+    return len(pairs)
+
+  def load(self, resync_candles: int = 288) -> dict:
+    """
+    Reads the snapshot.
+
+    :param resync_candles: See IncrementalIndicators.
+    :return dict: Pair -> restored IncrementalIndicators, empty without a valid snapshot.
+    """
+    try:
+      data = json.loads((self.path / "snapshot.json").read_text())
+    except (OSError, ValueError):
+      return {}
+    if (
+      data.get("version") != SNAPSHOT_VERSION
+      or data.get("timeframe") != self.timeframe
+      or data.get("columns") != BASE_TF_5M_COLUMNS
+    ):
+      return {}
+    engines = {}
+    for pair, entry in data["pairs"].items():
+      try:
+        array = np.load(self.path / entry["file"], mmap_mode="r")
+      except (OSError, ValueError):
+        continue
+      if array.shape != (1 + len(CANDLE_COLUMNS) + len(BASE_TF_5M_COLUMNS), entry["rows"]):
+        # Replaced by a later save, without its index
+        continue
+      engine = IncrementalIndicators(resync_candles=resync_candles)
+      outputs = {column: array[row] for row, column in enumerate(BASE_TF_5M_COLUMNS, 1 + len(CANDLE_COLUMNS))}
+      engine.restore(entry["state"], outputs, array[: 1 + len(CANDLE_COLUMNS)])
+      if array[0, -1] != engine.last_date.timestamp():
+        continue
+      engines[pair] = engine
+    return engines
@@ -0,0 +1,85 @@
+"""
+Modes of the entry tags.
+
+The callbacks classify a trade by its entry tags on every call: enter_tag.split(), then scans of
+the tag lists of the modes (concatenated for the combined checks, a new list each time). TagModes
+parses each entry tag string once into EntryTags, with the modes of each tag as a bitmask, and the
+checks become bit operations.
+"""
+
+from functools import reduce
+from operator import or_
+
+# Above, the parsed entry tags are cleared and parsed again on use
+MAX_PARSED_TAGS = 10000
+
+
+class EntryTags(tuple):
+  """Entry tags of a trade (a tuple of the tags), with the mode checks."""
+
+  def __new__(cls, tags, tag_modes: "TagModes"):
+    self = super().__new__(cls, tags)
+    self.tag_modes = tag_modes
+    self.tag_masks = tuple(tag_modes.tag_masks.get(tag, 0) for tag in self)
+    self.any_modes = reduce(or_, self.tag_masks, 0)
+    # mask -> all the tags in the modes of the mask
+    self.all_modes = {}
+    return self
+
+  def __reduce__(self):
+    return (EntryTags, (tuple(self), self.tag_modes))
+
+  def any(self, *modes: str) -> bool:
+    """True if a tag is a tag of one of the modes."""
+    return bool(self.any_modes & self.tag_modes.mask(modes))
+
+  def all(self, *modes: str) -> bool:
+    """True if all the tags are tags of the modes (or there is no tag)."""
+    mask = self.tag_modes.mask(modes)
+    result = self.all_modes.get(mask)
+    if result is None:
+      result = self.all_modes[mask] = all(tag_mask & mask for tag_mask in self.tag_masks)
+    return result
+
+  def in_mode(self, mode: str, *combined_modes: str) -> bool:
+    """True if all the tags are tags of the mode, or some are and the others are tags of the combined modes."""
+    return self.all(mode) or (self.any(mode) and self.all(mode, *combined_modes))
+
+
+class TagModes:
+  """Entry tags of the modes, and the parsed entry tags."""
+
+  def __init__(self, modes: dict):
+    """
+    :param modes: Mode name -> entry tags of the mode.
+    """
+    self.modes = {name: 1 << position for position, name in enumerate(modes)}
+    # tag -> mask of its modes
+    self.tag_masks = {}
+    for name, tags in modes.items():
+      for tag in tags:
+        self.tag_masks[tag] = self.tag_masks.get(tag, 0) | self.modes[name]
+    # mode names -> mask
+    self.masks = {}
+    # entry tag -> EntryTags
+    self.parsed = {}
+
+  def __getstate__(self):
+    state = self.__dict__.copy()
+    state["parsed"] = {}
+    return state
+
+  def mask(self, modes: tuple) -> int:
+    mask = self.masks.get(modes)
+    if mask is None:
+      mask = self.masks[modes] = reduce(or_, (self.modes[name] for name in modes), 0)
+    return mask
+
+  def parse(self, enter_tag: str) -> EntryTags:
+    """Returns the EntryTags of an entry tag string (tags separated by whitespace)."""
+    entry_tags = self.parsed.get(enter_tag)
+    if entry_tags is None:
+      if len(self.parsed) >= MAX_PARSED_TAGS:
+        self.parsed.clear()
+      entry_tags = self.parsed[enter_tag] = EntryTags(enter_tag.split(), self)
+    return entry_tags
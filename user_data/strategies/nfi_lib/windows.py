@@ -0,0 +1,165 @@
+"""
+Candle window helpers computed over a whole column at once, on sliding window views.
+
+The module level helpers of NostalgiaForInfinityX5 (and qtpylib.heikinashi() in Strategy001) work a
+row or a frame copy at a time: is_support() and is_resistance() are rolling().apply() callbacks
+called in Python for each window, heikin_ashi() copies the OHLC frame before its EMAs and fillna()
+passes, pivot_points() shifts the HLC again for each mode, and qtpylib.heikinashi() sets each Heikin
+Ashi open in a Python loop. The functions here give the same results from the NumPy arrays:
+
+  rolling_support(df["low"], 5)       df["low"].rolling(5).apply(is_support, raw=True)
+  rolling_resistance(df["high"], 5)   df["high"].rolling(5).apply(is_resistance, raw=True)
+  heikin_ashi(df)                     heikin_ashi(df)
+  heikinashi(df)                      qtpylib.heikinashi(df)
+  pivot_points(df, mode)              pivot_points(df, mode)
+
+The windows are numpy.lib.stride_tricks.sliding_window_view() views, without copies of the column.
+"""
+
+import numpy as np
+import pandas as pd
+import talib
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Candles of the Heikin Ashi open window: the weight of older candles is below the float64 precision
+HEIKINASHI_WINDOW = 64
+
+HEIKINASHI_WEIGHTS = 0.5 ** np.arange(HEIKINASHI_WINDOW, 0, -1)
+
+
+def _values(column) -> np.ndarray:
+  return np.asarray(column, dtype=np.float64)
+
+
+def _filled(values: np.ndarray) -> np.ndarray:
+  # fillna(0)
+  return np.where(np.isnan(values), 0.0, values)
+
+
+def _shifted(values: np.ndarray) -> np.ndarray:
+  # Series.shift(1)
+  return np.concatenate(([np.nan], values[:-1])) if len(values) else values
+
+
+def _rolling_result(window_values: np.ndarray, values: np.ndarray, window: int, center: bool) -> np.ndarray:
+  # Aligned like rolling(window, center=center): NaN for the windows not full, or with a NaN
+  result = np.full(len(values), np.nan)
+  window_values = np.where(sliding_window_view(np.isnan(values), window).any(axis=1), np.nan, window_values)
+  end = len(values) - ((window - 1) // 2 if center else 0)
+  result[end - len(window_values) : end] = window_values
+  return result
+
+
+def _rolling_turn(column, window: int, center: bool, falling_first: bool) -> np.ndarray:
+  if window < 2:
+    raise ValueError(f"Window of at least 2 candles, not {window}.")
+  values = _values(column)
+  if len(values) < window:
+    return np.full(len(values), np.nan)
+  falling = sliding_window_view(values[:-1] > values[1:], window - 1)
+  rising = sliding_window_view(values[:-1] < values[1:], window - 1)
+  first, second = (falling, rising) if falling_first else (rising, falling)
+  half = window // 2
+  turn = first[:, :half].all(axis=1) & second[:, half:].all(axis=1)
+  return _rolling_result(turn.astype(np.float64), values, window, center)
+
+
+def rolling_support(column, window: int, center: bool = False) -> np.ndarray:
+  """
+  Range midpoint acts as support, for each window: falling to the midpoint, then rising.
+
+  :return np.ndarray: 1.0 or 0.0 for each window, NaN for the first candles (and windows with a NaN).
+  """
+  return _rolling_turn(column, window, center, falling_first=True)
+
+
+def rolling_resistance(column, window: int, center: bool = False) -> np.ndarray:
+  """
+  Range midpoint acts as resistance, for each window: rising to the midpoint, then falling.
+
+  :return np.ndarray: 1.0 or 0.0 for each window, NaN for the first candles (and windows with a NaN).
+  """
+  return _rolling_turn(column, window, center, falling_first=False)
+
+
+def heikin_ashi(df: pd.DataFrame, smooth_inputs: bool = False, smooth_outputs: bool = False, length: int = 10):
+  """
+  Heikin Ashi candles, the open from the previous candle (not the previous Heikin Ashi candle).
+
+  NostalgiaForInfinityX5.heikin_ashi() passes timeframe= to the EMAs, which TA-Lib ignores, so it
+  always smooths on 30 candles. The EMAs here are on length candles.
+
+  :return tuple: open, close and low Series.
+  """
+  open_, high, low, close = (_filled(_values(df[column])) for column in ("open", "high", "low", "close"))
+  if smooth_inputs:
+    open_, close = talib.EMA(open_, length), talib.EMA(close, length)
+    high, low = talib.EMA(high, length), talib.EMA(low, length)
+  open_ha = _filled((_shifted(open_) + _shifted(close)) / 2)
+  close_ha = _filled((open_ + high + low + close) / 4)
+  low_ha = _filled(np.fmin(np.fmin(low, open_), close))
+  if smooth_outputs:
+    open_ha, close_ha, low_ha = talib.EMA(open_ha, length), talib.EMA(close_ha, length), talib.EMA(low_ha, length)
+  return tuple(pd.Series(values, index=df.index) for values in (open_ha, close_ha, low_ha))
+
+
+def heikinashi(df: pd.DataFrame) -> pd.DataFrame:
+  """
+  Heikin Ashi candles, the open from the previous Heikin Ashi candle, as qtpylib.heikinashi().
+
+  Each open is half of the previous open and close: the weighted sum of the last HEIKINASHI_WINDOW
+  closes, the same within the float64 precision (a NaN candle only affects the next
+  HEIKINASHI_WINDOW opens).
+
+  :return DataFrame: open, high, low and close columns.
+  """
+  open_, high, low, close = (_values(df[column]) for column in ("open", "high", "low", "close"))
+  close_ha = (open_ + high + low + close) / 4
+  if len(df) == 0:
+    return pd.DataFrame({"open": close_ha, "high": close_ha, "low": close_ha, "close": close_ha}, index=df.index)
+  # The first open is the weight of the first window candle (1/2) times twice (open + close) / 2
+  previous = np.concatenate((np.zeros(HEIKINASHI_WINDOW - 1), [open_[0] + close[0]], close_ha[:-1]))
+  open_ha = sliding_window_view(previous, HEIKINASHI_WINDOW) @ HEIKINASHI_WEIGHTS
+  return pd.DataFrame(
+    {
+      "open": open_ha,
+      "high": np.fmax(np.fmax(high, open_ha), close_ha),
+      "low": np.fmin(np.fmin(low, open_ha), close_ha),
+      "close": close_ha,
+    },
+    index=df.index,
+  )
+
+
+def pivot_points(df: pd.DataFrame, mode: str = "fibonacci") -> tuple:
+  """
+  Pivot points of the previous candle (DeMark: of the candle).
+
+  :param mode: "simple", "fibonacci" or "DeMark".
+  :return tuple: pivot, res1, res2, res3, sup1, sup2, sup3 Series (DeMark: pivot, res, sup).
+  """
+  high, low, close = _values(df["high"]), _values(df["low"]), _values(df["close"])
+  if mode == "DeMark":
+    open_ = _values(df["open"])
+    demark_pivot = np.where(
+      close < open_,
+      low * 2 + high + close,
+      np.where(close > open_, high * 2 + low + close, close * 2 + low + high),
+    )
+    levels = (demark_pivot / 4, demark_pivot / 2 - low, demark_pivot / 2 - high)
+  elif mode in ("simple", "fibonacci"):
+    previous_high, previous_low = _shifted(high), _shifted(low)
+    pivot = _shifted(high + low + close) / 3
+    if mode == "simple":
+      res1, sup1 = pivot * 2 - previous_low, pivot * 2 - previous_high
+      res2, sup2 = pivot + (previous_high - previous_low), pivot - (previous_high - previous_low)
+      res3, sup3 = pivot * 2 + (previous_high - 2 * previous_low), pivot * 2 - (2 * previous_high - previous_low)
+    else:
+      hl_range = previous_high - previous_low
+      res1, sup1 = pivot + 0.382 * hl_range, pivot - 0.382 * hl_range
+      res2, sup2 = pivot + 0.618 * hl_range, pivot - 0.618 * hl_range
+      res3, sup3 = pivot + hl_range, pivot - hl_range
+    levels = (pivot, res1, res2, res3, sup1, sup2, sup3)
+  else:
+    raise ValueError(f"Unknown pivot points mode {mode!r}.")
+  return tuple(pd.Series(values, index=df.index) for values in levels)